@@ -1,6 +1,7 @@
 """PRD 目标契约兼容路由（不替换现有路由）。"""
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -140,11 +141,27 @@ async def chat_by_slot(
     db: AsyncSession = Depends(get_db),
     encryption_key: str = Depends(get_encryption_key),
 ):
-    """兼容路由：按槽位调用 chat。"""
+    """兼容路由：按槽位调用 chat。stream=true 时返回 SSE（首个 token 前支持故障转移）。"""
+    messages = [{"role": m.role, "content": m.content} for m in body.messages]
     if body.stream:
-        raise HTTPException(status_code=400, detail="兼容 /api/llm/chat 当前仅支持非流式调用")
+        generator = await service.invoke_slot_stream(
+            db,
+            body.slot,
+            messages=messages,
+            max_tokens=body.max_tokens,
+            temperature=body.temperature,
+            encryption_key=encryption_key,
+        )
+        return StreamingResponse(
+            generator,
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+                "X-Accel-Buffering": "no",
+            },
+        )
 
-    messages = [{"role": m.role, "content": m.content} for m in body.messages]
     result = await service.invoke_slot(
         db,
         body.slot,
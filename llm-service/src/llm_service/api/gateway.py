@@ -33,7 +33,7 @@ async def completions(
     messages = [{"role": m.role, "content": m.content} for m in body.messages]
 
     if body.stream:
-        generator = service.call_completion_stream(
+        generator = await service.call_completion_stream(
             db,
             provider_id=body.provider_id,
             model_id=body.model_id,
@@ -7,6 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from llm_service.api.deps import get_db, get_encryption_key, require_admin
 from llm_service.api.schemas.provider import (
+    BalancerStatsResponse,
+    CircuitStateResponse,
     ProviderCreate,
     ProviderModelItem,
     ProviderPresetResponse,
@@ -14,9 +16,13 @@ from llm_service.api.schemas.provider import (
     ProviderTestRequest,
     ProviderTestResponse,
     ProviderUpdate,
+    StreamStatsResponse,
 )
 from llm_service.core import service
+from llm_service.core.circuit_breaker import circuit_breakers
+from llm_service.core.load_balancer import load_balancer
 from llm_service.core.presets import BUILTIN_PRESETS
+from llm_service.core.stream_metrics import stream_metrics
 from prism_shared.schemas import ApiResponse, PaginatedResponse, PaginationMeta, PaginationParams
 
 router = APIRouter(prefix="/api/llm/providers", tags=["providers"])
@@ -37,6 +43,35 @@ async def list_presets():
     return ApiResponse(data=presets)
 
 
+@router.get("/circuits", response_model=ApiResponse[list[CircuitStateResponse]])
+async def list_circuits(_admin=Depends(require_admin)):
+    """查看各 (provider, model) 熔断器状态（需要管理员权限，仅当前进程）。"""
+    return ApiResponse(data=[CircuitStateResponse(**item) for item in circuit_breakers.snapshot()])
+
+
+@router.post("/circuits/reset", response_model=ApiResponse[dict])
+async def reset_circuits(
+    provider_id: UUID | None = None,
+    model_id: str | None = None,
+    _admin=Depends(require_admin),
+):
+    """手动关闭熔断器（需要管理员权限）；不传参数时重置全部。"""
+    count = circuit_breakers.reset(provider_id, model_id)
+    return ApiResponse(data={"reset": count})
+
+
+@router.get("/balancer", response_model=ApiResponse[list[BalancerStatsResponse]])
+async def list_balancer_stats(_admin=Depends(require_admin)):
+    """查看资源池负载均衡的 EWMA 延迟 / 错误率与在途调用数（需要管理员权限，仅当前进程）。"""
+    return ApiResponse(data=[BalancerStatsResponse(**item) for item in load_balancer.snapshot()])
+
+
+@router.get("/streams", response_model=ApiResponse[list[StreamStatsResponse]])
+async def list_stream_stats(_admin=Depends(require_admin)):
+    """查看流式调用的首 token 延迟与生成速率（需要管理员权限，仅当前进程）。"""
+    return ApiResponse(data=[StreamStatsResponse(**item) for item in stream_metrics.snapshot()])
+
+
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=ApiResponse[ProviderResponse])
 async def create_provider(
     body: ProviderCreate,
@@ -132,6 +132,7 @@ class FailoverTraceItem(BaseModel):
     success: bool
     error: str | None = None
     latency_ms: int | None = None
+    hedged: bool = False
 
 
 class RoutingInfo(BaseModel):
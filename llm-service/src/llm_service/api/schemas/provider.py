@@ -92,3 +92,41 @@ class ProviderTestResponse(BaseModel):
     test_model_id: str | None = None
     message: str
     error_detail: str | None = None
+
+
+class CircuitStateResponse(BaseModel):
+    """(provider, model) 熔断器状态。"""
+
+    provider_id: str
+    model_id: str
+    state: str  # "closed" | "open" | "half_open"
+    samples: int
+    failure_rate: float
+    slow_call_rate: float
+    open_count: int
+    rejected: int
+    retry_in_seconds: float | None = None
+
+
+class BalancerStatsResponse(BaseModel):
+    """(provider, model) 负载均衡统计。"""
+
+    provider_id: str
+    model_id: str
+    ewma_latency_ms: float | None = None
+    ewma_error_rate: float
+    calls: int
+    inflight: int
+
+
+class StreamStatsResponse(BaseModel):
+    """(provider, model) 流式调用统计。"""
+
+    provider_id: str
+    provider_name: str
+    model_id: str
+    streams: int
+    cancelled: int
+    ttft_ms_p50: float | None = None
+    ttft_ms_p95: float | None = None
+    tokens_per_second: float | None = None
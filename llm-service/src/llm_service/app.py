@@ -1,12 +1,14 @@
 """FastAPI 应用工厂。"""
 
-import os
-
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 
 from llm_service.api.router import api_router
 from llm_service.core.config import LLMServiceSettings
+from llm_service.core.gateway_setup import configure_gateway
+from llm_service.core.provider_clients import provider_clients
+from llm_service.core.route_cache import config_listener
+from llm_service.core.runtime import llm_runtime
 from prism_shared.auth import PrincipalMiddleware, create_db_api_key_verifier
 from prism_shared.db import PoolConfig, create_engine, create_session_factory
 from prism_shared.exception_handlers import register_exception_handlers
@@ -22,13 +24,9 @@ def create_app(settings: LLMServiceSettings | None = None) -> FastAPI:
     - 初始化数据库连接
     """
     settings = settings or LLMServiceSettings()
-    os.environ.setdefault("PRISM_LLM_RUNTIME_MODE", settings.llm_runtime_mode)
-    os.environ.setdefault(
-        "PRISM_LLM_RUNTIME_HTTP_FALLBACK",
-        "true" if settings.llm_runtime_http_fallback else "false",
-    )
 
     configure_logging(log_level=settings.log_level, json_output=not settings.debug)
+    configure_gateway(settings)
 
     app = FastAPI(
         title="Prism LLM Service",
@@ -74,9 +72,17 @@ def create_app(settings: LLMServiceSettings | None = None) -> FastAPI:
             content=ApiResponse(data={"status": "ok", "service": "llm-service"}).model_dump(mode="json")
         )
 
-    # 生命周期：关闭引擎
+    # 生命周期：配置变更监听、litellm 预加载、上游连接池与引擎
+    @app.on_event("startup")
+    async def startup():
+        await config_listener.start(engine)
+        if settings.llm_runtime_warmup:
+            await llm_runtime.warm_up()
+
     @app.on_event("shutdown")
     async def shutdown():
+        await config_listener.stop()
+        await provider_clients.aclose()
         await engine.dispose()
 
     return app
@@ -0,0 +1,231 @@
+"""按 (provider, model) 的熔断器。
+
+Provider 故障时，每次槽位调用都要先等主模型超时 / 报错才进入降级链；熔断后直接跳过，
+故障只由窗口内的少量调用承担。
+
+状态机：
+- closed：正常放行，滑动窗口（window_seconds）内样本数达到 min_calls 且
+  错误率 ≥ failure_rate_threshold 或慢调用率 ≥ slow_call_rate_threshold 时转为 open
+- open：直接拒绝，open_seconds 后转为 half_open
+- half_open：最多放行 half_open_max_calls 个探测调用；探测成功转为 closed（清空窗口），失败重新 open
+
+只统计能反映 Provider 健康度的失败：连接失败 / 超时 / 上游 5xx / 429 / 鉴权失败等；
+请求本身的问题（上游 400 / 413 / 422）不计入。状态仅保存在进程内。
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+from prism_shared.exceptions import AppException
+
+logger = structlog.get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# 上游因请求内容拒绝的状态码：不代表 Provider 不健康
+REQUEST_ERROR_STATUSES = (400, 413, 422)
+
+
+def is_health_failure(error: AppException) -> bool:
+    """该异常是否应计入熔断错误率。"""
+    upstream_status = (error.details or {}).get("upstream_status")
+    return upstream_status not in REQUEST_ERROR_STATUSES
+
+
+@dataclass
+class CircuitBreaker:
+    """单个 (provider, model) 的熔断状态与滑动窗口。"""
+
+    state: str = CLOSED
+    window: deque = field(default_factory=deque)  # (timestamp, success, slow)
+    opened_at: float = 0.0
+    half_open_inflight: int = 0
+    open_count: int = 0
+    rejected: int = 0
+
+    def prune(self, now: float, window_seconds: float) -> None:
+        """淘汰窗口外的样本。"""
+        while self.window and now - self.window[0][0] > window_seconds:
+            self.window.popleft()
+
+    def rates(self) -> tuple[float, float]:
+        """窗口内 (错误率, 慢调用率)，无样本时为 0。"""
+        if not self.window:
+            return 0.0, 0.0
+        total = len(self.window)
+        failures = sum(1 for _, ok, _ in self.window if not ok)
+        slow = sum(1 for _, ok, is_slow in self.window if ok and is_slow)
+        return failures / total, slow / total
+
+
+class CircuitBreakerRegistry:
+    """按 (provider_id, model_id) 管理熔断器。"""
+
+    def __init__(
+        self,
+        *,
+        window_seconds: float = 60.0,
+        min_calls: int = 10,
+        failure_rate_threshold: float = 0.5,
+        slow_call_ms: float = 30_000.0,
+        slow_call_rate_threshold: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+    ) -> None:
+        self._breakers: dict[tuple[str, str], CircuitBreaker] = {}
+        self.configure(
+            window_seconds=window_seconds,
+            min_calls=min_calls,
+            failure_rate_threshold=failure_rate_threshold,
+            slow_call_ms=slow_call_ms,
+            slow_call_rate_threshold=slow_call_rate_threshold,
+            open_seconds=open_seconds,
+            half_open_max_calls=half_open_max_calls,
+        )
+
+    def configure(
+        self,
+        *,
+        window_seconds: float,
+        min_calls: int,
+        failure_rate_threshold: float,
+        slow_call_ms: float,
+        slow_call_rate_threshold: float,
+        open_seconds: float,
+        half_open_max_calls: int,
+    ) -> None:
+        """应用启动时按服务配置设置阈值。"""
+        self._window_seconds = window_seconds
+        self._min_calls = min_calls
+        self._failure_rate_threshold = failure_rate_threshold
+        self._slow_call_ms = slow_call_ms
+        self._slow_call_rate_threshold = slow_call_rate_threshold
+        self._open_seconds = open_seconds
+        self._half_open_max_calls = half_open_max_calls
+
+    def _get(self, provider_id: str, model_id: str) -> CircuitBreaker:
+        key = (str(provider_id), model_id)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker()
+        return breaker
+
+    def allow(self, provider_id: str, model_id: str) -> bool:
+        """是否放行本次调用（half_open 时占用一个探测名额，调用结束后须 record_* 释放）。"""
+        breaker = self._get(provider_id, model_id)
+        if breaker.state == OPEN:
+            if time.monotonic() - breaker.opened_at < self._open_seconds:
+                breaker.rejected += 1
+                return False
+            breaker.state = HALF_OPEN
+            breaker.half_open_inflight = 0
+            logger.info("熔断器进入半开状态", provider_id=str(provider_id), model=model_id)
+        if breaker.state == HALF_OPEN:
+            if breaker.half_open_inflight >= self._half_open_max_calls:
+                breaker.rejected += 1
+                return False
+            breaker.half_open_inflight += 1
+        return True
+
+    def record_success(self, provider_id: str, model_id: str, latency_ms: float) -> None:
+        """记录一次成功调用。"""
+        breaker = self._get(provider_id, model_id)
+        slow = latency_ms >= self._slow_call_ms
+        if breaker.state == HALF_OPEN:
+            breaker.half_open_inflight = max(0, breaker.half_open_inflight - 1)
+            if slow:
+                self._trip(breaker, provider_id, model_id, reason="half_open_slow")
+                return
+            breaker.state = CLOSED
+            breaker.window.clear()
+            logger.info("熔断器恢复关闭", provider_id=str(provider_id), model=model_id)
+            return
+        self._record(breaker, provider_id, model_id, success=True, slow=slow)
+
+    def record_failure(self, provider_id: str, model_id: str) -> None:
+        """记录一次失败调用。"""
+        breaker = self._get(provider_id, model_id)
+        if breaker.state == HALF_OPEN:
+            breaker.half_open_inflight = max(0, breaker.half_open_inflight - 1)
+            self._trip(breaker, provider_id, model_id, reason="half_open_failure")
+            return
+        self._record(breaker, provider_id, model_id, success=False, slow=False)
+
+    def release(self, provider_id: str, model_id: str) -> None:
+        """调用未产生结果（被取消 / 不计入健康度的失败）：仅释放半开探测名额。"""
+        breaker = self._get(provider_id, model_id)
+        if breaker.state == HALF_OPEN:
+            breaker.half_open_inflight = max(0, breaker.half_open_inflight - 1)
+
+    def _record(self, breaker: CircuitBreaker, provider_id: str, model_id: str, *, success: bool, slow: bool) -> None:
+        now = time.monotonic()
+        breaker.window.append((now, success, slow))
+        breaker.prune(now, self._window_seconds)
+        if breaker.state != CLOSED or len(breaker.window) < self._min_calls:
+            return
+        failure_rate, slow_rate = breaker.rates()
+        if failure_rate >= self._failure_rate_threshold:
+            self._trip(breaker, provider_id, model_id, reason="failure_rate")
+        elif slow_rate >= self._slow_call_rate_threshold:
+            self._trip(breaker, provider_id, model_id, reason="slow_call_rate")
+
+    def _trip(self, breaker: CircuitBreaker, provider_id: str, model_id: str, *, reason: str) -> None:
+        failure_rate, slow_rate = breaker.rates()
+        breaker.state = OPEN
+        breaker.opened_at = time.monotonic()
+        breaker.open_count += 1
+        breaker.window.clear()
+        logger.warning(
+            "熔断器打开",
+            provider_id=str(provider_id),
+            model=model_id,
+            reason=reason,
+            failure_rate=round(failure_rate, 3),
+            slow_rate=round(slow_rate, 3),
+        )
+
+    def reset(self, provider_id: str | None = None, model_id: str | None = None) -> int:
+        """手动关闭熔断器（不传参数时重置全部），返回重置数量。"""
+        keys = [
+            key
+            for key in self._breakers
+            if (provider_id is None or key[0] == str(provider_id)) and (model_id is None or key[1] == model_id)
+        ]
+        for key in keys:
+            self._breakers[key] = CircuitBreaker()
+        return len(keys)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """各熔断器当前状态。"""
+        now = time.monotonic()
+        result = []
+        for (provider_id, model_id), breaker in self._breakers.items():
+            breaker.prune(now, self._window_seconds)
+            failure_rate, slow_rate = breaker.rates()
+            retry_in = None
+            if breaker.state == OPEN:
+                retry_in = max(0.0, self._open_seconds - (now - breaker.opened_at))
+            result.append(
+                {
+                    "provider_id": provider_id,
+                    "model_id": model_id,
+                    "state": breaker.state,
+                    "samples": len(breaker.window),
+                    "failure_rate": round(failure_rate, 3),
+                    "slow_call_rate": round(slow_rate, 3),
+                    "open_count": breaker.open_count,
+                    "rejected": breaker.rejected,
+                    "retry_in_seconds": round(retry_in, 1) if retry_in is not None else None,
+                }
+            )
+        return result
+
+
+# 进程级共享实例
+circuit_breakers = CircuitBreakerRegistry()
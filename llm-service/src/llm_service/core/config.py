@@ -30,6 +30,40 @@ class LLMServiceSettings(BaseAppSettings):
         default=True,
         description="当 litellm 调用失败时是否允许回退到 HTTP 直连",
     )
+    llm_runtime_warmup: bool = Field(
+        default=True,
+        description="启动时在后台线程预加载 litellm（记录导入耗时），避免首个请求承担导入开销",
+    )
+
+    # --- 上游连接池（按 Provider 复用，Provider.config 可覆盖）---
+    upstream_max_connections: int = Field(default=50, description="每个 Provider 的上游连接数上限")
+    upstream_max_keepalive: int = Field(default=10, description="每个 Provider 保持的空闲 keep-alive 连接数")
+    upstream_keepalive_expiry: float = Field(default=60.0, description="空闲 keep-alive 连接的保留时长（秒）")
+    route_cache_ttl_seconds: float = Field(
+        default=300.0, description="槽位路由 / Provider 缓存 TTL（秒），LISTEN 通知失效的兜底"
+    )
+
+    # --- 熔断（按 provider + model）---
+    circuit_window_seconds: float = Field(default=60.0, description="熔断统计滑动窗口（秒）")
+    circuit_min_calls: int = Field(default=10, description="窗口内样本数达到该值才评估熔断")
+    circuit_failure_rate_threshold: float = Field(default=0.5, description="窗口内错误率达到该值时熔断")
+    circuit_slow_call_ms: float = Field(default=30_000.0, description="耗时超过该值（毫秒）视为慢调用")
+    circuit_slow_call_rate_threshold: float = Field(default=0.8, description="窗口内慢调用率达到该值时熔断")
+    circuit_open_seconds: float = Field(default=30.0, description="熔断打开后进入半开探测前的等待时长（秒）")
+    circuit_half_open_max_calls: int = Field(default=1, description="半开状态下同时放行的探测调用数")
+
+    # --- 槽位资源池负载均衡（ModelSlot.config.load_balancing 启用）---
+    load_balancer_ewma_alpha: float = Field(default=0.2, description="延迟 / 错误率 EWMA 平滑系数")
+
+    # --- Embedding 微批 ---
+    embedding_batch_enabled: bool = Field(default=True, description="是否合并并发的 Embedding 请求")
+    embedding_batch_window_ms: float = Field(default=5.0, description="微批等待窗口（毫秒）")
+    embedding_batch_max_inputs: int = Field(default=64, description="单批最多合并的输入条数，达到即发送")
+
+    # --- 相同在途请求合并（single-flight）---
+    single_flight_enabled: bool = Field(
+        default=True, description="相同的在途槽位 chat / embedding 请求是否共享一次上游调用"
+    )
 
     # --- 服务 ---
     service_host: str = "0.0.0.0"
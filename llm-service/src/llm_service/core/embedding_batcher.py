@@ -0,0 +1,171 @@
+"""Embedding 动态微批。
+
+搜索查询、Stage 3 逐条向量化、agent-service 等会产生大量并发的小 Embedding 请求，
+逐个转发时每个请求都是一次上游 /embeddings 调用。微批把同一 (provider, model, dimensions)
+在 window_ms 内到达的请求合并为一次上游调用（累计输入达到 max_inputs 时立即发送），
+再按各请求的输入区间拆分结果。
+
+- 单个请求输入数已达 max_inputs 时不参与合并，直接调用；新请求放入当前批次会超过 max_inputs 时，
+  先发送当前批次再开新批次，单次上游调用的输入数不超过 max_inputs
+- 上游因请求内容拒绝整个批次（400 / 413 / 422）时，逐个请求单独重发，各请求分别获得自己的结果或异常，
+  一条坏输入不会拖垮同批次的其他请求；其他失败（超时、5xx 等）同一批次的所有请求收到同一异常
+- 某个调用方取消不影响同批次其他请求（上游调用在独立任务中执行）
+- usage 按各请求输入文本长度占比分摊
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+from llm_service.core.circuit_breaker import is_health_failure
+from prism_shared.exceptions import AppException
+
+logger = structlog.get_logger(__name__)
+
+EmbedCall = Callable[[list[str]], Awaitable[dict]]
+
+
+@dataclass
+class _PendingBatch:
+    """等待发送的批次。"""
+
+    send: EmbedCall
+    requests: list[tuple[list[str], asyncio.Future]] = field(default_factory=list)
+    size: int = 0
+    timer: asyncio.TimerHandle | None = None
+
+
+class EmbeddingBatcher:
+    """按 (provider, model, dimensions) 合并并发 Embedding 请求。"""
+
+    def __init__(self, *, enabled: bool = True, window_ms: float = 5.0, max_inputs: int = 64) -> None:
+        self.enabled = enabled
+        self._window = window_ms / 1000
+        self._max_inputs = max_inputs
+        self._pending: dict[tuple, _PendingBatch] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.upstream_calls = 0
+        self.merged_requests = 0
+
+    def configure(self, *, enabled: bool, window_ms: float, max_inputs: int) -> None:
+        """应用启动时按服务配置设置窗口与批大小。"""
+        self.enabled = enabled
+        self._window = window_ms / 1000
+        self._max_inputs = max_inputs
+
+    async def embed(self, key: tuple, texts: list[str], send: EmbedCall) -> dict:
+        """提交一个请求，等待所在批次完成后返回本请求对应的结果。
+
+        Args:
+            key: 合并键（provider_id, model_id, dimensions）
+            texts: 本请求的输入
+            send: 以合并后的输入调用上游
+        """
+        if not self.enabled or len(texts) >= self._max_inputs:
+            self.upstream_calls += 1
+            return await send(texts)
+
+        batch = self._pending.get(key)
+        if batch is not None and batch.size + len(texts) > self._max_inputs:
+            self._flush(key)
+            batch = None
+        if batch is None:
+            batch = self._pending[key] = _PendingBatch(send=send)
+            batch.timer = asyncio.get_running_loop().call_later(self._window, self._flush, key)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        batch.requests.append((texts, future))
+        batch.size += len(texts)
+        if batch.size >= self._max_inputs:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key: tuple) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: _PendingBatch) -> None:
+        texts = [text for request_texts, _ in batch.requests for text in request_texts]
+        self.upstream_calls += 1
+        self.merged_requests += len(batch.requests)
+        try:
+            try:
+                result = await batch.send(texts)
+            except Exception as e:
+                if len(batch.requests) > 1 and _is_request_error(e):
+                    logger.info("Embedding 微批被上游拒绝，逐个请求重发", requests=len(batch.requests), error=str(e))
+                    await self._send_each(batch)
+                    return
+                for _, future in batch.requests:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+        except asyncio.CancelledError:
+            for _, future in batch.requests:
+                future.cancel()
+            raise
+
+        for (_, future), part in zip(batch.requests, _scatter(result, batch.requests), strict=True):
+            if not future.done():
+                future.set_result(part)
+        if len(batch.requests) > 1:
+            logger.debug("Embedding 微批已合并", requests=len(batch.requests), inputs=len(texts))
+
+    async def _send_each(self, batch: _PendingBatch) -> None:
+        """逐个请求单独调用上游，分别设置各请求的结果或异常。"""
+        self.upstream_calls += len(batch.requests)
+        outcomes = await asyncio.gather(
+            *(batch.send(request_texts) for request_texts, _ in batch.requests), return_exceptions=True
+        )
+        for (_, future), outcome in zip(batch.requests, outcomes, strict=True):
+            if future.done():
+                continue
+            if isinstance(outcome, asyncio.CancelledError):
+                future.cancel()
+            elif isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    def stats(self) -> dict[str, int]:
+        """上游调用次数与被合并的请求数。"""
+        return {"upstream_calls": self.upstream_calls, "merged_requests": self.merged_requests}
+
+
+def _is_request_error(error: Exception) -> bool:
+    """上游是否因请求内容拒绝（400 / 413 / 422），此类失败值得拆分重发。"""
+    return isinstance(error, AppException) and not is_health_failure(error)
+
+
+def _scatter(result: dict, requests: list[tuple[list[str], asyncio.Future]]) -> list[dict]:
+    """按各请求的输入区间拆分批次结果（index 重新从 0 编号）。"""
+    embeddings = sorted(result["embeddings"], key=lambda item: item["index"])
+    usage: dict[str, Any] = result.get("usage") or {}
+    total_chars = sum(len(text) for texts, _ in requests for text in texts) or 1
+
+    parts: list[dict] = []
+    offset = 0
+    for texts, _ in requests:
+        share = sum(len(text) for text in texts) / total_chars
+        parts.append(
+            {
+                **result,
+                "embeddings": [{**item, "index": i} for i, item in enumerate(embeddings[offset : offset + len(texts)])],
+                "usage": {k: round(v * share) if isinstance(v, int | float) else v for k, v in usage.items()},
+            }
+        )
+        offset += len(texts)
+    return parts
+
+
+# 进程级共享实例
+embedding_batcher = EmbeddingBatcher()
@@ -18,3 +18,4 @@ class LLMErrorCode(StrEnum):
     INVALID_PRESET = "LLM_INVALID_PRESET"
     UPSTREAM_ERROR = "LLM_UPSTREAM_ERROR"
     ALL_MODELS_FAILED = "LLM_ALL_MODELS_FAILED"
+    CIRCUIT_OPEN = "LLM_CIRCUIT_OPEN"
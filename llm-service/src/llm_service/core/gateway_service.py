@@ -1,38 +1,34 @@
 """推理网关与槽位调用业务逻辑。"""
 
-import importlib
+import asyncio
+import functools
 import json
-import os
 import time
-import uuid
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import suppress
+from dataclasses import dataclass
 from typing import Any
 
 import httpx
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from llm_service.core.crypto import decrypt_api_key
+from llm_service.core.circuit_breaker import circuit_breakers, is_health_failure
+from llm_service.core.embedding_batcher import embedding_batcher
 from llm_service.core.errors import LLMErrorCode
+from llm_service.core.hedging import HedgePolicy, latency_tracker
+from llm_service.core.load_balancer import PoolPolicy, load_balancer
+from llm_service.core.provider_clients import provider_clients
+from llm_service.core.route_cache import ProviderSnapshot, SlotRoute, route_cache
 from llm_service.core.routing import build_routing_info, build_trace_entry
-from llm_service.core.slot_service import get_slot
-from llm_service.models.provider import Provider
+from llm_service.core.runtime import llm_runtime
+from llm_service.core.single_flight import request_key, single_flight
+from llm_service.core.stream_metrics import stream_metrics
 from llm_service.models.slot import SlotType
-from prism_shared.exceptions import AppException, NotFoundException
+from prism_shared.exceptions import AppException
 
 logger = structlog.get_logger(__name__)
 
-RUNTIME_MODE_ENV = "PRISM_LLM_RUNTIME_MODE"
-RUNTIME_HTTP_FALLBACK_ENV = "PRISM_LLM_RUNTIME_HTTP_FALLBACK"
-
-
-def _use_litellm() -> bool:
-    return os.getenv(RUNTIME_MODE_ENV, "litellm").lower() == "litellm"
-
-
-def _allow_http_fallback() -> bool:
-    return os.getenv(RUNTIME_HTTP_FALLBACK_ENV, "true").lower() not in {"0", "false", "no"}
-
 
 def _extract_usage(raw_usage: Any) -> dict[str, int]:
     if raw_usage is None:
@@ -65,7 +61,7 @@ def _to_plain_dict(response: Any) -> dict[str, Any]:
     return {}
 
 
-def _build_litellm_provider_kwargs(provider: Provider, model_id: str, api_key: str) -> dict[str, Any]:
+def _build_litellm_provider_kwargs(provider: ProviderSnapshot, model_id: str, api_key: str) -> dict[str, Any]:
     kwargs: dict[str, Any] = {
         "model": model_id,
         "api_key": api_key,
@@ -77,26 +73,9 @@ def _build_litellm_provider_kwargs(provider: Provider, model_id: str, api_key: s
     return kwargs
 
 
-async def _get_provider_with_key(
-    db: AsyncSession,
-    provider_id: str,
-    encryption_key: str,
-) -> tuple[Provider, str]:
-    """获取 Provider 并解密 API Key。"""
-    try:
-        pid = uuid.UUID(provider_id)
-    except ValueError as exc:
-        raise NotFoundException("Provider", provider_id) from exc
-    provider = await db.get(Provider, pid)
-    if provider is None:
-        raise NotFoundException("Provider", provider_id)
-    api_key = decrypt_api_key(provider.api_key_encrypted, encryption_key)
-    return provider, api_key
-
-
 async def _call_completion_http(
     *,
-    provider: Provider,
+    provider: ProviderSnapshot,
     api_key: str,
     model_id: str,
     messages: list[dict],
@@ -117,15 +96,15 @@ async def _call_completion_http(
 
     start = time.monotonic()
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                f"{provider.base_url}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                json=payload,
-            )
+        response = await provider_clients.get(provider).post(
+            f"{provider.base_url}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            json=payload,
+            timeout=provider_clients.timeout(provider, 120.0),
+        )
     except (httpx.TimeoutException, httpx.ConnectError) as e:
         raise AppException(
             code=LLMErrorCode.UPSTREAM_ERROR,
@@ -156,7 +135,7 @@ async def _call_completion_http(
 
 async def _call_completion_litellm(
     *,
-    provider: Provider,
+    provider: ProviderSnapshot,
     api_key: str,
     model_id: str,
     messages: list[dict],
@@ -164,8 +143,7 @@ async def _call_completion_litellm(
     temperature: float | None = None,
     top_p: float | None = None,
 ) -> dict:
-    litellm = importlib.import_module("litellm")
-    acompletion = litellm.acompletion
+    acompletion = llm_runtime.acompletion
 
     kwargs = _build_litellm_provider_kwargs(provider, model_id, api_key)
     kwargs["messages"] = messages
@@ -204,7 +182,7 @@ async def _call_completion_litellm(
 
 async def _call_embedding_http(
     *,
-    provider: Provider,
+    provider: ProviderSnapshot,
     api_key: str,
     model_id: str,
     input_texts: str | list[str],
@@ -219,15 +197,15 @@ async def _call_embedding_http(
 
     start = time.monotonic()
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{provider.base_url}/embeddings",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                json=payload,
-            )
+        response = await provider_clients.get(provider).post(
+            f"{provider.base_url}/embeddings",
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            json=payload,
+            timeout=provider_clients.timeout(provider, 60.0),
+        )
     except (httpx.TimeoutException, httpx.ConnectError) as e:
         raise AppException(
             code=LLMErrorCode.UPSTREAM_ERROR,
@@ -268,7 +246,7 @@ async def _call_embedding_http(
 
 async def _call_embedding_litellm(
     *,
-    provider: Provider,
+    provider: ProviderSnapshot,
     api_key: str,
     model_id: str,
     input_texts: str | list[str],
@@ -277,8 +255,7 @@ async def _call_embedding_litellm(
     if isinstance(input_texts, str):
         input_texts = [input_texts]
 
-    litellm = importlib.import_module("litellm")
-    aembedding = litellm.aembedding
+    aembedding = llm_runtime.aembedding
 
     kwargs = _build_litellm_provider_kwargs(provider, model_id, api_key)
     kwargs["input"] = input_texts
@@ -319,7 +296,7 @@ async def _call_embedding_litellm(
 
 async def _call_rerank_http(
     *,
-    provider: Provider,
+    provider: ProviderSnapshot,
     api_key: str,
     model_id: str,
     query: str,
@@ -327,15 +304,15 @@ async def _call_rerank_http(
 ) -> dict:
     start = time.monotonic()
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{provider.base_url}/rerank",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={"model": model_id, "query": query, "documents": documents},
-            )
+        response = await provider_clients.get(provider).post(
+            f"{provider.base_url}/rerank",
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            json={"model": model_id, "query": query, "documents": documents},
+            timeout=provider_clients.timeout(provider, 60.0),
+        )
     except (httpx.TimeoutException, httpx.ConnectError) as e:
         raise AppException(
             code=LLMErrorCode.UPSTREAM_ERROR,
@@ -375,14 +352,13 @@ async def _call_rerank_http(
 
 async def _call_rerank_litellm(
     *,
-    provider: Provider,
+    provider: ProviderSnapshot,
     api_key: str,
     model_id: str,
     query: str,
     documents: list[str],
 ) -> dict:
-    litellm = importlib.import_module("litellm")
-    rerank_fn = getattr(litellm, "arerank", None)
+    rerank_fn = llm_runtime.arerank
     if rerank_fn is None:
         raise RuntimeError("当前 litellm 版本不支持 arerank")
 
@@ -433,9 +409,30 @@ async def call_completion(
     encryption_key: str,
 ) -> dict:
     """非流式 Chat 补全代理。"""
-    provider, api_key = await _get_provider_with_key(db, provider_id, encryption_key)
+    provider, api_key = await route_cache.provider(db, provider_id, encryption_key)
+    return await _complete(
+        provider,
+        api_key,
+        model_id=model_id,
+        messages=messages,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        top_p=top_p,
+    )
+
 
-    if _use_litellm():
+async def _complete(
+    provider: ProviderSnapshot,
+    api_key: str,
+    *,
+    model_id: str,
+    messages: list[dict],
+    max_tokens: int | None = None,
+    temperature: float | None = None,
+    top_p: float | None = None,
+) -> dict:
+    """按运行时模式调用 Chat 补全（litellm 失败时按配置回退 HTTP）。"""
+    if llm_runtime.use_litellm:
         try:
             return await _call_completion_litellm(
                 provider=provider,
@@ -447,8 +444,8 @@ async def call_completion(
                 top_p=top_p,
             )
         except Exception as e:  # pragma: no cover - fallback path
-            logger.warning("litellm chat 调用失败，回退 HTTP", provider_id=provider_id, model=model_id, error=str(e))
-            if not _allow_http_fallback():
+            logger.warning("litellm chat 调用失败，回退 HTTP", provider=provider.name, model=model_id, error=str(e))
+            if not llm_runtime.http_fallback:
                 raise AppException(
                     code=LLMErrorCode.UPSTREAM_ERROR,
                     message=f"litellm 调用失败且已禁用 HTTP fallback: {e}",
@@ -466,23 +463,26 @@ async def call_completion(
     )
 
 
-async def call_completion_stream(
-    db: AsyncSession,
+@dataclass
+class _StreamChunk:
+    """上游流式响应的一个分片（已提取出需要转发的字段）。"""
+
+    delta: str
+    finish_reason: str | None = None
+    usage: Any = None
+    model: str | None = None
+
+
+async def _stream_http(
     *,
-    provider_id: str,
+    provider: ProviderSnapshot,
+    api_key: str,
     model_id: str,
     messages: list[dict],
     max_tokens: int | None = None,
     temperature: float | None = None,
     top_p: float | None = None,
-    encryption_key: str,
-) -> AsyncGenerator[str, None]:
-    """
-    流式 Chat 补全代理。
-    当前保留 HTTP 直连实现，确保 SSE 兼容性稳定。
-    """
-    provider, api_key = await _get_provider_with_key(db, provider_id, encryption_key)
-
+) -> AsyncGenerator[_StreamChunk, None]:
     payload: dict[str, Any] = {
         "model": model_id,
         "messages": messages,
@@ -495,20 +495,17 @@ async def call_completion_stream(
     if top_p is not None:
         payload["top_p"] = top_p
 
-    start = time.monotonic()
     try:
-        async with (
-            httpx.AsyncClient(timeout=120.0) as client,
-            client.stream(
-                "POST",
-                f"{provider.base_url}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                json=payload,
-            ) as response,
-        ):
+        async with provider_clients.get(provider).stream(
+            "POST",
+            f"{provider.base_url}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            json=payload,
+            timeout=provider_clients.timeout(provider, 120.0),
+        ) as response:
             if response.status_code >= 400:
                 body = await response.aread()
                 raise AppException(
@@ -518,50 +515,222 @@ async def call_completion_stream(
                     details={"upstream_status": response.status_code, "upstream_body": body.decode()[:1000]},
                 )
 
-            usage_info: dict[str, int] = {}
-            final_model = model_id
-
             async for line in response.aiter_lines():
                 if not line.startswith("data: "):
                     continue
                 data_str = line[6:]
                 if data_str.strip() == "[DONE]":
-                    break
-
+                    return
                 try:
                     chunk = json.loads(data_str)
                 except json.JSONDecodeError:
                     continue
 
-                final_model = chunk.get("model", final_model)
-                choice = chunk.get("choices", [{}])[0]
-                delta = choice.get("delta", {})
-                finish_reason = choice.get("finish_reason")
-                delta_content = delta.get("content", "")
+                choices = chunk.get("choices") or [{}]
+                delta = choices[0].get("delta") or {}
+                yield _StreamChunk(
+                    delta=delta.get("content") or "",
+                    finish_reason=choices[0].get("finish_reason"),
+                    usage=chunk.get("usage"),
+                    model=chunk.get("model"),
+                )
+    except httpx.TransportError as e:
+        raise AppException(
+            code=LLMErrorCode.UPSTREAM_ERROR,
+            message=f"Provider 连接失败：{e}",
+            status_code=502,
+        ) from e
 
-                if chunk.get("usage"):
-                    usage_info = chunk["usage"]
 
-                event_data = {"delta": delta_content, "finish_reason": finish_reason}
-                yield f"data: {json.dumps(event_data, ensure_ascii=False)}\n\n"
+async def _stream_litellm(
+    *,
+    provider: ProviderSnapshot,
+    api_key: str,
+    model_id: str,
+    messages: list[dict],
+    max_tokens: int | None = None,
+    temperature: float | None = None,
+    top_p: float | None = None,
+) -> AsyncGenerator[_StreamChunk, None]:
+    acompletion = llm_runtime.acompletion
 
-            latency_ms = int((time.monotonic() - start) * 1000)
-            final_event = {
-                "usage": _extract_usage(usage_info),
-                "latency_ms": latency_ms,
-                "model": final_model,
-            }
-            yield f"data: {json.dumps(final_event, ensure_ascii=False)}\n\n"
-            yield "data: [DONE]\n\n"
+    kwargs = _build_litellm_provider_kwargs(provider, model_id, api_key)
+    kwargs["messages"] = messages
+    kwargs["stream"] = True
+    kwargs["stream_options"] = {"include_usage": True}
+    if max_tokens is not None:
+        kwargs["max_tokens"] = max_tokens
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    if top_p is not None:
+        kwargs["top_p"] = top_p
 
+    response = await acompletion(**kwargs)
+    try:
+        async for chunk in response:
+            body = _to_plain_dict(chunk)
+            choices = body.get("choices") or [{}]
+            choice = _to_plain_dict(choices[0])
+            delta = _to_plain_dict(choice.get("delta") or {})
+            yield _StreamChunk(
+                delta=delta.get("content") or "",
+                finish_reason=choice.get("finish_reason"),
+                usage=body.get("usage"),
+                model=body.get("model"),
+            )
     except AppException:
         raise
-    except (httpx.TimeoutException, httpx.ConnectError) as e:
+    except Exception as e:
+        # litellm / httpx 的上游异常统一转为 AppException，由调用方故障转移或以 error 事件结束流
         raise AppException(
             code=LLMErrorCode.UPSTREAM_ERROR,
-            message=f"Provider 连接失败：{e}",
+            message=f"Provider 流式响应失败：{e}",
             status_code=502,
+            details={"upstream_status": getattr(e, "status_code", None)},
         ) from e
+    finally:
+        # 客户端断开 / 提前结束时关闭上游连接
+        aclose = getattr(response, "aclose", None)
+        if callable(aclose):
+            with suppress(Exception):
+                await aclose()
+
+
+async def _open_stream(
+    provider: ProviderSnapshot,
+    api_key: str,
+    **params: Any,
+) -> tuple[AsyncGenerator[_StreamChunk, None], _StreamChunk | None]:
+    """按运行时模式建立上游流并读取首个分片。
+
+    首个分片之前的失败（连接、HTTP 状态码）以 AppException 抛出，调用方可据此故障转移；
+    litellm 建流失败时按配置回退 HTTP。
+    """
+    if llm_runtime.use_litellm:
+        stream = _stream_litellm(provider=provider, api_key=api_key, **params)
+        try:
+            return stream, await anext(stream, None)
+        except Exception as e:
+            await stream.aclose()
+            logger.warning(
+                "litellm 流式调用失败，回退 HTTP", provider=provider.name, model=params["model_id"], error=str(e)
+            )
+            if not llm_runtime.http_fallback:
+                raise AppException(
+                    code=LLMErrorCode.UPSTREAM_ERROR,
+                    message=f"litellm 流式调用失败且已禁用 HTTP fallback: {e}",
+                    status_code=502,
+                ) from e
+
+    stream = _stream_http(provider=provider, api_key=api_key, **params)
+    try:
+        return stream, await anext(stream, None)
+    except BaseException:
+        await stream.aclose()
+        raise
+
+
+def _sse(data: dict[str, Any]) -> str:
+    return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _relay_stream(
+    provider: ProviderSnapshot,
+    model_id: str,
+    stream: AsyncGenerator[_StreamChunk, None],
+    first: _StreamChunk | None,
+    *,
+    start: float,
+    routing: dict[str, Any] | None = None,
+    on_close: Callable[[], None] | None = None,
+) -> AsyncGenerator[str, None]:
+    """把上游分片转为 SSE 事件转发，结束时输出 usage / 耗时（及路由信息）并记录 TTFT 与生成速率。
+
+    由 StreamingResponse 逐个拉取，上游读取速度跟随客户端消费速度；客户端断开时生成器被关闭，
+    finally 中关闭上游流（取消上游请求）。首个分片之后的任何上游异常都以 error 事件结束流，
+    仍输出最终事件并记录指标。
+    """
+    usage: Any = None
+    final_model = model_id
+    first_token_at: float | None = None
+    content_chunks = 0
+    finished = False
+    try:
+        chunk = first
+        while chunk is not None:
+            final_model = chunk.model or final_model
+            if chunk.usage:
+                usage = chunk.usage
+            if chunk.delta or chunk.finish_reason:
+                if chunk.delta:
+                    content_chunks += 1
+                    if first_token_at is None:
+                        first_token_at = time.monotonic()
+                yield _sse({"delta": chunk.delta, "finish_reason": chunk.finish_reason})
+            try:
+                chunk = await anext(stream, None)
+            except Exception as e:
+                message = e.message if isinstance(e, AppException) else f"Provider 流式响应失败：{e}"
+                logger.warning("流式响应中断", provider=provider.name, model=model_id, error=message)
+                yield _sse({"error": message})
+                break
+
+        final_usage = _extract_usage(usage)
+        final_event: dict[str, Any] = {
+            "usage": final_usage,
+            "latency_ms": int((time.monotonic() - start) * 1000),
+            "model": final_model,
+            "ttft_ms": int((first_token_at - start) * 1000) if first_token_at is not None else None,
+        }
+        if routing is not None:
+            final_event["routing"] = routing
+        yield _sse(final_event)
+        yield "data: [DONE]\n\n"
+        finished = True
+    finally:
+        await stream.aclose()
+        if on_close is not None:
+            on_close()
+        end = time.monotonic()
+        tokens = _extract_usage(usage)["completion_tokens"] or content_chunks
+        stream_metrics.record(
+            str(provider.id),
+            provider.name,
+            model_id,
+            ttft_ms=(first_token_at - start) * 1000 if first_token_at is not None else None,
+            tokens=tokens,
+            generation_seconds=end - first_token_at if first_token_at is not None else 0.0,
+            cancelled=not finished,
+        )
+
+
+async def call_completion_stream(
+    db: AsyncSession,
+    *,
+    provider_id: str,
+    model_id: str,
+    messages: list[dict],
+    max_tokens: int | None = None,
+    temperature: float | None = None,
+    top_p: float | None = None,
+    encryption_key: str,
+) -> AsyncGenerator[str, None]:
+    """
+    流式 Chat 补全代理（按运行时模式走 litellm 或 HTTP）。
+    收到上游首个分片后才返回事件流，建流失败直接抛出 AppException（不会以 200 开始响应）。
+    """
+    provider, api_key = await route_cache.provider(db, provider_id, encryption_key)
+    start = time.monotonic()
+    stream, first = await _open_stream(
+        provider,
+        api_key,
+        model_id=model_id,
+        messages=messages,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        top_p=top_p,
+    )
+    return _relay_stream(provider, model_id, stream, first, start=start)
 
 
 async def call_embedding(
@@ -574,9 +743,39 @@ async def call_embedding(
     dimensions: int | None = None,
 ) -> dict:
     """Embedding 代理。"""
-    provider, api_key = await _get_provider_with_key(db, provider_id, encryption_key)
+    provider, api_key = await route_cache.provider(db, provider_id, encryption_key)
+    return await _embed(provider, api_key, model_id=model_id, input_texts=input_texts, dimensions=dimensions)
+
 
-    if _use_litellm():
+async def _embed(
+    provider: ProviderSnapshot,
+    api_key: str,
+    *,
+    model_id: str,
+    input_texts: str | list[str],
+    dimensions: int | None = None,
+) -> dict:
+    """调用 Embedding：同一 (provider, model, dimensions) 的并发请求经微批合并后发往上游。"""
+    texts = [input_texts] if isinstance(input_texts, str) else list(input_texts)
+
+    async def send(batch_texts: list[str]) -> dict:
+        return await _embed_upstream(
+            provider, api_key, model_id=model_id, input_texts=batch_texts, dimensions=dimensions
+        )
+
+    return await embedding_batcher.embed((str(provider.id), model_id, dimensions), texts, send)
+
+
+async def _embed_upstream(
+    provider: ProviderSnapshot,
+    api_key: str,
+    *,
+    model_id: str,
+    input_texts: str | list[str],
+    dimensions: int | None = None,
+) -> dict:
+    """按运行时模式调用 Embedding（litellm 失败时按配置回退 HTTP）。"""
+    if llm_runtime.use_litellm:
         try:
             return await _call_embedding_litellm(
                 provider=provider,
@@ -587,9 +786,9 @@ async def call_embedding(
             )
         except Exception as e:  # pragma: no cover - fallback path
             logger.warning(
-                "litellm embedding 调用失败，回退 HTTP", provider_id=provider_id, model=model_id, error=str(e)
+                "litellm embedding 调用失败，回退 HTTP", provider=provider.name, model=model_id, error=str(e)
             )
-            if not _allow_http_fallback():
+            if not llm_runtime.http_fallback:
                 raise AppException(
                     code=LLMErrorCode.UPSTREAM_ERROR,
                     message=f"litellm embedding 失败且已禁用 HTTP fallback: {e}",
@@ -615,9 +814,20 @@ async def call_rerank(
     encryption_key: str,
 ) -> dict:
     """Rerank 代理。"""
-    provider, api_key = await _get_provider_with_key(db, provider_id, encryption_key)
+    provider, api_key = await route_cache.provider(db, provider_id, encryption_key)
+    return await _rerank(provider, api_key, model_id=model_id, query=query, documents=documents)
 
-    if _use_litellm():
+
+async def _rerank(
+    provider: ProviderSnapshot,
+    api_key: str,
+    *,
+    model_id: str,
+    query: str,
+    documents: list[str],
+) -> dict:
+    """按运行时模式调用 Rerank（litellm 失败时按配置回退 HTTP）。"""
+    if llm_runtime.use_litellm:
         try:
             return await _call_rerank_litellm(
                 provider=provider,
@@ -627,8 +837,8 @@ async def call_rerank(
                 documents=documents,
             )
         except Exception as e:  # pragma: no cover - fallback path
-            logger.warning("litellm rerank 调用失败，回退 HTTP", provider_id=provider_id, model=model_id, error=str(e))
-            if not _allow_http_fallback():
+            logger.warning("litellm rerank 调用失败，回退 HTTP", provider=provider.name, model=model_id, error=str(e))
+            if not llm_runtime.http_fallback:
                 raise AppException(
                     code=LLMErrorCode.UPSTREAM_ERROR,
                     message=f"litellm rerank 失败且已禁用 HTTP fallback: {e}",
@@ -644,244 +854,441 @@ async def call_rerank(
     )
 
 
-async def invoke_slot(
-    db: AsyncSession,
-    slot_type: SlotType,
-    *,
-    messages: list[dict],
-    max_tokens: int | None = None,
-    temperature: float | None = None,
-    encryption_key: str,
-) -> dict:
-    """槽位调用（含资源池故障转移）。"""
-    slot = await get_slot(db, slot_type)
-    if slot is None or not slot.is_enabled:
+TargetCall = Callable[[ProviderSnapshot, str, str], Awaitable[dict]]
+# provider_id → (Provider 快照, API Key)；解析失败的候选保存对应异常
+ResolvedProviders = dict[str, tuple[ProviderSnapshot, str] | AppException]
+
+
+async def _require_route(db: AsyncSession, slot_type: SlotType, encryption_key: str) -> SlotRoute:
+    """获取已启用的槽位路由，并确认主 Provider 存在。"""
+    route = await route_cache.slot(db, slot_type)
+    if route is None or not route.is_enabled:
         raise AppException(
             code=LLMErrorCode.SLOT_NOT_CONFIGURED,
             message=f"槽位 '{slot_type.value}' 未配置或已禁用",
             status_code=503,
         )
-
-    primary_provider = await db.get(Provider, slot.primary_provider_id)
-    if primary_provider is None:
+    try:
+        await route_cache.provider(db, route.primary_provider_id, encryption_key)
+    except AppException as e:
         raise AppException(
             code=LLMErrorCode.SLOT_NOT_CONFIGURED,
             message=f"槽位 '{slot_type.value}' 的主 Provider 不存在",
             status_code=503,
-        )
+        ) from e
+    return route
 
-    failover_trace: list[dict[str, Any]] = []
 
+async def _resolve_providers(db: AsyncSession, route: SlotRoute, encryption_key: str) -> ResolvedProviders:
+    """在请求自身的 session 中解析槽位全部候选的 Provider 与 API Key。
+
+    合并后的上游调用在独立任务中执行，可能比发起它的请求存活更久，不能持有请求级 session；
+    解析失败的候选保存异常，轮到该候选时按调用失败处理。
+    """
+    provider_ids = [route.primary_provider_id] + [provider_id for provider_id, _ in route.fallback_chain]
+    resolved: ResolvedProviders = {}
+    for provider_id in dict.fromkeys(provider_ids):
+        try:
+            resolved[provider_id] = await route_cache.provider(db, provider_id, encryption_key)
+        except AppException as e:
+            resolved[provider_id] = e
+    return resolved
+
+
+@dataclass
+class _Attempt:
+    """一次候选调用（主模型或降级链中的一项）。"""
+
+    index: int
+    provider_id: str
+    model_id: str
+    provider_name: str = "未知"
+    hedged: bool = False
+
+
+async def _call_attempt(providers: ResolvedProviders, attempt: _Attempt, call: TargetCall) -> dict:
+    resolved = providers[attempt.provider_id]
+    if isinstance(resolved, AppException):
+        raise resolved
+    provider, api_key = resolved
+    attempt.provider_name = provider.name
+    if not circuit_breakers.allow(attempt.provider_id, attempt.model_id):
+        raise AppException(
+            code=LLMErrorCode.CIRCUIT_OPEN,
+            message="熔断中，已跳过",
+            status_code=503,
+        )
+
+    load_balancer.begin(attempt.provider_id)
     try:
-        result = await call_completion(
-            db,
-            provider_id=str(slot.primary_provider_id),
-            model_id=slot.primary_model_id,
-            messages=messages,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            encryption_key=encryption_key,
+        result = await call(provider, api_key, attempt.model_id)
+    except Exception as e:
+        error = e if isinstance(e, AppException) else _unexpected_upstream_error(attempt, e)
+        if is_health_failure(error):
+            circuit_breakers.record_failure(attempt.provider_id, attempt.model_id)
+            load_balancer.record(attempt.provider_id, attempt.model_id, success=False)
+        else:
+            circuit_breakers.release(attempt.provider_id, attempt.model_id)
+        if error is e:
+            raise
+        raise error from e
+    except BaseException:
+        # 对冲取消 / 客户端断开：不计入健康度
+        circuit_breakers.release(attempt.provider_id, attempt.model_id)
+        raise
+    finally:
+        load_balancer.end(attempt.provider_id)
+
+    circuit_breakers.record_success(attempt.provider_id, attempt.model_id, result["latency_ms"])
+    latency_tracker.record(attempt.provider_id, attempt.model_id, result["latency_ms"])
+    load_balancer.record(attempt.provider_id, attempt.model_id, success=True, latency_ms=result["latency_ms"])
+    return result
+
+
+def _unexpected_upstream_error(attempt: _Attempt, error: Exception) -> AppException:
+    """调用中的非预期异常（协议错误、读取中断、响应解析失败等）转换为 AppException：计入健康度并继续故障转移。"""
+    logger.warning(
+        "Provider 调用出现非预期异常",
+        provider=attempt.provider_name,
+        model_id=attempt.model_id,
+        error_type=type(error).__name__,
+        exc_info=error,
+    )
+    return AppException(
+        code=LLMErrorCode.UPSTREAM_ERROR,
+        message=f"Provider 调用异常：{type(error).__name__}: {error}",
+        status_code=502,
+    )
+
+
+def _record_success(attempt: _Attempt, result: dict, trace: list[dict[str, Any]]) -> None:
+    trace.append(
+        build_trace_entry(
+            provider_name=attempt.provider_name,
+            model_id=attempt.model_id,
+            success=True,
+            latency_ms=result["latency_ms"],
+            hedged=attempt.hedged,
         )
-        failover_trace.append(
-            build_trace_entry(
-                provider_name=primary_provider.name,
-                model_id=slot.primary_model_id,
-                success=True,
-                latency_ms=result["latency_ms"],
-            )
+    )
+
+
+def _record_failure(
+    route: SlotRoute, attempt: _Attempt, error: AppException, trace: list[dict[str, Any]], label: str
+) -> None:
+    trace.append(
+        build_trace_entry(
+            provider_name=attempt.provider_name,
+            model_id=attempt.model_id,
+            success=False,
+            error=error.message,
+            hedged=attempt.hedged,
         )
-        return {
-            "result": result,
-            "routing": build_routing_info(
-                provider_name=primary_provider.name,
-                model_id=slot.primary_model_id,
-                slot_type=slot_type.value,
-                used_resource_pool=False,
-                failover_trace=failover_trace,
-            ),
-        }
-    except AppException as e:
-        failover_trace.append(
-            build_trace_entry(
-                provider_name=primary_provider.name,
-                model_id=slot.primary_model_id,
-                success=False,
-                error=e.message,
-            )
+    )
+    if attempt.index > 0:
+        logger.warning(
+            f"{label}资源池备选模型调用失败",
+            provider=attempt.provider_name,
+            model=attempt.model_id,
+            error=error.message,
+        )
+    else:
+        logger.warning(
+            f"{label}主模型调用失败，尝试资源池故障转移", slot_type=route.slot_type.value, error=error.message
         )
-        logger.warning("主模型调用失败，尝试资源池故障转移", slot_type=slot_type.value, error=e.message)
 
-    for item in slot.fallback_chain or []:
-        fb_provider_id = item.get("provider_id")
-        fb_model_id = item.get("model_id")
-        fb_provider = await db.get(Provider, fb_provider_id)
-        fb_provider_name = fb_provider.name if fb_provider else "未知"
 
-        try:
-            result = await call_completion(
-                db,
-                provider_id=str(fb_provider_id),
-                model_id=fb_model_id,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                encryption_key=encryption_key,
+async def _single_call(
+    providers: ResolvedProviders,
+    route: SlotRoute,
+    attempt: _Attempt,
+    call: TargetCall,
+    *,
+    trace: list[dict[str, Any]],
+    label: str,
+) -> tuple[_Attempt, dict] | None:
+    """顺序调用一个候选，失败返回 None。"""
+    try:
+        result = await _call_attempt(providers, attempt, call)
+    except AppException as e:
+        _record_failure(route, attempt, e, trace, label)
+        return None
+    _record_success(attempt, result, trace)
+    return attempt, result
+
+
+async def _hedged_call(
+    providers: ResolvedProviders,
+    route: SlotRoute,
+    primary: _Attempt,
+    backup: _Attempt,
+    call: TargetCall,
+    policy: HedgePolicy,
+    *,
+    trace: list[dict[str, Any]],
+    label: str,
+) -> tuple[_Attempt, dict] | None:
+    """主模型超过对冲延迟未返回时并发调用备选，取先成功者并取消另一方。
+
+    主模型在延迟内失败时退化为顺序故障转移。
+    """
+    delay = policy.delay_seconds(latency_tracker.samples(primary.provider_id, primary.model_id))
+    primary_task = asyncio.create_task(_call_attempt(providers, primary, call))
+    tasks = {primary_task: primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            backup.hedged = True
+            logger.info(
+                f"{label}主模型超过对冲延迟未返回，并发调用备选模型",
+                slot_type=route.slot_type.value,
+                delay_ms=round(delay * 1000),
+                backup_model=backup.model_id,
             )
-            failover_trace.append(
-                build_trace_entry(
-                    provider_name=fb_provider_name,
-                    model_id=fb_model_id,
-                    success=True,
-                    latency_ms=result["latency_ms"],
-                )
+            tasks[asyncio.create_task(_call_attempt(providers, backup, call))] = backup
+
+        while tasks:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                attempt = tasks.pop(task)
+                try:
+                    result = task.result()
+                except AppException as e:
+                    _record_failure(route, attempt, e, trace, label)
+                    continue
+                _record_success(attempt, result, trace)
+                for loser in tasks.values():
+                    trace.append(
+                        build_trace_entry(
+                            provider_name=loser.provider_name,
+                            model_id=loser.model_id,
+                            success=False,
+                            error="对冲调用已取消（另一路先返回）",
+                            hedged=loser.hedged,
+                        )
+                    )
+                return attempt, result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    if backup.hedged:
+        return None
+    return await _single_call(providers, route, backup, call, trace=trace, label=label)
+
+
+async def _invoke_with_failover(
+    route: SlotRoute,
+    providers: ResolvedProviders,
+    call: TargetCall,
+    *,
+    label: str = "",
+) -> dict:
+    """按 主模型 → 降级链 依次调用，返回首个成功结果与路由追踪。
+
+    槽位 config.load_balancing 启用时，主模型与降级链按实时权重重新排序（见 core.load_balancer）；
+    config.hedging 启用时，排序后的前两项按对冲策略调用（见 core.hedging）；
+    熔断中的 (provider, model) 直接跳过（见 core.circuit_breaker）。
+
+    不访问数据库（Provider 已由 _resolve_providers 预先解析），可安全地在 single-flight 共享任务中执行。
+
+    Args:
+        providers: 预先解析的候选 Provider
+        call: (provider, api_key, model_id) → 调用结果
+        label: 日志 / 错误信息中的模型类别前缀（如 "Embedding "）
+    """
+    targets = [(route.primary_provider_id, route.primary_model_id)] + list(route.fallback_chain)
+    pending = [_Attempt(index, provider_id, model_id) for index, (provider_id, model_id) in enumerate(targets)]
+    pool = PoolPolicy.from_slot_config(route.config)
+    if pool is not None:
+        pending = load_balancer.order(pending, pool)
+    hedge = HedgePolicy.from_slot_config(route.config) if len(pending) > 1 else None
+    failover_trace: list[dict[str, Any]] = []
+
+    while pending:
+        if hedge is not None:
+            winner = await _hedged_call(
+                providers,
+                route,
+                pending[0],
+                pending[1],
+                call,
+                hedge,
+                trace=failover_trace,
+                label=label,
             )
+            pending = pending[2:]
+            hedge = None  # 只对首轮候选对冲
+        else:
+            winner = await _single_call(providers, route, pending[0], call, trace=failover_trace, label=label)
+            pending = pending[1:]
+
+        if winner is not None:
+            attempt, result = winner
             return {
                 "result": result,
                 "routing": build_routing_info(
-                    provider_name=fb_provider_name,
-                    model_id=fb_model_id,
-                    slot_type=slot_type.value,
-                    used_resource_pool=True,
+                    provider_name=attempt.provider_name,
+                    model_id=attempt.model_id,
+                    slot_type=route.slot_type.value,
+                    used_resource_pool=attempt.index > 0,
                     failover_trace=failover_trace,
                 ),
             }
-        except AppException as e:
-            failover_trace.append(
-                build_trace_entry(
-                    provider_name=fb_provider_name,
-                    model_id=fb_model_id,
-                    success=False,
-                    error=e.message,
-                )
-            )
-            logger.warning("资源池备选模型调用失败", provider=fb_provider_name, model=fb_model_id, error=e.message)
 
     raise AppException(
         code=LLMErrorCode.ALL_MODELS_FAILED,
-        message="所有模型（主模型 + 资源池）均调用失败",
+        message=f"所有 {label}模型（主模型 + 资源池）均调用失败" if label else "所有模型（主模型 + 资源池）均调用失败",
         status_code=503,
         details={"failover_trace": failover_trace},
     )
 
 
-async def invoke_embedding_slot(
+async def invoke_slot(
     db: AsyncSession,
+    slot_type: SlotType,
     *,
-    input_texts: str | list[str],
+    messages: list[dict],
+    max_tokens: int | None = None,
+    temperature: float | None = None,
     encryption_key: str,
-    dimensions: int | None = None,
 ) -> dict:
-    """基于 embedding 槽位调用向量化（含故障转移）。"""
-    slot = await get_slot(db, SlotType.EMBEDDING)
-    if slot is None or not slot.is_enabled:
-        raise AppException(
-            code=LLMErrorCode.SLOT_NOT_CONFIGURED,
-            message="槽位 'embedding' 未配置或已禁用",
-            status_code=503,
+    """槽位调用（含资源池故障转移；相同的在途请求共享一次上游调用）。"""
+    route = await _require_route(db, slot_type, encryption_key)
+
+    async def call(provider: ProviderSnapshot, api_key: str, model_id: str) -> dict:
+        return await _complete(
+            provider,
+            api_key,
+            model_id=model_id,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
         )
 
-    primary_provider = await db.get(Provider, slot.primary_provider_id)
-    if primary_provider is None:
-        raise AppException(
-            code=LLMErrorCode.SLOT_NOT_CONFIGURED,
-            message="槽位 'embedding' 的主 Provider 不存在",
-            status_code=503,
-        )
+    key = request_key(
+        "chat",
+        slot_type.value,
+        version=route_cache.version,
+        messages=messages,
+        max_tokens=max_tokens,
+        temperature=temperature,
+    )
+    providers = await _resolve_providers(db, route, encryption_key)
+    return await single_flight.do(key, lambda: _invoke_with_failover(route, providers, call))
 
-    failover_trace: list[dict[str, Any]] = []
 
-    try:
-        result = await call_embedding(
-            db,
-            provider_id=str(slot.primary_provider_id),
-            model_id=slot.primary_model_id,
-            input_texts=input_texts,
-            dimensions=dimensions,
-            encryption_key=encryption_key,
-        )
-        failover_trace.append(
-            build_trace_entry(
-                provider_name=primary_provider.name,
-                model_id=slot.primary_model_id,
-                success=True,
-                latency_ms=result["latency_ms"],
-            )
-        )
-        return {
-            "result": result,
-            "routing": build_routing_info(
-                provider_name=primary_provider.name,
-                model_id=slot.primary_model_id,
-                slot_type=SlotType.EMBEDDING.value,
-                used_resource_pool=False,
-                failover_trace=failover_trace,
-            ),
-        }
-    except AppException as e:
-        failover_trace.append(
-            build_trace_entry(
-                provider_name=primary_provider.name,
-                model_id=slot.primary_model_id,
-                success=False,
-                error=e.message,
-            )
-        )
-        logger.warning("Embedding 主模型调用失败，尝试资源池故障转移", error=e.message)
+async def invoke_slot_stream(
+    db: AsyncSession,
+    slot_type: SlotType,
+    *,
+    messages: list[dict],
+    max_tokens: int | None = None,
+    temperature: float | None = None,
+    encryption_key: str,
+) -> AsyncGenerator[str, None]:
+    """流式槽位调用：首个分片到达前按 主模型 → 降级链 故障转移，之后固定在该 Provider 上转发。
 
-    for item in slot.fallback_chain or []:
-        fb_provider_id = item.get("provider_id")
-        fb_model_id = item.get("model_id")
-        fb_provider = await db.get(Provider, fb_provider_id)
-        fb_provider_name = fb_provider.name if fb_provider else "未知"
+    跳过熔断中的候选，资源池模式下按实时权重排序；全部失败时抛出 ALL_MODELS_FAILED（不会以 200 开始响应）。
+    结束事件中附带 routing。
+    """
+    route = await _require_route(db, slot_type, encryption_key)
+    targets = [(route.primary_provider_id, route.primary_model_id)] + list(route.fallback_chain)
+    pending = [_Attempt(index, provider_id, model_id) for index, (provider_id, model_id) in enumerate(targets)]
+    pool = PoolPolicy.from_slot_config(route.config)
+    if pool is not None:
+        pending = load_balancer.order(pending, pool)
+    failover_trace: list[dict[str, Any]] = []
 
+    for attempt in pending:
+        start = time.monotonic()
         try:
-            result = await call_embedding(
-                db,
-                provider_id=str(fb_provider_id),
-                model_id=fb_model_id,
-                input_texts=input_texts,
-                dimensions=dimensions,
-                encryption_key=encryption_key,
-            )
-            failover_trace.append(
-                build_trace_entry(
-                    provider_name=fb_provider_name,
-                    model_id=fb_model_id,
-                    success=True,
-                    latency_ms=result["latency_ms"],
-                )
-            )
-            return {
-                "result": result,
-                "routing": build_routing_info(
-                    provider_name=fb_provider_name,
-                    model_id=fb_model_id,
-                    slot_type=SlotType.EMBEDDING.value,
-                    used_resource_pool=True,
-                    failover_trace=failover_trace,
-                ),
-            }
+            provider, api_key = await route_cache.provider(db, attempt.provider_id, encryption_key)
+            attempt.provider_name = provider.name
+            if not circuit_breakers.allow(attempt.provider_id, attempt.model_id):
+                raise AppException(code=LLMErrorCode.CIRCUIT_OPEN, message="熔断中，已跳过", status_code=503)
         except AppException as e:
-            failover_trace.append(
-                build_trace_entry(
-                    provider_name=fb_provider_name,
-                    model_id=fb_model_id,
-                    success=False,
-                    error=e.message,
-                )
-            )
-            logger.warning(
-                "Embedding 资源池备选模型调用失败", provider=fb_provider_name, model=fb_model_id, error=e.message
+            _record_failure(route, attempt, e, failover_trace, "")
+            continue
+
+        load_balancer.begin(attempt.provider_id)
+        try:
+            stream, first = await _open_stream(
+                provider,
+                api_key,
+                model_id=attempt.model_id,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
             )
+        except AppException as e:
+            load_balancer.end(attempt.provider_id)
+            if is_health_failure(e):
+                circuit_breakers.record_failure(attempt.provider_id, attempt.model_id)
+                load_balancer.record(attempt.provider_id, attempt.model_id, success=False)
+            else:
+                circuit_breakers.release(attempt.provider_id, attempt.model_id)
+            _record_failure(route, attempt, e, failover_trace, "")
+            continue
+        except BaseException:
+            load_balancer.end(attempt.provider_id)
+            circuit_breakers.release(attempt.provider_id, attempt.model_id)
+            raise
+
+        # 首包耗时作为该候选本次调用的延迟样本
+        first_chunk_ms = int((time.monotonic() - start) * 1000)
+        circuit_breakers.record_success(attempt.provider_id, attempt.model_id, first_chunk_ms)
+        load_balancer.record(attempt.provider_id, attempt.model_id, success=True, latency_ms=first_chunk_ms)
+        _record_success(attempt, {"latency_ms": first_chunk_ms}, failover_trace)
+        routing = build_routing_info(
+            provider_name=attempt.provider_name,
+            model_id=attempt.model_id,
+            slot_type=route.slot_type.value,
+            used_resource_pool=attempt.index > 0,
+            failover_trace=failover_trace,
+        )
+        return _relay_stream(
+            provider,
+            attempt.model_id,
+            stream,
+            first,
+            start=start,
+            routing=routing,
+            on_close=functools.partial(load_balancer.end, attempt.provider_id),
+        )
 
     raise AppException(
         code=LLMErrorCode.ALL_MODELS_FAILED,
-        message="所有 Embedding 模型（主模型 + 资源池）均调用失败",
+        message="所有模型（主模型 + 资源池）均调用失败",
         status_code=503,
         details={"failover_trace": failover_trace},
     )
 
 
+async def invoke_embedding_slot(
+    db: AsyncSession,
+    *,
+    input_texts: str | list[str],
+    encryption_key: str,
+    dimensions: int | None = None,
+) -> dict:
+    """基于 embedding 槽位调用向量化（含故障转移；相同的在途请求共享一次上游调用）。"""
+    route = await _require_route(db, SlotType.EMBEDDING, encryption_key)
+
+    async def call(provider: ProviderSnapshot, api_key: str, model_id: str) -> dict:
+        return await _embed(provider, api_key, model_id=model_id, input_texts=input_texts, dimensions=dimensions)
+
+    key = request_key(
+        "embedding",
+        SlotType.EMBEDDING.value,
+        version=route_cache.version,
+        input_texts=input_texts,
+        dimensions=dimensions,
+    )
+    providers = await _resolve_providers(db, route, encryption_key)
+    return await single_flight.do(key, lambda: _invoke_with_failover(route, providers, call, label="Embedding "))
+
+
 async def invoke_rerank_slot(
     db: AsyncSession,
     *,
@@ -891,116 +1298,13 @@ async def invoke_rerank_slot(
     top_n: int | None = None,
 ) -> dict:
     """基于 rerank 槽位调用重排序（含故障转移）。"""
-    slot = await get_slot(db, SlotType.RERANK)
-    if slot is None or not slot.is_enabled:
-        raise AppException(
-            code=LLMErrorCode.SLOT_NOT_CONFIGURED,
-            message="槽位 'rerank' 未配置或已禁用",
-            status_code=503,
-        )
+    route = await _require_route(db, SlotType.RERANK, encryption_key)
 
-    primary_provider = await db.get(Provider, slot.primary_provider_id)
-    if primary_provider is None:
-        raise AppException(
-            code=LLMErrorCode.SLOT_NOT_CONFIGURED,
-            message="槽位 'rerank' 的主 Provider 不存在",
-            status_code=503,
-        )
-
-    failover_trace: list[dict[str, Any]] = []
-    try:
-        result = await call_rerank(
-            db,
-            provider_id=str(slot.primary_provider_id),
-            model_id=slot.primary_model_id,
-            query=query,
-            documents=documents,
-            encryption_key=encryption_key,
-        )
+    async def call(provider: ProviderSnapshot, api_key: str, model_id: str) -> dict:
+        result = await _rerank(provider, api_key, model_id=model_id, query=query, documents=documents)
         if top_n is not None:
             result["results"] = result["results"][:top_n]
+        return result
 
-        failover_trace.append(
-            build_trace_entry(
-                provider_name=primary_provider.name,
-                model_id=slot.primary_model_id,
-                success=True,
-                latency_ms=result["latency_ms"],
-            )
-        )
-        return {
-            "result": result,
-            "routing": build_routing_info(
-                provider_name=primary_provider.name,
-                model_id=slot.primary_model_id,
-                slot_type=SlotType.RERANK.value,
-                used_resource_pool=False,
-                failover_trace=failover_trace,
-            ),
-        }
-    except AppException as e:
-        failover_trace.append(
-            build_trace_entry(
-                provider_name=primary_provider.name,
-                model_id=slot.primary_model_id,
-                success=False,
-                error=e.message,
-            )
-        )
-        logger.warning("Rerank 主模型调用失败，尝试资源池故障转移", error=e.message)
-
-    for item in slot.fallback_chain or []:
-        fb_provider_id = item.get("provider_id")
-        fb_model_id = item.get("model_id")
-        fb_provider = await db.get(Provider, fb_provider_id)
-        fb_provider_name = fb_provider.name if fb_provider else "未知"
-
-        try:
-            result = await call_rerank(
-                db,
-                provider_id=str(fb_provider_id),
-                model_id=fb_model_id,
-                query=query,
-                documents=documents,
-                encryption_key=encryption_key,
-            )
-            if top_n is not None:
-                result["results"] = result["results"][:top_n]
-
-            failover_trace.append(
-                build_trace_entry(
-                    provider_name=fb_provider_name,
-                    model_id=fb_model_id,
-                    success=True,
-                    latency_ms=result["latency_ms"],
-                )
-            )
-            return {
-                "result": result,
-                "routing": build_routing_info(
-                    provider_name=fb_provider_name,
-                    model_id=fb_model_id,
-                    slot_type=SlotType.RERANK.value,
-                    used_resource_pool=True,
-                    failover_trace=failover_trace,
-                ),
-            }
-        except AppException as e:
-            failover_trace.append(
-                build_trace_entry(
-                    provider_name=fb_provider_name,
-                    model_id=fb_model_id,
-                    success=False,
-                    error=e.message,
-                )
-            )
-            logger.warning(
-                "Rerank 资源池备选模型调用失败", provider=fb_provider_name, model=fb_model_id, error=e.message
-            )
-
-    raise AppException(
-        code=LLMErrorCode.ALL_MODELS_FAILED,
-        message="所有 Rerank 模型（主模型 + 资源池）均调用失败",
-        status_code=503,
-        details={"failover_trace": failover_trace},
-    )
+    providers = await _resolve_providers(db, route, encryption_key)
+    return await _invoke_with_failover(route, providers, call, label="Rerank ")
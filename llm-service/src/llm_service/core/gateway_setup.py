@@ -0,0 +1,41 @@
+"""网关进程级组件的启动配置。
+
+llm-service 独立部署（app.py）与统一开发服务器（main.py）共用，按服务配置设置
+运行时模式、上游连接池、路由缓存、熔断器、负载均衡、Embedding 微批与请求合并。
+"""
+
+from llm_service.core.circuit_breaker import circuit_breakers
+from llm_service.core.config import LLMServiceSettings
+from llm_service.core.embedding_batcher import embedding_batcher
+from llm_service.core.load_balancer import load_balancer
+from llm_service.core.provider_clients import provider_clients
+from llm_service.core.route_cache import route_cache
+from llm_service.core.runtime import llm_runtime
+from llm_service.core.single_flight import single_flight
+
+
+def configure_gateway(settings: LLMServiceSettings) -> None:
+    """按服务配置设置网关的进程级共享实例（应用启动时调用一次）。"""
+    llm_runtime.configure(mode=settings.llm_runtime_mode, http_fallback=settings.llm_runtime_http_fallback)
+    provider_clients.configure(
+        max_connections=settings.upstream_max_connections,
+        max_keepalive_connections=settings.upstream_max_keepalive,
+        keepalive_expiry=settings.upstream_keepalive_expiry,
+    )
+    route_cache.configure(ttl_seconds=settings.route_cache_ttl_seconds)
+    circuit_breakers.configure(
+        window_seconds=settings.circuit_window_seconds,
+        min_calls=settings.circuit_min_calls,
+        failure_rate_threshold=settings.circuit_failure_rate_threshold,
+        slow_call_ms=settings.circuit_slow_call_ms,
+        slow_call_rate_threshold=settings.circuit_slow_call_rate_threshold,
+        open_seconds=settings.circuit_open_seconds,
+        half_open_max_calls=settings.circuit_half_open_max_calls,
+    )
+    load_balancer.configure(alpha=settings.load_balancer_ewma_alpha)
+    embedding_batcher.configure(
+        enabled=settings.embedding_batch_enabled,
+        window_ms=settings.embedding_batch_window_ms,
+        max_inputs=settings.embedding_batch_max_inputs,
+    )
+    single_flight.configure(enabled=settings.single_flight_enabled)
@@ -0,0 +1,76 @@
+"""槽位调用对冲（hedged requests）。
+
+主模型在 p95 延迟内未返回时，同时向降级链第一项发起调用，取先成功的结果并取消另一方，
+以有限的额外调用量压住长尾延迟（主要面向交互式 fast 槽位）。
+
+槽位 config 中的 hedging 配置（缺省不启用）::
+
+    {"hedging": {"enabled": true, "percentile": 0.95, "min_delay_ms": 200,
+                 "max_delay_ms": 10000, "initial_delay_ms": 2000, "min_samples": 20}}
+
+对冲延迟取主模型近期成功调用耗时的 percentile 分位，样本不足时使用 initial_delay_ms，
+最终限制在 [min_delay_ms, max_delay_ms] 内。
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from llm_service.core.stats import percentile
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """槽位对冲策略。"""
+
+    percentile: float = 0.95
+    min_delay_ms: float = 200.0
+    max_delay_ms: float = 10_000.0
+    initial_delay_ms: float = 2_000.0
+    min_samples: int = 20
+
+    @classmethod
+    def from_slot_config(cls, config: dict[str, Any] | None) -> "HedgePolicy | None":
+        """从槽位 config.hedging 解析策略，未启用返回 None。"""
+        raw = (config or {}).get("hedging")
+        if not isinstance(raw, dict) or not raw.get("enabled"):
+            return None
+        defaults = cls()
+        return cls(
+            percentile=float(raw.get("percentile", defaults.percentile)),
+            min_delay_ms=float(raw.get("min_delay_ms", defaults.min_delay_ms)),
+            max_delay_ms=float(raw.get("max_delay_ms", defaults.max_delay_ms)),
+            initial_delay_ms=float(raw.get("initial_delay_ms", defaults.initial_delay_ms)),
+            min_samples=int(raw.get("min_samples", defaults.min_samples)),
+        )
+
+    def delay_seconds(self, samples: list[float]) -> float:
+        """按近期耗时样本计算对冲延迟（秒）。"""
+        delay_ms = percentile(samples, self.percentile) if len(samples) >= self.min_samples else None
+        if delay_ms is None:
+            delay_ms = self.initial_delay_ms
+        return min(self.max_delay_ms, max(self.min_delay_ms, delay_ms)) / 1000
+
+
+class LatencyTracker:
+    """按 (provider_id, model_id) 保存最近成功调用的耗时（毫秒）。"""
+
+    def __init__(self, *, window_size: int = 200) -> None:
+        self._window_size = window_size
+        self._samples: dict[tuple[str, str], deque[float]] = {}
+
+    def record(self, provider_id: str, model_id: str, latency_ms: float) -> None:
+        """记录一次成功调用的耗时。"""
+        key = (str(provider_id), model_id)
+        window = self._samples.get(key)
+        if window is None:
+            window = self._samples[key] = deque(maxlen=self._window_size)
+        window.append(latency_ms)
+
+    def samples(self, provider_id: str, model_id: str) -> list[float]:
+        """近期耗时样本。"""
+        return list(self._samples.get((str(provider_id), model_id), ()))
+
+
+# 进程级共享实例
+latency_tracker = LatencyTracker()
@@ -0,0 +1,140 @@
+"""槽位资源池负载均衡。
+
+默认模式下流量全部打到主模型，降级链只在失败时使用；资源池模式把主模型与降级链视为
+一组等价候选，每次调用按实时权重排序，吞吐不再受单个 Provider 限速约束。
+
+槽位 config 中的 load_balancing 配置（缺省不启用）::
+
+    {"load_balancing": {"enabled": true,
+                        "max_concurrency": {"<provider_id>": 20},
+                        "weights": {"<provider_id>:<model_id>": 2.0}}}
+
+权重 = 静态权重（weights，缺省 1，可用于表达成本偏好）× (1 - EWMA 错误率)² / EWMA 延迟。
+排序为按权重的无放回随机抽样；已达并发上限的 Provider 排到最后（仍作为故障转移候选）。
+"""
+
+import math
+import random
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any, Protocol, TypeVar
+
+
+class RouteTarget(Protocol):
+    """可参与负载均衡的候选（provider_id + model_id）。"""
+
+    provider_id: str
+    model_id: str
+
+
+T = TypeVar("T", bound=RouteTarget)
+
+
+@dataclass(frozen=True)
+class PoolPolicy:
+    """槽位资源池策略。"""
+
+    max_concurrency: dict[str, int] = field(default_factory=dict)
+    weights: dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_slot_config(cls, config: dict[str, Any] | None) -> "PoolPolicy | None":
+        """从槽位 config.load_balancing 解析策略，未启用返回 None。"""
+        raw = (config or {}).get("load_balancing")
+        if not isinstance(raw, dict) or not raw.get("enabled"):
+            return None
+        return cls(
+            max_concurrency={str(k): int(v) for k, v in (raw.get("max_concurrency") or {}).items()},
+            weights={str(k): float(v) for k, v in (raw.get("weights") or {}).items()},
+        )
+
+    def static_weight(self, provider_id: str, model_id: str) -> float:
+        """配置的静态权重（缺省 1）。"""
+        return self.weights.get(f"{provider_id}:{model_id}", 1.0)
+
+
+@dataclass
+class TargetStats:
+    """单个 (provider, model) 的 EWMA 统计。"""
+
+    latency_ms: float | None = None
+    error_rate: float = 0.0
+    calls: int = 0
+
+
+class LoadBalancer:
+    """维护各候选的 EWMA 延迟 / 错误率与各 Provider 在途调用数。"""
+
+    def __init__(self, *, alpha: float = 0.2) -> None:
+        self._alpha = alpha
+        self._stats: dict[tuple[str, str], TargetStats] = {}
+        self._inflight: dict[str, int] = {}
+
+    def configure(self, *, alpha: float) -> None:
+        """应用启动时按服务配置设置 EWMA 平滑系数。"""
+        self._alpha = alpha
+
+    def begin(self, provider_id: str) -> None:
+        """调用开始：Provider 在途数 +1。"""
+        key = str(provider_id)
+        self._inflight[key] = self._inflight.get(key, 0) + 1
+
+    def end(self, provider_id: str) -> None:
+        """调用结束：Provider 在途数 -1。"""
+        key = str(provider_id)
+        self._inflight[key] = max(0, self._inflight.get(key, 0) - 1)
+
+    def record(self, provider_id: str, model_id: str, *, success: bool, latency_ms: float | None = None) -> None:
+        """记录一次调用结果。"""
+        stats = self._stats.setdefault((str(provider_id), model_id), TargetStats())
+        stats.calls += 1
+        stats.error_rate += self._alpha * ((0.0 if success else 1.0) - stats.error_rate)
+        if success and latency_ms is not None:
+            if stats.latency_ms is None:
+                stats.latency_ms = float(latency_ms)
+            else:
+                stats.latency_ms += self._alpha * (latency_ms - stats.latency_ms)
+
+    def weight(self, provider_id: str, model_id: str, policy: PoolPolicy, default_latency_ms: float) -> float:
+        """候选当前权重。"""
+        stats = self._stats.get((str(provider_id), model_id)) or TargetStats()
+        latency = stats.latency_ms if stats.latency_ms is not None else default_latency_ms
+        health = (1.0 - stats.error_rate) ** 2
+        return policy.static_weight(str(provider_id), model_id) * max(health, 0.01) / max(latency, 1.0)
+
+    def order(self, targets: Sequence[T], policy: PoolPolicy) -> list[T]:
+        """按权重随机排序候选；已达并发上限的 Provider 排在最后。"""
+        known = [
+            s.latency_ms
+            for t in targets
+            if (s := self._stats.get((str(t.provider_id), t.model_id))) is not None and s.latency_ms is not None
+        ]
+        # 无样本的候选按已知平均延迟估计，让新加入的候选也能分到流量
+        default_latency = sum(known) / len(known) if known else 1000.0
+
+        def sort_key(target: T) -> tuple[bool, float]:
+            limit = policy.max_concurrency.get(str(target.provider_id))
+            saturated = limit is not None and self._inflight.get(str(target.provider_id), 0) >= limit
+            w = self.weight(target.provider_id, target.model_id, policy, default_latency)
+            # 加权无放回抽样：-ln(u)/w 升序（等价于 Efraimidis–Spirakis 的 u^(1/w) 降序）
+            return saturated, -math.log(random.random() or 1e-12) / w
+
+        return sorted(targets, key=sort_key)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """各候选统计与 Provider 在途数。"""
+        return [
+            {
+                "provider_id": provider_id,
+                "model_id": model_id,
+                "ewma_latency_ms": round(stats.latency_ms, 1) if stats.latency_ms is not None else None,
+                "ewma_error_rate": round(stats.error_rate, 3),
+                "calls": stats.calls,
+                "inflight": self._inflight.get(provider_id, 0),
+            }
+            for (provider_id, model_id), stats in self._stats.items()
+        ]
+
+
+# 进程级共享实例
+load_balancer = LoadBalancer()
@@ -0,0 +1,130 @@
+"""上游 Provider HTTP 连接池注册表。
+
+每个 Provider 一个长期存活的 httpx.AsyncClient，上游调用复用 keep-alive 连接，
+不再为每次请求重新做 TCP / TLS 握手。
+
+按 (provider_id, base_url) 缓存；Provider.config 中可覆盖：
+- timeout_seconds：单次调用超时（未配置时使用调用方默认值）
+- max_connections / max_keepalive_connections：连接池上限
+
+Provider 更新或删除时调用 invalidate()；连接参数变化（base_url、连接池上限）时 get() 也会自动重建。
+被替换的 client 不立即关闭（可能仍有进行中的请求），retire_grace_seconds 后在后台关闭；
+应用关闭时 aclose() 立即关闭全部 client。
+"""
+
+import asyncio
+from typing import Any
+
+import httpx
+import structlog
+
+from llm_service.core.route_cache import ProviderSnapshot
+
+logger = structlog.get_logger(__name__)
+
+
+class ProviderClientRegistry:
+    """按 Provider 复用上游 HTTP 连接池。"""
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 60.0,
+        retire_grace_seconds: float = 300.0,
+    ) -> None:
+        self._max_connections = max_connections
+        self._max_keepalive = max_keepalive_connections
+        self._keepalive_expiry = keepalive_expiry
+        # 被替换的 client 延迟关闭的宽限期：须长于单次上游调用（含流式）的最长耗时
+        self._retire_grace = retire_grace_seconds
+        self._clients: dict[str, tuple[tuple, httpx.AsyncClient]] = {}
+        self._retired: list[httpx.AsyncClient] = []
+        self._closing: set[asyncio.Task] = set()
+
+    def configure(
+        self,
+        *,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+    ) -> None:
+        """应用启动时按服务配置设置默认连接池参数。"""
+        self._max_connections = max_connections
+        self._max_keepalive = max_keepalive_connections
+        self._keepalive_expiry = keepalive_expiry
+
+    def get(self, provider: ProviderSnapshot) -> httpx.AsyncClient:
+        """获取 Provider 的共享 client（不存在或连接参数变化时创建）。"""
+        key = str(provider.id)
+        fingerprint = self._fingerprint(provider)
+        entry = self._clients.get(key)
+        if entry is not None:
+            if entry[0] == fingerprint:
+                return entry[1]
+            self._retire(entry[1])
+
+        config = provider.config or {}
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=int(config.get("max_connections") or self._max_connections),
+                max_keepalive_connections=int(config.get("max_keepalive_connections") or self._max_keepalive),
+                keepalive_expiry=self._keepalive_expiry,
+            ),
+        )
+        self._clients[key] = (fingerprint, client)
+        logger.info("创建上游连接池", provider=provider.name, base_url=provider.base_url)
+        return client
+
+    @staticmethod
+    def timeout(provider: ProviderSnapshot, default: float) -> float:
+        """单次调用超时：Provider.config.timeout_seconds 优先，否则使用调用方默认值。"""
+        value: Any = (provider.config or {}).get("timeout_seconds")
+        return float(value) if value else default
+
+    def invalidate(self, provider_id: Any) -> None:
+        """Provider 更新 / 删除后移除其连接池，下次调用按最新配置重建。"""
+        entry = self._clients.pop(str(provider_id), None)
+        if entry is not None:
+            self._retire(entry[1])
+
+    def _retire(self, client: httpx.AsyncClient) -> None:
+        """被替换的 client 等进行中的请求结束后关闭（无事件循环时留到 aclose()）。"""
+        self._retired.append(client)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._close_later(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close_later(self, client: httpx.AsyncClient) -> None:
+        await asyncio.sleep(self._retire_grace)
+        if client in self._retired:
+            self._retired.remove(client)
+            await client.aclose()
+
+    async def aclose(self) -> None:
+        """关闭全部连接池（应用关闭时调用）。"""
+        for task in list(self._closing):
+            task.cancel()
+        clients = [client for _, client in self._clients.values()] + self._retired
+        self._clients.clear()
+        self._retired = []
+        for client in clients:
+            await client.aclose()
+
+    @staticmethod
+    def _fingerprint(provider: ProviderSnapshot) -> tuple:
+        config = provider.config or {}
+        return (
+            provider.base_url,
+            config.get("max_connections"),
+            config.get("max_keepalive_connections"),
+        )
+
+
+# 进程级共享实例（网关调用与 Provider 管理共用）
+provider_clients = ProviderClientRegistry()
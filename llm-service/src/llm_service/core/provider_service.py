@@ -12,6 +12,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from llm_service.core.crypto import decrypt_api_key, encrypt_api_key
 from llm_service.core.errors import LLMErrorCode
 from llm_service.core.presets import get_preset
+from llm_service.core.provider_clients import provider_clients
+from llm_service.core.route_cache import notify_config_changed
 from llm_service.models.provider import Provider
 from prism_shared.exceptions import AppException, NotFoundException
 
@@ -130,6 +132,8 @@ async def update_provider(
 
     await db.flush()
     await db.refresh(provider)
+    provider_clients.invalidate(provider.id)
+    await notify_config_changed(db, reason=f"provider_updated:{provider.id}")
     return provider
 
 
@@ -151,6 +155,8 @@ async def delete_provider(db: AsyncSession, provider_id: uuid.UUID) -> None:
 
     await db.delete(provider)
     await db.flush()
+    provider_clients.invalidate(provider_id)
+    await notify_config_changed(db, reason=f"provider_deleted:{provider_id}")
 
 
 async def test_provider_connectivity(
@@ -0,0 +1,230 @@
+"""槽位路由 / Provider 配置的进程内缓存。
+
+网关热路径每次调用原本需要：SELECT model_slots、db.get(Provider)（主 Provider + 每个降级项）、
+Fernet 解密 API Key。缓存后命中时零数据库查询、零解密：
+- 槽位：slot_type → 主模型 + 降级链（仅 ID）
+- Provider：provider_id → ProviderSnapshot + 解密后的 API Key（只保存在进程内存中）
+
+失效：
+1. configure_slot / update_provider / delete_provider 调用 notify_config_changed()：
+   立即清空本进程缓存，并在同一事务内 pg_notify，提交后其他副本经 LISTEN 收到通知后清空
+2. TTL 兜底（监听连接断开、未启动监听等情况下最多延迟 ttl 秒生效）
+
+缓存带版本号：加载期间发生失效时，加载结果不写入缓存，避免旧配置覆盖新配置。
+"""
+
+import time
+import uuid
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from llm_service.core.crypto import decrypt_api_key
+from llm_service.models.provider import Provider
+from llm_service.models.slot import ModelSlot, SlotType
+from prism_shared.exceptions import NotFoundException
+
+logger = structlog.get_logger(__name__)
+
+CONFIG_CHANNEL = "llm_config_changed"
+
+
+@dataclass(frozen=True)
+class ProviderSnapshot:
+    """Provider 配置快照（脱离 ORM session，可跨请求复用）。"""
+
+    id: uuid.UUID
+    name: str
+    slug: str
+    provider_type: str
+    base_url: str | None
+    config: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_model(cls, provider: Provider) -> "ProviderSnapshot":
+        """从 ORM 对象构造快照。"""
+        return cls(
+            id=provider.id,
+            name=provider.name,
+            slug=provider.slug,
+            provider_type=provider.provider_type,
+            base_url=provider.base_url,
+            config=dict(provider.config or {}),
+        )
+
+
+@dataclass(frozen=True)
+class SlotRoute:
+    """槽位路由：主模型 + 有序降级链。"""
+
+    slot_type: SlotType
+    is_enabled: bool
+    primary_provider_id: str
+    primary_model_id: str
+    fallback_chain: tuple[tuple[str, str], ...]  # (provider_id, model_id)
+    config: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_model(cls, slot: ModelSlot) -> "SlotRoute":
+        """从 ORM 对象构造路由。"""
+        return cls(
+            slot_type=slot.slot_type,
+            is_enabled=slot.is_enabled,
+            primary_provider_id=str(slot.primary_provider_id),
+            primary_model_id=slot.primary_model_id,
+            fallback_chain=tuple(
+                (str(item.get("provider_id")), item.get("model_id")) for item in slot.fallback_chain or []
+            ),
+            config=dict(slot.config or {}),
+        )
+
+
+class RouteCache:
+    """槽位路由与 Provider（含解密 API Key）的进程内缓存。"""
+
+    def __init__(self, *, ttl_seconds: float = 300.0) -> None:
+        self._ttl = ttl_seconds
+        self._version = 0
+        self._slots: dict[SlotType, tuple[float, SlotRoute | None]] = {}
+        self._providers: dict[str, tuple[float, tuple[ProviderSnapshot, str] | None]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, *, ttl_seconds: float) -> None:
+        """应用启动时按服务配置设置 TTL。"""
+        self._ttl = ttl_seconds
+
+    @property
+    def version(self) -> int:
+        """当前缓存版本（每次失效递增）。"""
+        return self._version
+
+    def invalidate(self) -> None:
+        """清空缓存并递增版本号。"""
+        self._version += 1
+        self._slots.clear()
+        self._providers.clear()
+
+    async def slot(self, db: AsyncSession, slot_type: SlotType) -> SlotRoute | None:
+        """获取槽位路由（未配置返回 None）。"""
+        entry = self._slots.get(slot_type)
+        if entry is not None and time.monotonic() < entry[0]:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        version = self._version
+        result = await db.execute(select(ModelSlot).where(ModelSlot.slot_type == slot_type))
+        slot = result.scalar_one_or_none()
+        route = SlotRoute.from_model(slot) if slot is not None else None
+        if version == self._version:
+            self._slots[slot_type] = (time.monotonic() + self._ttl, route)
+        return route
+
+    async def provider(
+        self,
+        db: AsyncSession,
+        provider_id: Any,
+        encryption_key: str,
+    ) -> tuple[ProviderSnapshot, str]:
+        """获取 Provider 快照与解密后的 API Key，不存在时抛出 404。"""
+        key = str(provider_id)
+        entry = self._providers.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            self.hits += 1
+            resolved = entry[1]
+        else:
+            self.misses += 1
+            resolved = await self._load_provider(db, key, encryption_key)
+        if resolved is None:
+            raise NotFoundException("Provider", key)
+        return resolved
+
+    async def _load_provider(
+        self,
+        db: AsyncSession,
+        key: str,
+        encryption_key: str,
+    ) -> tuple[ProviderSnapshot, str] | None:
+        try:
+            pid = uuid.UUID(key)
+        except ValueError:
+            return None
+
+        version = self._version
+        provider = await db.get(Provider, pid)
+        resolved = None
+        if provider is not None:
+            resolved = (
+                ProviderSnapshot.from_model(provider),
+                decrypt_api_key(provider.api_key_encrypted, encryption_key),
+            )
+        if version == self._version:
+            self._providers[key] = (time.monotonic() + self._ttl, resolved)
+        return resolved
+
+    def stats(self) -> dict[str, int]:
+        """命中统计。"""
+        return {"version": self._version, "hits": self.hits, "misses": self.misses}
+
+
+# 进程级共享实例
+route_cache = RouteCache()
+
+
+async def notify_config_changed(db: AsyncSession, *, reason: str) -> None:
+    """槽位 / Provider 配置变更：清空本进程缓存，并通知其他副本（随事务提交后送达）。"""
+    route_cache.invalidate()
+    await db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CONFIG_CHANNEL, "payload": reason})
+
+
+class ConfigChangeListener:
+    """LISTEN llm_config_changed，收到通知时清空路由缓存。
+
+    占用一个专用数据库连接；启动失败或连接断开时仅依赖 TTL 兜底。
+    """
+
+    def __init__(self, cache: RouteCache) -> None:
+        self._cache = cache
+        self._conn: AsyncConnection | None = None
+        self._driver: Any = None
+
+    async def start(self, engine: AsyncEngine) -> None:
+        """建立监听连接。"""
+        try:
+            self._conn = await engine.connect()
+            raw = await self._conn.get_raw_connection()
+            self._driver = raw.driver_connection
+            await self._driver.add_listener(CONFIG_CHANNEL, self._on_notify)
+            self._driver.add_termination_listener(self._on_terminated)
+            logger.info("配置变更监听已启动", channel=CONFIG_CHANNEL)
+        except Exception:
+            logger.warning("配置变更监听启动失败，路由缓存仅依赖 TTL 失效", exc_info=True)
+            await self.stop()
+
+    async def stop(self) -> None:
+        """关闭监听连接。"""
+        if self._driver is not None:
+            with suppress(Exception):
+                await self._driver.remove_listener(CONFIG_CHANNEL, self._on_notify)
+            self._driver = None
+        if self._conn is not None:
+            with suppress(Exception):
+                await self._conn.close()
+            self._conn = None
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        self._cache.invalidate()
+        logger.info("收到配置变更通知，已清空路由缓存", reason=payload, sender_pid=pid)
+
+    def _on_terminated(self, connection: Any) -> None:
+        # 断开期间可能错过通知：清空一次，之后依赖 TTL
+        self._cache.invalidate()
+        logger.warning("配置变更监听连接已断开，路由缓存仅依赖 TTL 失效")
+
+
+config_listener = ConfigChangeListener(route_cache)
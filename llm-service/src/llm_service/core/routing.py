@@ -10,14 +10,16 @@ def build_trace_entry(
     success: bool,
     error: str | None = None,
     latency_ms: int | None = None,
+    hedged: bool = False,
 ) -> dict[str, Any]:
-    """构造统一的故障转移追踪条目。"""
+    """构造统一的故障转移追踪条目（hedged 表示该次调用是对冲发起的并发调用）。"""
     return {
         "provider_name": provider_name,
         "model_id": model_id,
         "success": success,
         "error": error,
         "latency_ms": latency_ms,
+        "hedged": hedged,
     }
 
 
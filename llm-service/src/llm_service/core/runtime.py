@@ -0,0 +1,103 @@
+"""LLM 运行时适配器。
+
+运行模式（litellm / http）与 HTTP fallback 开关在应用启动时解析一次；litellm 的
+acompletion / aembedding / arerank 在首次使用或启动预热时导入一次并缓存，
+请求路径上不再有 importlib / os.getenv。
+
+litellm 导入较重（数百毫秒级，默认还会联网拉取模型价格表），开启预热后在启动阶段于线程中导入，
+并记录导入耗时，避免拖慢首个请求。环境变量 PRISM_LLM_RUNTIME_MODE / PRISM_LLM_RUNTIME_HTTP_FALLBACK
+仍可覆盖配置。
+"""
+
+import asyncio
+import importlib
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+RUNTIME_MODE_ENV = "PRISM_LLM_RUNTIME_MODE"
+RUNTIME_HTTP_FALLBACK_ENV = "PRISM_LLM_RUNTIME_HTTP_FALLBACK"
+
+
+class LLMRuntime:
+    """运行模式与 litellm 调用入口（进程内解析一次）。"""
+
+    def __init__(self, *, mode: str = "litellm", http_fallback: bool = True) -> None:
+        self.mode = mode
+        self.http_fallback = http_fallback
+        self.import_ms: float | None = None
+        self._acompletion: Callable[..., Any] | None = None
+        self._aembedding: Callable[..., Any] | None = None
+        self._arerank: Callable[..., Any] | None = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def configure(self, *, mode: str, http_fallback: bool) -> None:
+        """应用启动时按服务配置设置运行模式（环境变量优先）。"""
+        self.mode = os.getenv(RUNTIME_MODE_ENV, mode).lower()
+        fallback_env = os.getenv(RUNTIME_HTTP_FALLBACK_ENV)
+        self.http_fallback = (
+            fallback_env.lower() not in {"0", "false", "no"} if fallback_env is not None else http_fallback
+        )
+
+    @property
+    def use_litellm(self) -> bool:
+        """是否走 litellm 主路径。"""
+        return self.mode == "litellm"
+
+    def load(self) -> None:
+        """导入 litellm 并缓存调用入口（幂等，线程安全）。"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            # 使用随包发布的模型价格表，避免导入时联网拉取
+            os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+            start = time.perf_counter()
+            litellm = importlib.import_module("litellm")
+            self.import_ms = (time.perf_counter() - start) * 1000
+            litellm.suppress_debug_info = True
+            self._acompletion = litellm.acompletion
+            self._aembedding = litellm.aembedding
+            self._arerank = getattr(litellm, "arerank", None)
+            self._loaded = True
+
+    async def warm_up(self) -> None:
+        """启动预热：在线程中导入 litellm 并记录导入耗时；失败时仅告警（首次调用时会再次尝试）。"""
+        if not self.use_litellm:
+            return
+        try:
+            await asyncio.to_thread(self.load)
+        except Exception:
+            logger.warning("litellm 预加载失败", exc_info=True)
+            return
+        logger.info("litellm 预加载完成", import_ms=round(self.import_ms or 0.0, 1))
+
+    @property
+    def acompletion(self) -> Callable[..., Any]:
+        """litellm.acompletion。"""
+        self.load()
+        return self._acompletion
+
+    @property
+    def aembedding(self) -> Callable[..., Any]:
+        """litellm.aembedding。"""
+        self.load()
+        return self._aembedding
+
+    @property
+    def arerank(self) -> Callable[..., Any] | None:
+        """litellm.arerank（旧版本 litellm 不支持时为 None）。"""
+        self.load()
+        return self._arerank
+
+
+# 进程级共享实例
+llm_runtime = LLMRuntime()
@@ -8,6 +8,7 @@ from llm_service.core.gateway_service import (
     invoke_embedding_slot,
     invoke_rerank_slot,
     invoke_slot,
+    invoke_slot_stream,
 )
 from llm_service.core.provider_service import (
     create_provider,
@@ -34,6 +35,7 @@ __all__ = [
     "invoke_embedding_slot",
     "invoke_rerank_slot",
     "invoke_slot",
+    "invoke_slot_stream",
     "list_provider_models",
     "list_providers",
     "list_slots",
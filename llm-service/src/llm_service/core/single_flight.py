@@ -0,0 +1,82 @@
+"""相同在途请求合并（single-flight）。
+
+看板刷新、多个管线 worker 处理重复文本时，同一时刻会到达完全相同的槽位调用。
+以 (调用类型, 槽位, 规范化参数哈希) 为键，在途期间的相同请求共享同一次上游调用并获得同一结果。
+
+- 上游调用在独立任务中执行：某个等待方取消不影响其他等待方；所有等待方都取消时才取消上游调用
+- 上游异常同样分发给所有等待方
+- 共享的结果对象由各等待方只读使用
+"""
+
+import asyncio
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def request_key(kind: str, slot: str, **params: Any) -> str:
+    """规范化参数（键排序、紧凑分隔符）后计算请求键。"""
+    canonical = json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    digest = hashlib.sha256(canonical.encode()).hexdigest()
+    return f"{kind}:{slot}:{digest}"
+
+
+@dataclass
+class _Flight:
+    """一次在途调用及其等待方数量。"""
+
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    """按请求键合并并发的相同调用。"""
+
+    def __init__(self, *, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._flights: dict[str, _Flight] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def configure(self, *, enabled: bool) -> None:
+        """应用启动时按服务配置启用 / 关闭。"""
+        self.enabled = enabled
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """执行 fn；已有相同键的调用在途时等待其结果。"""
+        if not self.enabled:
+            return await fn()
+
+        flight = self._flights.get(key)
+        if flight is None:
+            self.calls += 1
+            flight = self._flights[key] = _Flight(task=asyncio.ensure_future(fn()))
+            flight.task.add_done_callback(lambda _: self._release(key, flight))
+        else:
+            self.shared += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _release(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> dict[str, int]:
+        """上游调用次数与被合并的请求数。"""
+        return {"calls": self.calls, "shared": self.shared, "inflight": len(self._flights)}
+
+
+# 进程级共享实例
+single_flight = SingleFlight()
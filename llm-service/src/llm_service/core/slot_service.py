@@ -6,6 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from llm_service.core.errors import LLMErrorCode
+from llm_service.core.route_cache import notify_config_changed
 from llm_service.models.provider import Provider
 from llm_service.models.slot import ModelSlot, SlotType
 from prism_shared.exceptions import AppException, NotFoundException
@@ -68,6 +69,7 @@ async def configure_slot(
 
     await db.flush()
     await db.refresh(slot)
+    await notify_config_changed(db, reason=f"slot_configured:{slot_type.value}")
     return slot
 
 
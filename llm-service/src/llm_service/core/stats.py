@@ -0,0 +1,11 @@
+"""延迟样本统计。"""
+
+from collections.abc import Iterable
+
+
+def percentile(values: Iterable[float], q: float) -> float | None:
+    """样本的 q 分位数（最近秩法，q ∈ [0, 1]），无样本时返回 None。"""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
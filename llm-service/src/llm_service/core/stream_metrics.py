@@ -0,0 +1,78 @@
+"""流式调用指标：按 (provider, model) 统计首 token 延迟（TTFT）与生成速率。"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from llm_service.core.stats import percentile
+
+
+@dataclass
+class _StreamWindow:
+    """单个 (provider, model) 的最近样本。"""
+
+    provider_name: str
+    ttft_ms: deque = field(default_factory=deque)
+    tokens_per_second: deque = field(default_factory=deque)
+    streams: int = 0
+    cancelled: int = 0
+
+
+class StreamMetrics:
+    """流式调用 TTFT / tokens per second 统计（仅当前进程）。"""
+
+    def __init__(self, *, window_size: int = 200) -> None:
+        self._window_size = window_size
+        self._windows: dict[tuple[str, str], _StreamWindow] = {}
+
+    def record(
+        self,
+        provider_id: str,
+        provider_name: str,
+        model_id: str,
+        *,
+        ttft_ms: float | None,
+        tokens: int,
+        generation_seconds: float,
+        cancelled: bool = False,
+    ) -> None:
+        """记录一次流式调用（ttft_ms 为 None 表示未产出 token）。"""
+        key = (str(provider_id), model_id)
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = _StreamWindow(provider_name=provider_name)
+        window.streams += 1
+        window.cancelled += int(cancelled)
+        if ttft_ms is not None:
+            window.ttft_ms.append(ttft_ms)
+        # 中途断开的流生成时长不完整，不计入速率
+        if not cancelled and tokens > 0 and generation_seconds > 0:
+            window.tokens_per_second.append(tokens / generation_seconds)
+        for samples in (window.ttft_ms, window.tokens_per_second):
+            while len(samples) > self._window_size:
+                samples.popleft()
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """各 (provider, model) 的 TTFT p50 / p95 与平均生成速率。"""
+        result = []
+        for (provider_id, model_id), window in self._windows.items():
+            ttft = list(window.ttft_ms)
+            tps = list(window.tokens_per_second)
+            p50, p95 = percentile(ttft, 0.5), percentile(ttft, 0.95)
+            result.append(
+                {
+                    "provider_id": provider_id,
+                    "provider_name": window.provider_name,
+                    "model_id": model_id,
+                    "streams": window.streams,
+                    "cancelled": window.cancelled,
+                    "ttft_ms_p50": round(p50, 1) if p50 is not None else None,
+                    "ttft_ms_p95": round(p95, 1) if p95 is not None else None,
+                    "tokens_per_second": round(sum(tps) / len(tps), 1) if tps else None,
+                }
+            )
+        return result
+
+
+# 进程级共享实例
+stream_metrics = StreamMetrics()
@@ -0,0 +1,24 @@
+"""llm-service 测试基础设施。
+
+提供共享 fixture：Provider 配置快照。
+"""
+
+import uuid
+
+import pytest
+
+from llm_service.core.route_cache import ProviderSnapshot
+
+TEST_PROVIDER_ID = uuid.UUID("00000000-0000-0000-0000-000000000101")
+
+
+@pytest.fixture()
+def provider() -> ProviderSnapshot:
+    """测试用 Provider 快照。"""
+    return ProviderSnapshot(
+        id=TEST_PROVIDER_ID,
+        name="test-provider",
+        slug="test",
+        provider_type="openai",
+        base_url="http://provider.test/v1",
+    )
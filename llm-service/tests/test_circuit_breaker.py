@@ -0,0 +1,107 @@
+"""熔断器单元测试。"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from llm_service.core import circuit_breaker
+from llm_service.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreakerRegistry, is_health_failure
+from llm_service.core.errors import LLMErrorCode
+from prism_shared.exceptions import AppException
+
+PROVIDER = "provider-1"
+MODEL = "m"
+
+
+@pytest.fixture()
+def clock(monkeypatch) -> SimpleNamespace:
+    """可手动推进的 time.monotonic。"""
+    fake = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(circuit_breaker, "time", SimpleNamespace(monotonic=lambda: fake.now))
+    return fake
+
+
+@pytest.fixture()
+def breakers(clock) -> CircuitBreakerRegistry:
+    return CircuitBreakerRegistry(min_calls=4, failure_rate_threshold=0.5, open_seconds=30, half_open_max_calls=1)
+
+
+def _state(breakers: CircuitBreakerRegistry) -> str:
+    [entry] = breakers.snapshot()
+    return entry["state"]
+
+
+def _trip(breakers: CircuitBreakerRegistry) -> None:
+    for _ in range(4):
+        assert breakers.allow(PROVIDER, MODEL)
+        breakers.record_failure(PROVIDER, MODEL)
+
+
+class TestCircuitBreaker:
+    """closed → open → half_open → closed / open。"""
+
+    def test_opens_when_failure_rate_reached(self, breakers):
+        breakers.record_success(PROVIDER, MODEL, 100)
+        breakers.record_failure(PROVIDER, MODEL)
+        breakers.record_success(PROVIDER, MODEL, 100)
+        assert _state(breakers) == CLOSED  # 样本数不足 min_calls
+
+        breakers.record_failure(PROVIDER, MODEL)
+        assert _state(breakers) == OPEN
+        assert not breakers.allow(PROVIDER, MODEL)
+        assert breakers.snapshot()[0]["rejected"] == 1
+
+    def test_half_open_probe_success_closes(self, breakers, clock):
+        _trip(breakers)
+        clock.now += 31
+
+        assert breakers.allow(PROVIDER, MODEL)
+        assert _state(breakers) == HALF_OPEN
+        assert not breakers.allow(PROVIDER, MODEL)  # 探测名额已占用
+
+        breakers.record_success(PROVIDER, MODEL, 100)
+        assert _state(breakers) == CLOSED
+        assert breakers.allow(PROVIDER, MODEL)
+
+    def test_half_open_probe_failure_reopens(self, breakers, clock):
+        _trip(breakers)
+        clock.now += 31
+
+        assert breakers.allow(PROVIDER, MODEL)
+        breakers.record_failure(PROVIDER, MODEL)
+        assert _state(breakers) == OPEN
+        assert breakers.snapshot()[0]["open_count"] == 2
+        assert not breakers.allow(PROVIDER, MODEL)
+
+    def test_release_frees_half_open_probe(self, breakers, clock):
+        """探测调用被取消：释放名额，状态保持半开。"""
+        _trip(breakers)
+        clock.now += 31
+
+        assert breakers.allow(PROVIDER, MODEL)
+        breakers.release(PROVIDER, MODEL)
+        assert _state(breakers) == HALF_OPEN
+        assert breakers.allow(PROVIDER, MODEL)
+
+    def test_slow_calls_open_breaker(self, clock):
+        breakers = CircuitBreakerRegistry(min_calls=2, slow_call_ms=1000, slow_call_rate_threshold=0.5)
+        breakers.record_success(PROVIDER, MODEL, 1500)
+        breakers.record_success(PROVIDER, MODEL, 1500)
+        assert _state(breakers) == OPEN
+
+    def test_samples_outside_window_pruned(self, breakers, clock):
+        for _ in range(3):
+            breakers.record_failure(PROVIDER, MODEL)
+        clock.now += 61
+        breakers.record_failure(PROVIDER, MODEL)
+        assert _state(breakers) == CLOSED
+
+    def test_request_errors_not_health_failures(self):
+        rejected = AppException(
+            code=LLMErrorCode.UPSTREAM_ERROR, message="HTTP 400", status_code=502, details={"upstream_status": 400}
+        )
+        unavailable = AppException(
+            code=LLMErrorCode.UPSTREAM_ERROR, message="HTTP 503", status_code=502, details={"upstream_status": 503}
+        )
+        assert not is_health_failure(rejected)
+        assert is_health_failure(unavailable)
@@ -0,0 +1,112 @@
+"""Embedding 微批单元测试。"""
+
+import asyncio
+
+import pytest
+
+from llm_service.core.embedding_batcher import EmbeddingBatcher
+from llm_service.core.errors import LLMErrorCode
+from prism_shared.exceptions import AppException
+
+KEY = ("provider-1", "bge-m3", None)
+
+
+class _FakeUpstream:
+    """记录每次上游调用的输入；含 bad_text 的调用返回 400。"""
+
+    def __init__(self, *, bad_text: str | None = None, error: Exception | None = None):
+        self.calls: list[list[str]] = []
+        self._bad_text = bad_text
+        self._error = error
+
+    async def send(self, texts: list[str]) -> dict:
+        self.calls.append(list(texts))
+        await asyncio.sleep(0)
+        if self._error is not None:
+            raise self._error
+        if self._bad_text in texts:
+            raise AppException(
+                code=LLMErrorCode.UPSTREAM_ERROR,
+                message="Provider 返回 HTTP 400",
+                status_code=502,
+                details={"upstream_status": 400},
+            )
+        return {
+            "embeddings": [{"index": i, "embedding": [float(len(t))]} for i, t in enumerate(texts)],
+            "usage": {"prompt_tokens": sum(len(t) for t in texts)},
+        }
+
+
+class TestEmbeddingBatcher:
+    """合并、拆分与失败分发。"""
+
+    async def test_merges_and_scatters_results(self):
+        batcher = EmbeddingBatcher(window_ms=5, max_inputs=64)
+        upstream = _FakeUpstream()
+
+        first, second = await asyncio.gather(
+            batcher.embed(KEY, ["a", "bb"], upstream.send),
+            batcher.embed(KEY, ["ccc"], upstream.send),
+        )
+
+        assert upstream.calls == [["a", "bb", "ccc"]]
+        assert [e["embedding"] for e in first["embeddings"]] == [[1.0], [2.0]]
+        assert [e["index"] for e in second["embeddings"]] == [0]
+        assert second["embeddings"][0]["embedding"] == [3.0]
+        assert first["usage"]["prompt_tokens"] + second["usage"]["prompt_tokens"] == 6
+
+    async def test_batch_never_exceeds_max_inputs(self):
+        batcher = EmbeddingBatcher(window_ms=5, max_inputs=4)
+        upstream = _FakeUpstream()
+
+        results = await asyncio.gather(
+            batcher.embed(KEY, ["a", "b", "c"], upstream.send),
+            batcher.embed(KEY, ["d", "e", "f"], upstream.send),
+        )
+
+        assert upstream.calls == [["a", "b", "c"], ["d", "e", "f"]]
+        assert all(len(r["embeddings"]) == 3 for r in results)
+
+    async def test_request_error_resends_individually(self):
+        """上游以 400 拒绝整个批次 → 逐个重发，只有坏输入所在请求失败。"""
+        batcher = EmbeddingBatcher(window_ms=5, max_inputs=64)
+        upstream = _FakeUpstream(bad_text="坏输入")
+
+        good, bad = await asyncio.gather(
+            batcher.embed(KEY, ["好评"], upstream.send),
+            batcher.embed(KEY, ["坏输入"], upstream.send),
+            return_exceptions=True,
+        )
+
+        assert upstream.calls == [["好评", "坏输入"], ["好评"], ["坏输入"]]
+        assert good["embeddings"][0]["embedding"] == [2.0]
+        assert isinstance(bad, AppException)
+
+    async def test_transient_error_fails_whole_batch(self):
+        """超时 / 5xx 等失败不拆分重发，同批次请求收到同一异常。"""
+        error = AppException(code=LLMErrorCode.UPSTREAM_ERROR, message="Provider 返回 HTTP 503", status_code=502)
+        batcher = EmbeddingBatcher(window_ms=5, max_inputs=64)
+        upstream = _FakeUpstream(error=error)
+
+        outcomes = await asyncio.gather(
+            batcher.embed(KEY, ["a"], upstream.send),
+            batcher.embed(KEY, ["b"], upstream.send),
+            return_exceptions=True,
+        )
+
+        assert len(upstream.calls) == 1
+        assert outcomes == [error, error]
+
+    async def test_cancelled_caller_does_not_affect_batch(self):
+        batcher = EmbeddingBatcher(window_ms=5, max_inputs=64)
+        upstream = _FakeUpstream()
+
+        cancelled = asyncio.create_task(batcher.embed(KEY, ["a"], upstream.send))
+        kept = asyncio.create_task(batcher.embed(KEY, ["bb"], upstream.send))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        result = await kept
+        assert result["embeddings"][0]["embedding"] == [2.0]
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
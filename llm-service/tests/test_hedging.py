@@ -0,0 +1,164 @@
+"""槽位调用对冲单元测试。"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from llm_service.core import gateway_service
+from llm_service.core.circuit_breaker import CircuitBreakerRegistry
+from llm_service.core.errors import LLMErrorCode
+from llm_service.core.gateway_service import _Attempt, _hedged_call
+from llm_service.core.hedging import HedgePolicy, LatencyTracker
+from llm_service.core.load_balancer import LoadBalancer
+from llm_service.core.route_cache import SlotRoute
+from llm_service.models.slot import SlotType
+from prism_shared.exceptions import AppException
+
+POLICY = HedgePolicy(initial_delay_ms=20, min_delay_ms=1)
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(monkeypatch):
+    """每个用例使用独立的熔断器 / 负载均衡 / 延迟统计。"""
+    monkeypatch.setattr(gateway_service, "circuit_breakers", CircuitBreakerRegistry())
+    monkeypatch.setattr(gateway_service, "load_balancer", LoadBalancer())
+    monkeypatch.setattr(gateway_service, "latency_tracker", LatencyTracker())
+
+
+@pytest.fixture()
+def route() -> SlotRoute:
+    return SlotRoute(
+        slot_type=SlotType.FAST,
+        is_enabled=True,
+        primary_provider_id="primary",
+        primary_model_id="m1",
+        fallback_chain=(("backup", "m2"),),
+    )
+
+
+@pytest.fixture()
+def providers(provider) -> dict:
+    return {"primary": (provider, "k"), "backup": (provider, "k")}
+
+
+class _FakeTargets:
+    """按 model_id 配置每个候选的耗时 / 失败，并记录被取消的调用。"""
+
+    def __init__(self, *, delays: dict[str, float], failing: set[str] = frozenset()):
+        self._delays = delays
+        self._failing = failing
+        self.started: list[str] = []
+        self.cancelled: list[str] = []
+
+    async def call(self, provider, api_key: str, model_id: str) -> dict:
+        self.started.append(model_id)
+        try:
+            await asyncio.sleep(self._delays[model_id])
+        except asyncio.CancelledError:
+            self.cancelled.append(model_id)
+            raise
+        if model_id in self._failing:
+            raise AppException(code=LLMErrorCode.UPSTREAM_ERROR, message=f"{model_id} 失败", status_code=502)
+        return {"content": model_id, "latency_ms": int(self._delays[model_id] * 1000)}
+
+
+async def _run(route, providers, targets: _FakeTargets, trace: list) -> tuple[_Attempt, dict] | None:
+    primary, backup = _Attempt(0, "primary", "m1"), _Attempt(1, "backup", "m2")
+    return await _hedged_call(providers, route, primary, backup, targets.call, POLICY, trace=trace, label="")
+
+
+class TestHedgedCall:
+    """对冲：先成功者胜出，另一方被取消。"""
+
+    async def test_fast_primary_does_not_hedge(self, route, providers):
+        targets = _FakeTargets(delays={"m1": 0.0, "m2": 0.0})
+        trace: list = []
+
+        attempt, result = await _run(route, providers, targets, trace)
+
+        assert result["content"] == "m1"
+        assert targets.started == ["m1"]
+        assert [t["success"] for t in trace] == [True]
+
+    async def test_slow_primary_loses_and_is_cancelled(self, route, providers):
+        targets = _FakeTargets(delays={"m1": 5.0, "m2": 0.0})
+        trace: list = []
+
+        attempt, result = await _run(route, providers, targets, trace)
+        await asyncio.sleep(0)
+
+        assert result["content"] == "m2"
+        assert attempt.hedged
+        assert targets.cancelled == ["m1"]
+        assert trace[0]["success"] and trace[0]["hedged"]
+        assert not trace[1]["success"]
+        # 被取消的一方不计入熔断错误率
+        assert gateway_service.circuit_breakers.snapshot()[0]["samples"] == 0
+
+    async def test_primary_failure_within_delay_fails_over(self, route, providers):
+        targets = _FakeTargets(delays={"m1": 0.0, "m2": 0.0}, failing={"m1"})
+        trace: list = []
+
+        attempt, result = await _run(route, providers, targets, trace)
+
+        assert result["content"] == "m2"
+        assert not attempt.hedged
+        assert targets.started == ["m1", "m2"]
+        assert [t["success"] for t in trace] == [False, True]
+
+    async def test_both_fail_returns_none(self, route, providers):
+        targets = _FakeTargets(delays={"m1": 0.05, "m2": 0.0}, failing={"m1", "m2"})
+        trace: list = []
+
+        assert await _run(route, providers, targets, trace) is None
+        assert [t["success"] for t in trace] == [False, False]
+
+
+class TestHedgePolicy:
+    """对冲延迟：样本分位数，限制在 [min, max] 内。"""
+
+    def test_initial_delay_until_enough_samples(self):
+        policy = HedgePolicy(initial_delay_ms=2000, min_samples=5)
+        assert policy.delay_seconds([100.0] * 4) == 2.0
+
+    def test_percentile_of_samples_clamped(self):
+        policy = HedgePolicy(percentile=0.9, min_samples=5, min_delay_ms=200, max_delay_ms=1000)
+        assert policy.delay_seconds([float(v) for v in range(100, 1100, 100)]) == 1.0
+        assert policy.delay_seconds([300.0] * 10) == 0.3
+        assert policy.delay_seconds([50.0] * 10) == 0.2
+
+    def test_disabled_by_default(self):
+        assert HedgePolicy.from_slot_config({}) is None
+        assert HedgePolicy.from_slot_config({"hedging": {"enabled": True, "percentile": 0.9}}).percentile == 0.9
+
+
+class TestUnexpectedUpstreamError:
+    """非 AppException 的上游异常计入健康度并继续故障转移。"""
+
+    @staticmethod
+    async def _protocol_error_then_ok(provider, api_key: str, model_id: str) -> dict:
+        if model_id == "m1":
+            raise httpx.RemoteProtocolError("peer closed connection")
+        return {"content": model_id, "latency_ms": 5}
+
+    async def test_sequential_failover(self, route, providers):
+        result = await gateway_service._invoke_with_failover(route, providers, self._protocol_error_then_ok)
+
+        assert result["result"]["content"] == "m2"
+        trace = result["routing"]["failover_trace"]
+        assert [t["success"] for t in trace] == [False, True]
+        assert "RemoteProtocolError" in trace[0]["error"]
+        primary = next(b for b in gateway_service.circuit_breakers.snapshot() if b["model_id"] == "m1")
+        assert primary["failure_rate"] == 1.0
+
+    async def test_hedged_failover(self, route, providers):
+        trace: list = []
+        primary, backup = _Attempt(0, "primary", "m1"), _Attempt(1, "backup", "m2")
+
+        attempt, result = await _hedged_call(
+            providers, route, primary, backup, self._protocol_error_then_ok, POLICY, trace=trace, label=""
+        )
+
+        assert result["content"] == "m2"
+        assert [t["success"] for t in trace] == [False, True]
@@ -0,0 +1,214 @@
+"""资源池负载均衡单元测试。"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from llm_service.core import gateway_service
+from llm_service.core import load_balancer as load_balancer_module
+from llm_service.core.circuit_breaker import CircuitBreakerRegistry
+from llm_service.core.errors import LLMErrorCode
+from llm_service.core.gateway_service import _Attempt, _call_attempt, _relay_stream, _StreamChunk
+from llm_service.core.load_balancer import LoadBalancer, PoolPolicy
+from llm_service.core.route_cache import SlotRoute
+from llm_service.core.stream_metrics import StreamMetrics
+from llm_service.models.slot import SlotType
+from prism_shared.exceptions import AppException
+
+
+@dataclass
+class _Target:
+    provider_id: str
+    model_id: str
+
+
+POLICY = PoolPolicy()
+
+
+class TestEwmaStats:
+    """EWMA 延迟 / 错误率。"""
+
+    def test_latency_and_error_rate_smoothed(self):
+        balancer = LoadBalancer(alpha=0.5)
+
+        balancer.record("a", "m", success=True, latency_ms=100)
+        balancer.record("a", "m", success=True, latency_ms=200)
+        balancer.record("a", "m", success=False)
+
+        [snapshot] = balancer.snapshot()
+        assert snapshot["ewma_latency_ms"] == 150.0  # 失败不更新延迟
+        assert snapshot["ewma_error_rate"] == 0.5
+        assert snapshot["calls"] == 3
+
+    def test_weight_prefers_fast_healthy_targets(self):
+        balancer = LoadBalancer(alpha=1.0)
+        balancer.record("fast", "m", success=True, latency_ms=100)
+        balancer.record("slow", "m", success=True, latency_ms=400)
+        balancer.record("flaky", "m", success=True, latency_ms=100)
+        balancer.record("flaky", "m", success=False)
+
+        assert balancer.weight("fast", "m", POLICY, 1000) == pytest.approx(
+            4 * balancer.weight("slow", "m", POLICY, 1000)
+        )
+        assert balancer.weight("flaky", "m", POLICY, 1000) < balancer.weight("slow", "m", POLICY, 1000)
+
+    def test_static_weight_scales(self):
+        balancer = LoadBalancer()
+        policy = PoolPolicy(weights={"a:m": 3.0})
+
+        assert balancer.weight("a", "m", policy, 100) == pytest.approx(3 * balancer.weight("b", "m", policy, 100))
+
+
+class TestOrder:
+    """按权重排序；已达并发上限的 Provider 排在最后。"""
+
+    @pytest.fixture(autouse=True)
+    def fixed_random(self, monkeypatch):
+        """固定随机数：排序只由权重决定。"""
+        monkeypatch.setattr(load_balancer_module.random, "random", lambda: 0.5)
+
+    def test_higher_weight_first(self):
+        balancer = LoadBalancer(alpha=1.0)
+        balancer.record("slow", "m", success=True, latency_ms=500)
+        balancer.record("fast", "m", success=True, latency_ms=50)
+        targets = [_Target("slow", "m"), _Target("fast", "m")]
+
+        assert [t.provider_id for t in balancer.order(targets, POLICY)] == ["fast", "slow"]
+
+    def test_unsampled_target_uses_mean_latency(self):
+        """无样本的候选按已知平均延迟估计，排在慢候选之前、快候选之后。"""
+        balancer = LoadBalancer(alpha=1.0)
+        balancer.record("slow", "m", success=True, latency_ms=900)
+        balancer.record("fast", "m", success=True, latency_ms=100)
+        targets = [_Target("slow", "m"), _Target("new", "m"), _Target("fast", "m")]
+
+        assert [t.provider_id for t in balancer.order(targets, POLICY)] == ["fast", "new", "slow"]
+
+    def test_saturated_provider_last(self):
+        balancer = LoadBalancer(alpha=1.0)
+        balancer.record("fast", "m", success=True, latency_ms=50)
+        balancer.record("slow", "m", success=True, latency_ms=500)
+        policy = PoolPolicy(max_concurrency={"fast": 1})
+        targets = [_Target("fast", "m"), _Target("slow", "m")]
+
+        balancer.begin("fast")
+        assert [t.provider_id for t in balancer.order(targets, policy)] == ["slow", "fast"]
+
+        balancer.end("fast")
+        assert [t.provider_id for t in balancer.order(targets, policy)] == ["fast", "slow"]
+
+    def test_end_never_negative(self):
+        balancer = LoadBalancer()
+        balancer.end("a")
+        balancer.begin("a")
+        balancer.record("a", "m", success=True, latency_ms=1)
+        assert balancer.snapshot()[0]["inflight"] == 1
+
+
+class TestInflightPairing:
+    """在途数 begin / end 成对：普通调用在 _call_attempt 中，流式调用在转发结束的 on_close 中。"""
+
+    @pytest.fixture()
+    def balancer(self, monkeypatch) -> LoadBalancer:
+        balancer = LoadBalancer()
+        monkeypatch.setattr(gateway_service, "load_balancer", balancer)
+        monkeypatch.setattr(gateway_service, "circuit_breakers", CircuitBreakerRegistry())
+        monkeypatch.setattr(gateway_service, "stream_metrics", StreamMetrics())
+        return balancer
+
+    @staticmethod
+    def _inflight(balancer: LoadBalancer, provider_id: str) -> int:
+        return balancer._inflight.get(provider_id, 0)
+
+    async def test_call_attempt_releases_on_success_failure_and_cancel(self, balancer, provider):
+        providers = {"p": (provider, "k")}
+        release = asyncio.Event()
+
+        async def ok(provider, api_key, model_id):
+            return {"content": "ok", "latency_ms": 5}
+
+        async def failing(provider, api_key, model_id):
+            raise AppException(code=LLMErrorCode.UPSTREAM_ERROR, message="失败", status_code=502)
+
+        async def hanging(provider, api_key, model_id):
+            await release.wait()
+
+        await _call_attempt(providers, _Attempt(0, "p", "m"), ok)
+        with pytest.raises(AppException):
+            await _call_attempt(providers, _Attempt(0, "p", "m"), failing)
+
+        task = asyncio.create_task(_call_attempt(providers, _Attempt(0, "p", "m"), hanging))
+        await asyncio.sleep(0)
+        assert self._inflight(balancer, "p") == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert self._inflight(balancer, "p") == 0
+
+    @pytest.fixture()
+    def stream_route(self, monkeypatch, provider) -> SlotRoute:
+        route = SlotRoute(
+            slot_type=SlotType.FAST,
+            is_enabled=True,
+            primary_provider_id=str(provider.id),
+            primary_model_id="m",
+            fallback_chain=(),
+        )
+        route_cache = MagicMock()
+        route_cache.slot = AsyncMock(return_value=route)
+        route_cache.provider = AsyncMock(return_value=(provider, "k"))
+        monkeypatch.setattr(gateway_service, "route_cache", route_cache)
+        return route
+
+    @staticmethod
+    async def _chunks():
+        for delta in ("你", "好"):
+            yield _StreamChunk(delta=delta, finish_reason=None, usage=None, model="m")
+
+    async def _open(self, monkeypatch, provider):
+        async def fake_open_stream(provider, api_key, **kwargs):
+            stream = self._chunks()
+            return stream, await anext(stream)
+
+        monkeypatch.setattr(gateway_service, "_open_stream", fake_open_stream)
+        return await gateway_service.invoke_slot_stream(MagicMock(), SlotType.FAST, messages=[], encryption_key="key")
+
+    async def test_stream_released_when_relay_finishes(self, balancer, provider, stream_route, monkeypatch):
+        relay = await self._open(monkeypatch, provider)
+        assert self._inflight(balancer, str(provider.id)) == 1
+
+        [line async for line in relay]
+        assert self._inflight(balancer, str(provider.id)) == 0
+
+    async def test_stream_released_when_client_disconnects(self, balancer, provider, stream_route, monkeypatch):
+        relay = await self._open(monkeypatch, provider)
+        await anext(relay)
+
+        await relay.aclose()  # 客户端断开：StreamingResponse 关闭生成器
+        assert self._inflight(balancer, str(provider.id)) == 0
+
+    async def test_stream_open_failure_released(self, balancer, provider, stream_route, monkeypatch):
+        async def failing_open_stream(provider, api_key, **kwargs):
+            raise AppException(code=LLMErrorCode.UPSTREAM_ERROR, message="失败", status_code=502)
+
+        monkeypatch.setattr(gateway_service, "_open_stream", failing_open_stream)
+        with pytest.raises(AppException):
+            await gateway_service.invoke_slot_stream(MagicMock(), SlotType.FAST, messages=[], encryption_key="key")
+
+        assert self._inflight(balancer, str(provider.id)) == 0
+
+    async def test_relay_calls_on_close_once(self, provider, balancer):
+        closed: list[bool] = []
+        stream = self._chunks()
+        first = await anext(stream)
+
+        relay = _relay_stream(
+            provider, "m", stream, first, start=time.monotonic(), on_close=lambda: closed.append(True)
+        )
+        [line async for line in relay]
+
+        assert closed == [True]
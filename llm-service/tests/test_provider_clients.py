@@ -0,0 +1,48 @@
+"""上游 Provider 连接池注册表单元测试。"""
+
+import asyncio
+from dataclasses import replace
+
+from llm_service.core.provider_clients import ProviderClientRegistry
+
+
+class TestProviderClientRegistry:
+    """复用、重建与被替换 client 的延迟关闭。"""
+
+    async def test_reuses_client_for_same_provider(self, provider):
+        registry = ProviderClientRegistry()
+        assert registry.get(provider) is registry.get(provider)
+        await registry.aclose()
+
+    async def test_replaced_client_closed_after_grace(self, provider):
+        registry = ProviderClientRegistry(retire_grace_seconds=0.01)
+        old = registry.get(provider)
+
+        new = registry.get(replace(provider, base_url="http://other.test/v1"))
+        assert new is not old
+        assert not old.is_closed  # 进行中的请求仍可使用
+
+        await asyncio.sleep(0.05)
+        assert old.is_closed
+        assert not new.is_closed
+        await registry.aclose()
+        assert new.is_closed
+
+    async def test_invalidated_client_closed_after_grace(self, provider):
+        registry = ProviderClientRegistry(retire_grace_seconds=0.01)
+        old = registry.get(provider)
+
+        registry.invalidate(provider.id)
+        await asyncio.sleep(0.05)
+
+        assert old.is_closed
+        assert registry.get(provider) is not old
+        await registry.aclose()
+
+    async def test_aclose_closes_pending_retired_clients(self, provider):
+        registry = ProviderClientRegistry(retire_grace_seconds=60)
+        old = registry.get(provider)
+        registry.invalidate(provider.id)
+
+        await registry.aclose()
+        assert old.is_closed
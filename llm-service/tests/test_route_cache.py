@@ -0,0 +1,210 @@
+"""路由缓存版本号失效单元测试。"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from llm_service.core import route_cache as route_cache_module
+from llm_service.core.route_cache import CONFIG_CHANNEL, ConfigChangeListener, RouteCache, notify_config_changed
+from llm_service.models.slot import SlotType
+from prism_shared.exceptions import NotFoundException
+
+from .conftest import TEST_PROVIDER_ID
+
+SLOT = SimpleNamespace(
+    slot_type=SlotType.FAST,
+    is_enabled=True,
+    primary_provider_id=TEST_PROVIDER_ID,
+    primary_model_id="m",
+    fallback_chain=[{"provider_id": "p2", "model_id": "m2"}],
+    config={},
+)
+
+PROVIDER = SimpleNamespace(
+    id=TEST_PROVIDER_ID,
+    name="test-provider",
+    slug="test",
+    provider_type="openai",
+    base_url=None,
+    config={},
+    api_key_encrypted="encrypted",
+)
+
+
+def _slot_db(on_load=None) -> MagicMock:
+    """db.execute 返回 SLOT；on_load 在查询期间执行（模拟并发失效）。"""
+
+    async def execute(*args, **kwargs):
+        if on_load is not None:
+            on_load()
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = SLOT
+        return result
+
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=execute)
+    return db
+
+
+def _provider_db(on_load=None, provider=PROVIDER) -> MagicMock:
+    async def get(model, pid):
+        if on_load is not None:
+            on_load()
+        return provider
+
+    db = MagicMock()
+    db.get = AsyncMock(side_effect=get)
+    return db
+
+
+@pytest.fixture(autouse=True)
+def fake_decrypt(monkeypatch):
+    monkeypatch.setattr(route_cache_module, "decrypt_api_key", lambda encrypted, key: f"plain:{encrypted}")
+
+
+class TestSlotCache:
+    """槽位路由缓存。"""
+
+    async def test_hit_skips_database(self):
+        cache = RouteCache()
+        db = _slot_db()
+
+        first = await cache.slot(db, SlotType.FAST)
+        second = await cache.slot(db, SlotType.FAST)
+
+        assert first == second
+        assert first.fallback_chain == (("p2", "m2"),)
+        assert db.execute.await_count == 1
+        assert cache.stats() == {"version": 0, "hits": 1, "misses": 1}
+
+    async def test_invalidate_clears_and_bumps_version(self):
+        cache = RouteCache()
+        db = _slot_db()
+        await cache.slot(db, SlotType.FAST)
+
+        cache.invalidate()
+        await cache.slot(db, SlotType.FAST)
+
+        assert cache.version == 1
+        assert db.execute.await_count == 2
+
+    async def test_load_racing_invalidation_not_cached(self):
+        """加载期间发生失效：结果照常返回，但不写入缓存（避免旧配置覆盖新配置）。"""
+        cache = RouteCache()
+        racing = _slot_db(on_load=cache.invalidate)
+
+        route = await cache.slot(racing, SlotType.FAST)
+        assert route is not None
+
+        db = _slot_db()
+        await cache.slot(db, SlotType.FAST)
+        assert db.execute.await_count == 1
+
+    async def test_ttl_expiry(self):
+        cache = RouteCache(ttl_seconds=0)
+        db = _slot_db()
+
+        await cache.slot(db, SlotType.FAST)
+        await cache.slot(db, SlotType.FAST)
+
+        assert db.execute.await_count == 2
+
+
+class TestProviderCache:
+    """Provider 快照 + 解密 API Key 缓存。"""
+
+    async def test_hit_skips_database_and_decrypt(self):
+        cache = RouteCache()
+        db = _provider_db()
+
+        snapshot, api_key = await cache.provider(db, TEST_PROVIDER_ID, "key")
+        await cache.provider(db, str(TEST_PROVIDER_ID), "key")
+
+        assert snapshot.id == TEST_PROVIDER_ID
+        assert api_key == "plain:encrypted"
+        assert db.get.await_count == 1
+
+    async def test_load_racing_invalidation_not_cached(self):
+        cache = RouteCache()
+        await cache.provider(_provider_db(on_load=cache.invalidate), TEST_PROVIDER_ID, "key")
+
+        db = _provider_db()
+        await cache.provider(db, TEST_PROVIDER_ID, "key")
+        assert db.get.await_count == 1
+
+    async def test_missing_provider_cached_as_not_found(self):
+        cache = RouteCache()
+        db = _provider_db(provider=None)
+
+        for _ in range(2):
+            with pytest.raises(NotFoundException):
+                await cache.provider(db, TEST_PROVIDER_ID, "key")
+
+        assert db.get.await_count == 1
+
+    async def test_invalid_id_not_found(self):
+        cache = RouteCache()
+        db = _provider_db()
+
+        with pytest.raises(NotFoundException):
+            await cache.provider(db, "not-a-uuid", "key")
+        db.get.assert_not_awaited()
+
+
+class TestConfigChange:
+    """配置变更通知：本进程立即失效，其他副本经 LISTEN 失效。"""
+
+    async def test_notify_invalidates_and_sends(self, monkeypatch):
+        cache = RouteCache()
+        monkeypatch.setattr(route_cache_module, "route_cache", cache)
+        db = MagicMock()
+        db.execute = AsyncMock()
+
+        await notify_config_changed(db, reason="slot:fast")
+
+        assert cache.version == 1
+        params = db.execute.await_args.args[1]
+        assert params == {"channel": CONFIG_CHANNEL, "payload": "slot:fast"}
+
+    @pytest.fixture()
+    def driver(self) -> MagicMock:
+        driver = MagicMock()
+        driver.add_listener = AsyncMock()
+        driver.remove_listener = AsyncMock()
+        return driver
+
+    @pytest.fixture()
+    def engine(self, driver) -> MagicMock:
+        conn = MagicMock()
+        conn.get_raw_connection = AsyncMock(return_value=SimpleNamespace(driver_connection=driver))
+        conn.close = AsyncMock()
+        engine = MagicMock()
+        engine.connect = AsyncMock(return_value=conn)
+        return engine
+
+    async def test_listener_invalidates_on_notify_and_disconnect(self, engine, driver):
+        cache = RouteCache()
+        listener = ConfigChangeListener(cache)
+        await listener.start(engine)
+
+        channel, on_notify = driver.add_listener.await_args.args
+        assert channel == CONFIG_CHANNEL
+        on_notify(None, 42, CONFIG_CHANNEL, "provider:update")
+        assert cache.version == 1
+
+        [on_terminated] = driver.add_termination_listener.call_args.args
+        on_terminated(None)
+        assert cache.version == 2
+
+        await listener.stop()
+        driver.remove_listener.assert_awaited_once_with(CONFIG_CHANNEL, on_notify)
+        engine.connect.return_value.close.assert_awaited_once()
+
+    async def test_listener_start_failure_falls_back_to_ttl(self, engine, driver):
+        driver.add_listener.side_effect = OSError("LISTEN 失败")
+        listener = ConfigChangeListener(RouteCache())
+
+        await listener.start(engine)
+
+        engine.connect.return_value.close.assert_awaited_once()
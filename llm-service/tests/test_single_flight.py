@@ -0,0 +1,152 @@
+"""相同在途请求合并单元测试。"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from llm_service.core import gateway_service
+from llm_service.core.route_cache import SlotRoute
+from llm_service.core.single_flight import SingleFlight, request_key
+from llm_service.models.slot import SlotType
+
+
+class TestSingleFlight:
+    """合并、取消与异常分发。"""
+
+    async def test_identical_calls_share_one_upstream_call(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def fn() -> str:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "ok"
+
+        waiters = [asyncio.create_task(flight.do("k", fn)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ["ok", "ok", "ok"]
+        assert calls == 1
+        assert flight.stats() == {"calls": 1, "shared": 2, "inflight": 0}
+
+    async def test_cancelling_first_waiter_does_not_affect_others(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fn() -> str:
+            await release.wait()
+            return "ok"
+
+        first = asyncio.create_task(flight.do("k", fn))
+        second = asyncio.create_task(flight.do("k", fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "ok"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    async def test_upstream_cancelled_when_all_waiters_cancel(self):
+        flight = SingleFlight()
+        started = asyncio.Event()
+        upstream_cancelled = asyncio.Event()
+
+        async def fn() -> str:
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                upstream_cancelled.set()
+                raise
+            return "unreachable"
+
+        waiters = [asyncio.create_task(flight.do("k", fn)) for _ in range(2)]
+        await started.wait()
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert upstream_cancelled.is_set()
+        assert flight.stats()["inflight"] == 0
+
+    async def test_exception_delivered_to_all_waiters(self):
+        flight = SingleFlight()
+
+        async def fn() -> str:
+            await asyncio.sleep(0)
+            raise RuntimeError("upstream failed")
+
+        outcomes = await asyncio.gather(flight.do("k", fn), flight.do("k", fn), return_exceptions=True)
+        assert all(isinstance(o, RuntimeError) for o in outcomes)
+
+    def test_request_key_ignores_param_order(self):
+        assert request_key("chat", "fast", a=1, b=[1, 2]) == request_key("chat", "fast", b=[1, 2], a=1)
+        assert request_key("chat", "fast", a=1) != request_key("chat", "reasoning", a=1)
+
+
+class TestInvokeSlotCoalescing:
+    """槽位调用合并：共享任务不持有请求级 session。"""
+
+    @pytest.fixture()
+    def route(self, provider) -> SlotRoute:
+        return SlotRoute(
+            slot_type=SlotType.FAST,
+            is_enabled=True,
+            primary_provider_id=str(provider.id),
+            primary_model_id="m",
+            fallback_chain=(),
+        )
+
+    async def test_shared_call_survives_first_caller_cancellation(self, monkeypatch, provider, route):
+        resolving_tasks: list[asyncio.Task] = []
+        upstream_calls = 0
+        release = asyncio.Event()
+
+        async def fake_provider(db, provider_id, encryption_key):
+            resolving_tasks.append(asyncio.current_task())
+            return provider, "api-key"
+
+        async def fake_complete(provider, api_key, **kwargs) -> dict:
+            nonlocal upstream_calls
+            upstream_calls += 1
+            await release.wait()
+            return {"content": "ok", "latency_ms": 5}
+
+        route_cache = MagicMock(version=0)
+        route_cache.slot = AsyncMock(return_value=route)
+        route_cache.provider = fake_provider
+        monkeypatch.setattr(gateway_service, "route_cache", route_cache)
+        monkeypatch.setattr(gateway_service, "_complete", fake_complete)
+        monkeypatch.setattr(gateway_service, "single_flight", SingleFlight())
+
+        messages = [{"role": "user", "content": "你好"}]
+
+        def invoke() -> asyncio.Task:
+            return asyncio.create_task(
+                gateway_service.invoke_slot(MagicMock(), SlotType.FAST, messages=messages, encryption_key="key")
+            )
+
+        first = invoke()
+        await asyncio.sleep(0.01)
+        second = invoke()
+        await asyncio.sleep(0.01)
+        # 首个调用方的请求结束（session 随之关闭），共享的上游调用不受影响
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        result = await second
+        assert result["result"]["content"] == "ok"
+        assert upstream_calls == 1
+        assert gateway_service.single_flight.stats() == {"calls": 1, "shared": 1, "inflight": 0}
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        # Provider 解析（数据库访问）只发生在各调用方自己的任务中，共享任务不使用任何请求的 session
+        assert set(resolving_tasks) == {first, second}
@@ -0,0 +1,97 @@
+"""流式转发错误路径单元测试。"""
+
+import json
+import time
+
+import httpx
+import pytest
+
+from llm_service.core import gateway_service
+from llm_service.core.errors import LLMErrorCode
+from llm_service.core.gateway_service import _relay_stream, _stream_litellm, _StreamChunk
+from llm_service.core.runtime import LLMRuntime
+from llm_service.core.stream_metrics import StreamMetrics
+from prism_shared.exceptions import AppException
+
+
+def _events(lines: list[str]) -> list:
+    return [line.removeprefix("data: ").strip() for line in lines]
+
+
+async def _failing_stream(error: Exception):
+    yield _StreamChunk(delta="你好", finish_reason=None, usage=None, model="m")
+    raise error
+
+
+@pytest.fixture()
+def metrics(monkeypatch) -> StreamMetrics:
+    metrics = StreamMetrics()
+    monkeypatch.setattr(gateway_service, "stream_metrics", metrics)
+    return metrics
+
+
+class TestRelayStreamErrors:
+    """首个分片之后的上游异常：以 error 事件结束流，仍输出最终事件并记录指标。"""
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            httpx.ReadError("connection reset"),
+            RuntimeError("litellm chunk parse failed"),
+            AppException(code=LLMErrorCode.UPSTREAM_ERROR, message="Provider 连接失败", status_code=502),
+        ],
+    )
+    async def test_mid_stream_error_emits_error_and_final_event(self, provider, metrics, error):
+        stream = _failing_stream(error)
+        first = await anext(stream)
+        closed: list[bool] = []
+
+        lines = [
+            line
+            async for line in _relay_stream(
+                provider, "m", stream, first, start=time.monotonic(), on_close=lambda: closed.append(True)
+            )
+        ]
+
+        events = _events(lines)
+        assert json.loads(events[0])["delta"] == "你好"
+        assert "error" in json.loads(events[1])
+        assert "latency_ms" in json.loads(events[2])
+        assert events[3] == "[DONE]"
+        assert closed == [True]
+        [snapshot] = metrics.snapshot()
+        assert snapshot["streams"] == 1
+        assert snapshot["cancelled"] == 0
+
+
+class TestStreamLitellmErrors:
+    """litellm 流中途的异常转为 AppException。"""
+
+    async def test_provider_exception_mapped_to_app_exception(self, provider, monkeypatch):
+        class _BrokenResponse:
+            closed = False
+
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                error = RuntimeError("upstream overloaded")
+                error.status_code = 503
+                raise error
+
+            async def aclose(self):
+                self.closed = True
+
+        response = _BrokenResponse()
+
+        async def fake_acompletion(**kwargs):
+            return response
+
+        monkeypatch.setattr(LLMRuntime, "acompletion", property(lambda self: fake_acompletion))
+
+        stream = _stream_litellm(provider=provider, api_key="k", model_id="m", messages=[])
+        with pytest.raises(AppException) as exc_info:
+            await anext(stream)
+
+        assert exc_info.value.details == {"upstream_status": 503}
+        assert response.closed
@@ -7,7 +7,6 @@
     uv run uvicorn main:app --host 0.0.0.0 --port 8601 --reload
 """
 
-import os
 import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -17,6 +16,10 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from llm_service.api.router import api_router as llm_router
 from llm_service.core.config import LLMServiceSettings
+from llm_service.core.gateway_setup import configure_gateway
+from llm_service.core.provider_clients import provider_clients
+from llm_service.core.route_cache import config_listener
+from llm_service.core.runtime import llm_runtime
 from prism_shared.auth import PrincipalMiddleware, create_db_api_key_verifier
 from prism_shared.db import PoolConfig, create_engine, create_session_factory
 from prism_shared.exception_handlers import register_exception_handlers
@@ -28,6 +31,7 @@ from user_service.api.router import router as user_router
 from user_service.core.config import UserServiceSettings
 from voc_service.api.router import api_router as voc_router
 from voc_service.core.config import VocServiceSettings
+from voc_service.core.llm_client import create_llm_http_client
 
 try:
     from agent_service.api.router import router as agent_router
@@ -46,7 +50,22 @@ except ModuleNotFoundError:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """应用生命周期管理。"""
+    # voc-service 到 llm-service 的应用级连接池
+    app.state.voc_llm_http = create_llm_http_client(app.state.voc_settings)
+    # llm-service 路由缓存的跨副本失效监听
+    await config_listener.start(app.state.engine)
+    # litellm 预加载（导入耗时记录在启动日志中）
+    if app.state.settings.llm_runtime_warmup:
+        await llm_runtime.warm_up()
     yield
+    # 先停止 voc-service 后台 L2 校验 worker（仍在使用下面关闭的连接池）
+    guard_scheduler = getattr(app.state, "voc_guard_scheduler", None)
+    if guard_scheduler is not None:
+        await guard_scheduler.close()
+    await config_listener.stop()
+    await app.state.voc_llm_http.aclose()
+    # 关闭 llm-service 上游 Provider 连接池
+    await provider_clients.aclose()
     # 关闭数据库引擎
     if hasattr(app.state, "engine"):
         await app.state.engine.dispose()
@@ -58,11 +77,7 @@ def create_app() -> FastAPI:
     llm_settings = LLMServiceSettings()
     voc_settings = VocServiceSettings()
     agent_settings = AgentServiceSettings()
-    os.environ.setdefault("PRISM_LLM_RUNTIME_MODE", llm_settings.llm_runtime_mode)
-    os.environ.setdefault(
-        "PRISM_LLM_RUNTIME_HTTP_FALLBACK",
-        "true" if llm_settings.llm_runtime_http_fallback else "false",
-    )
+    configure_gateway(llm_settings)
 
     configure_logging(
         log_level=llm_settings.log_level,
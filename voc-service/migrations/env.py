@@ -11,11 +11,16 @@ from prism_shared.db.base import Base
 
 # 确保模型注册到 Base.metadata
 from voc_service.models import (  # noqa: F401
+    EmbeddingCacheEntry,
     EmergentTag,
+    GuardAudit,
     IngestionBatch,
+    PipelineRun,
+    PipelineStageMetric,
     SchemaMapping,
     SemanticUnit,
     TagFeedback,
+    TagNormalization,
     UnitTagAssociation,
     Voice,
 )
@@ -0,0 +1,35 @@
+"""创建 embedding_cache 表（内容寻址 embedding 缓存持久层）
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-02-18
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: str | None = "004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # 不限定 vector 维度：不同模型 / dimensions 参数的向量共存于同一张表
+    op.execute("""
+        CREATE TABLE voc.embedding_cache (
+            text_hash VARCHAR(64) NOT NULL,
+            model_id VARCHAR(200) NOT NULL,
+            dimensions INTEGER NOT NULL DEFAULT 0,
+            embedding vector NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (text_hash, model_id, dimensions)
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS voc.embedding_cache CASCADE")
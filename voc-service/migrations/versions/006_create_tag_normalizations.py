@@ -0,0 +1,34 @@
+"""创建 tag_normalizations 表（标签标准化记忆表）
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-02-18
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: str | None = "005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE voc.tag_normalizations (
+            raw_name VARCHAR(200) PRIMARY KEY,
+            normalized_name VARCHAR(200) NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    # 反查：标签合并 / 重命名时按 normalized_name 批量修正记忆
+    op.execute("CREATE INDEX idx_tag_norm_normalized ON voc.tag_normalizations(normalized_name)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS voc.tag_normalizations CASCADE")
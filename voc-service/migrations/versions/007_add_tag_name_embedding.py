@@ -0,0 +1,34 @@
+"""emergent_tags 增加 name_embedding 列（标签词表向量索引）
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-02-18
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: str | None = "006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # 存量标签的名称向量需调用 llm-service 生成，不在迁移中回填：
+    # 由 TagVocabularyIndex.backfill 在管线运行时按使用量分批补写（tag_vocab_backfill_batch）
+    op.execute("ALTER TABLE voc.emergent_tags ADD COLUMN name_embedding vector(1024)")
+    # HNSW 向量索引：标准化时按标签名称检索 k 个最近邻合并候选
+    op.execute("""
+        CREATE INDEX idx_tags_name_embedding ON voc.emergent_tags
+        USING hnsw (name_embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS voc.idx_tags_name_embedding")
+    op.execute("ALTER TABLE voc.emergent_tags DROP COLUMN IF EXISTS name_embedding")
@@ -0,0 +1,38 @@
+"""创建 guard_audits 表（L2 语义校验审计记录）
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-02-18
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "008"
+down_revision: str | None = "007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE voc.guard_audits (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            voice_id UUID NOT NULL REFERENCES voc.voices(id) ON DELETE CASCADE,
+            stage VARCHAR(20) NOT NULL DEFAULT 'stage1',
+            consistent BOOLEAN NOT NULL,
+            confidence FLOAT,
+            issues JSONB,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("CREATE INDEX idx_guard_audits_voice ON voc.guard_audits(voice_id)")
+    op.execute("CREATE INDEX idx_guard_audits_consistent ON voc.guard_audits(consistent)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS voc.guard_audits CASCADE")
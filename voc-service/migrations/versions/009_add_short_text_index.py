@@ -0,0 +1,29 @@
+"""semantic_units 增加短文本部分索引（短文本快速路径精确匹配）
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-02-18
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "009"
+down_revision: str | None = "008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # 谓词需与 pipeline/short_text.py 中 SHORT_TEXT_INDEX_MAX_CHARS 一致，查询才能命中部分索引
+    op.execute("""
+        CREATE INDEX idx_units_short_text ON voc.semantic_units(text)
+        WHERE char_length(text) <= 32
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS voc.idx_units_short_text")
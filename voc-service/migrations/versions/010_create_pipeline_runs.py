@@ -0,0 +1,60 @@
+"""创建 pipeline_runs / pipeline_stage_metrics 表（管线运行账本）
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-02-18
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "010"
+down_revision: str | None = "009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE voc.pipeline_runs (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            batch_id UUID REFERENCES voc.ingestion_batches(id) ON DELETE SET NULL,
+            processed INTEGER NOT NULL DEFAULT 0,
+            failed INTEGER NOT NULL DEFAULT 0,
+            skipped INTEGER NOT NULL DEFAULT 0,
+            wall_ms FLOAT NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("CREATE INDEX idx_pipeline_runs_created ON voc.pipeline_runs(created_at)")
+
+    op.execute("""
+        CREATE TABLE voc.pipeline_stage_metrics (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            run_id UUID NOT NULL REFERENCES voc.pipeline_runs(id) ON DELETE CASCADE,
+            voice_id UUID NOT NULL REFERENCES voc.voices(id) ON DELETE CASCADE,
+            stage VARCHAR(30) NOT NULL,
+            wall_ms FLOAT NOT NULL,
+            llm_ms FLOAT NOT NULL DEFAULT 0,
+            db_ms FLOAT NOT NULL DEFAULT 0,
+            llm_calls INTEGER NOT NULL DEFAULT 0,
+            llm_cache_hits INTEGER NOT NULL DEFAULT 0,
+            prompt_tokens INTEGER NOT NULL DEFAULT 0,
+            completion_tokens INTEGER NOT NULL DEFAULT 0,
+            level VARCHAR(30),
+            succeeded BOOLEAN NOT NULL DEFAULT true,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("CREATE INDEX idx_stage_metrics_run ON voc.pipeline_stage_metrics(run_id)")
+    op.execute("CREATE INDEX idx_stage_metrics_stage_created ON voc.pipeline_stage_metrics(stage, created_at)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS voc.pipeline_stage_metrics CASCADE")
+    op.execute("DROP TABLE IF EXISTS voc.pipeline_runs CASCADE")
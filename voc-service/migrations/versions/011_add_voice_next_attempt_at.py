@@ -0,0 +1,31 @@
+"""voices 增加 next_attempt_at（失败 Voice 自动重试调度）
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-02-19
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "011"
+down_revision: str | None = "010"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE voc.voices ADD COLUMN next_attempt_at TIMESTAMPTZ")
+    # 只索引待重试的失败 Voice，认领查询按到期时间扫描
+    op.execute("""
+        CREATE INDEX idx_voices_retry_due ON voc.voices(next_attempt_at)
+        WHERE processed_status = 'failed' AND next_attempt_at IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS voc.idx_voices_retry_due")
+    op.execute("ALTER TABLE voc.voices DROP COLUMN IF EXISTS next_attempt_at")
@@ -0,0 +1,38 @@
+"""ingestion_batches / voices 增加 priority（管线优先级通道）
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-02-19
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "012"
+down_revision: str | None = "011"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # 0=urgent / 1=normal / 2=backfill；voices 冗余批次优先级，认领时无需回表
+    op.execute("""
+        ALTER TABLE voc.ingestion_batches
+        ADD COLUMN priority SMALLINT NOT NULL DEFAULT 1 CHECK (priority BETWEEN 0 AND 2)
+    """)
+    op.execute("ALTER TABLE voc.voices ADD COLUMN priority SMALLINT NOT NULL DEFAULT 1")
+    op.execute("CREATE INDEX idx_voices_claim ON voc.voices(processed_status, priority, created_at)")
+    # 按批次认领需要在 (batch_id, processed_status) 内按 created_at 取前 N 条
+    op.execute("DROP INDEX IF EXISTS voc.idx_voices_batch_status")
+    op.execute("CREATE INDEX idx_voices_batch_status ON voc.voices(batch_id, processed_status, created_at)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS voc.idx_voices_batch_status")
+    op.execute("CREATE INDEX idx_voices_batch_status ON voc.voices(batch_id, processed_status)")
+    op.execute("DROP INDEX IF EXISTS voc.idx_voices_claim")
+    op.execute("ALTER TABLE voc.voices DROP COLUMN IF EXISTS priority")
+    op.execute("ALTER TABLE voc.ingestion_batches DROP COLUMN IF EXISTS priority")
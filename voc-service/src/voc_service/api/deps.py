@@ -3,12 +3,20 @@
 from collections.abc import AsyncGenerator
 from typing import Any
 
+import httpx
 from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from voc_service.core.config import VocServiceSettings
+from voc_service.core.degradation_ladder import DegradationLadder
+from voc_service.core.embedding_cache import EmbeddingCache
+from voc_service.core.guard_scheduler import L2GuardScheduler
+from voc_service.core.llm_cache import LLMResponseCache
 from voc_service.core.llm_client import LLMClient
+from voc_service.core.rate_limiter import LLMAdmissionController
+from voc_service.core.tag_memo import TagNormalizationMemo
+from voc_service.core.tag_vocabulary import TagVocabularyIndex
 
 
 def get_settings(request: Request) -> VocServiceSettings:
@@ -32,20 +40,114 @@ async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
+def get_llm_response_cache(request: Request, settings: VocServiceSettings) -> LLMResponseCache | None:
+    """获取应用级共享的 LLM 响应缓存（首次使用时创建，挂载在 app.state；未启用时返回 None）。"""
+    if not settings.llm_cache_enabled:
+        return None
+    cache = getattr(request.app.state, "voc_llm_response_cache", None)
+    if cache is None:
+        cache = LLMResponseCache.from_settings(settings)
+        request.app.state.voc_llm_response_cache = cache
+    return cache
+
+
+def get_llm_rate_limiter(request: Request, settings: VocServiceSettings) -> LLMAdmissionController:
+    """获取应用级共享的 LLM 槽位准入控制（首次使用时创建，挂载在 app.state）。"""
+    limiter = getattr(request.app.state, "voc_llm_rate_limiter", None)
+    if limiter is None:
+        limiter = LLMAdmissionController.from_settings(settings)
+        request.app.state.voc_llm_rate_limiter = limiter
+    return limiter
+
+
+def get_llm_http_client(request: Request) -> httpx.AsyncClient | None:
+    """获取 lifespan 中创建的 llm-service 连接池（未经 lifespan 启动时返回 None，按调用临时建连）。"""
+    return getattr(request.app.state, "voc_llm_http", None)
+
+
 def get_llm_client(
     request: Request,
     settings: VocServiceSettings = Depends(get_settings),
 ) -> LLMClient:
-    """获取 LLM 客户端实例（自动携带当前请求的 JWT token）。"""
+    """获取 LLM 客户端实例（自动携带当前请求的 JWT token，共享应用级响应缓存）。"""
     auth_header = request.headers.get("Authorization", "")
     token = auth_header.removeprefix("Bearer ").strip() if auth_header.startswith("Bearer ") else None
     return LLMClient(
         base_url=settings.llm_service_base_url,
         timeout=settings.llm_service_timeout,
         default_api_key=token,
+        response_cache=get_llm_response_cache(request, settings),
+        rate_limiter=get_llm_rate_limiter(request, settings),
+        http_client=get_llm_http_client(request),
     )
 
 
+def get_embedding_cache(
+    request: Request,
+    settings: VocServiceSettings = Depends(get_settings),
+) -> EmbeddingCache:
+    """获取应用级共享的 embedding 缓存（首次使用时创建，挂载在 app.state）。"""
+    cache = getattr(request.app.state, "voc_embedding_cache", None)
+    if cache is None:
+        cache = EmbeddingCache.from_settings(settings)
+        request.app.state.voc_embedding_cache = cache
+    return cache
+
+
+def get_tag_memo(
+    request: Request,
+    settings: VocServiceSettings = Depends(get_settings),
+) -> TagNormalizationMemo:
+    """获取应用级共享的标签标准化记忆（首次使用时创建，挂载在 app.state）。"""
+    memo = getattr(request.app.state, "voc_tag_memo", None)
+    if memo is None:
+        memo = TagNormalizationMemo.from_settings(settings)
+        request.app.state.voc_tag_memo = memo
+    return memo
+
+
+def get_tag_vocabulary(
+    request: Request,
+    settings: VocServiceSettings = Depends(get_settings),
+    embedding_cache: EmbeddingCache = Depends(get_embedding_cache),
+) -> TagVocabularyIndex | None:
+    """获取应用级共享的标签词表索引（首次使用时创建，挂载在 app.state；未启用时返回 None）。"""
+    if not settings.tag_vocab_enabled:
+        return None
+    vocabulary = getattr(request.app.state, "voc_tag_vocabulary", None)
+    if vocabulary is None:
+        vocabulary = TagVocabularyIndex.from_settings(settings, cache=embedding_cache)
+        request.app.state.voc_tag_vocabulary = vocabulary
+    return vocabulary
+
+
+def get_guard_scheduler(
+    request: Request,
+    settings: VocServiceSettings = Depends(get_settings),
+) -> L2GuardScheduler:
+    """获取应用级共享的 L2 校验调度器（首次使用时创建，挂载在 app.state）。"""
+    scheduler = getattr(request.app.state, "voc_guard_scheduler", None)
+    if scheduler is None:
+        scheduler = L2GuardScheduler.from_settings(
+            settings,
+            session_factory=getattr(request.app.state, "session_factory", None),
+        )
+        request.app.state.voc_guard_scheduler = scheduler
+    return scheduler
+
+
+def get_degradation_ladder(
+    request: Request,
+    settings: VocServiceSettings = Depends(get_settings),
+) -> DegradationLadder:
+    """获取应用级共享的 Stage 1 降级阶梯统计（首次使用时创建，挂载在 app.state）。"""
+    ladder = getattr(request.app.state, "voc_degradation_ladder", None)
+    if ladder is None:
+        ladder = DegradationLadder.from_settings(settings)
+        request.app.state.voc_degradation_ladder = ladder
+    return ladder
+
+
 # --- 鉴权依赖 ---
 # voc-service 不 import user-service 的模型，直接用 raw SQL 查 auth.users 表。
 
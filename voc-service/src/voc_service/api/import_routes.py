@@ -12,7 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from prism_shared.exceptions import AppException
 from prism_shared.schemas import ApiResponse
-from voc_service.api.deps import UserRecord, get_current_user, get_db, get_settings
+from voc_service.api.deps import UserRecord, get_current_user, get_db, get_llm_http_client, get_settings
 from voc_service.api.schemas.import_schemas import (
     BatchProgress,
     BatchStatusResponse,
@@ -44,7 +44,7 @@ from voc_service.core.import_background import (
     run_generate_mapping_background,
 )
 from voc_service.core.prompt_builder import PromptBuilder
-from voc_service.models.enums import BatchStatus
+from voc_service.models.enums import BatchPriority, BatchStatus
 
 logger = structlog.get_logger(__name__)
 
@@ -61,6 +61,7 @@ async def upload_file(
     request: Request,
     file: UploadFile = File(...),
     source: str = Form(default=""),
+    priority: BatchPriority = Form(default=BatchPriority.NORMAL),
     db: AsyncSession = Depends(get_db),
     settings: VocServiceSettings = Depends(get_settings),
     current_user: UserRecord = Depends(get_current_user),
@@ -70,6 +71,7 @@ async def upload_file(
 
     v2 变更：不再启动后台任务，仅计算 file_hash + 暂存文件 + 创建 batch。
     列统计延迟到 data-preview 端点首次调用时计算。
+    priority：0=urgent（交互式上传）/ 1=normal / 2=backfill（历史回填），决定管线认领顺序。
     """
     t0 = time.monotonic()
 
@@ -121,6 +123,7 @@ async def upload_file(
         file_name=filename,
         file_size_bytes=sample_result.file_size_bytes,
         total_rows=sample_result.total_rows,
+        priority=priority,
     )
     batch.file_hash = file_hash
     await db.commit()
@@ -296,6 +299,7 @@ async def build_prompt(
         df_info=df_info,
         sample_data=sample_data,
         historical_reference=historical_ref,
+        describe_max_tokens=settings.mapping_describe_max_tokens,
     )
 
     batch.prompt_text = prompt_text
@@ -391,6 +395,7 @@ async def generate_mapping(
             confidence_auto=settings.mapping_confidence_auto,
             max_file_size_bytes=settings.max_file_size_bytes,
             mapping_sample_rows=settings.mapping_sample_rows,
+            llm_http_client=get_llm_http_client(request),
         )
     )
 
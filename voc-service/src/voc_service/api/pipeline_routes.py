@@ -1,14 +1,35 @@
 """管线触发端点。"""
 
-from fastapi import APIRouter, Depends
+from datetime import UTC, datetime, timedelta
+
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from prism_shared.schemas.response import ApiResponse
-from voc_service.api.deps import UserRecord, get_current_user, get_db, get_llm_client, get_settings
-from voc_service.api.schemas.pipeline_schemas import ProcessRequest, ProcessResult
+from voc_service.api.deps import (
+    UserRecord,
+    get_current_user,
+    get_db,
+    get_degradation_ladder,
+    get_embedding_cache,
+    get_guard_scheduler,
+    get_llm_client,
+    get_llm_rate_limiter,
+    get_settings,
+    get_tag_memo,
+    get_tag_vocabulary,
+)
+from voc_service.api.schemas.pipeline_schemas import PipelineStats, ProcessRequest, ProcessResult, StageLatency
 from voc_service.core.config import VocServiceSettings
+from voc_service.core.degradation_ladder import DegradationLadder
+from voc_service.core.embedding_cache import EmbeddingCache
+from voc_service.core.guard_scheduler import L2GuardScheduler
 from voc_service.core.llm_client import LLMClient
 from voc_service.core.processing_service import process_pending_voices
+from voc_service.core.run_ledger import stage_latency_summary
+from voc_service.core.tag_memo import TagNormalizationMemo
+from voc_service.core.tag_vocabulary import TagVocabularyIndex
+from voc_service.pipeline.guards import l1_validators
 
 router = APIRouter(prefix="/api/voc/pipeline", tags=["pipeline"])
 
@@ -19,6 +40,11 @@ async def trigger_processing(
     db: AsyncSession = Depends(get_db),
     settings: VocServiceSettings = Depends(get_settings),
     llm_client: LLMClient = Depends(get_llm_client),
+    embedding_cache: EmbeddingCache = Depends(get_embedding_cache),
+    tag_memo: TagNormalizationMemo = Depends(get_tag_memo),
+    tag_vocabulary: TagVocabularyIndex | None = Depends(get_tag_vocabulary),
+    guard_scheduler: L2GuardScheduler = Depends(get_guard_scheduler),
+    degradation_ladder: DegradationLadder = Depends(get_degradation_ladder),
     _current_user: UserRecord = Depends(get_current_user),
 ):
     """触发 AI 管线处理 pending 状态的 Voice。
@@ -31,5 +57,38 @@ async def trigger_processing(
         settings=settings,
         batch_id=body.batch_id,
         limit=body.limit,
+        embedding_cache=embedding_cache,
+        tag_memo=tag_memo,
+        tag_vocabulary=tag_vocabulary,
+        guard_scheduler=guard_scheduler,
+        degradation_ladder=degradation_ladder,
     )
     return ApiResponse(data=ProcessResult(**result))
+
+
+@router.get("/stats", response_model=ApiResponse[PipelineStats])
+async def pipeline_stats(
+    request: Request,
+    settings: VocServiceSettings = Depends(get_settings),
+    degradation_ladder: DegradationLadder = Depends(get_degradation_ladder),
+    _current_user: UserRecord = Depends(get_current_user),
+):
+    """查询管线运行统计：Stage 1 降级阶梯各级别成功率 / 耗时、L1 校验计数、LLM 槽位准入状态。"""
+    return ApiResponse(
+        data=PipelineStats(
+            stage1_levels=degradation_ladder.snapshot(),
+            l1_validation=l1_validators.stats(),
+            llm_rate_limits=get_llm_rate_limiter(request, settings).snapshot(),
+        )
+    )
+
+
+@router.get("/stats/stages", response_model=ApiResponse[list[StageLatency]])
+async def pipeline_stage_latency(
+    hours: int = Query(default=24, ge=1, le=24 * 30, description="统计最近多少小时"),
+    db: AsyncSession = Depends(get_db),
+    _current_user: UserRecord = Depends(get_current_user),
+):
+    """按阶段聚合运行账本：wall / LLM / DB 耗时 p50 / p95 与 token 合计。"""
+    rows = await stage_latency_summary(db, since=datetime.now(UTC) - timedelta(hours=hours))
+    return ApiResponse(data=[StageLatency(**row) for row in rows])
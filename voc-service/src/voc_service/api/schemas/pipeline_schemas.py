@@ -18,3 +18,33 @@ class ProcessResult(BaseModel):
     processed: int
     failed: int
     skipped: int
+    run_id: UUID | None = Field(default=None, description="运行账本记录 ID（无待处理 Voice 时为空）")
+
+
+class PipelineStats(BaseModel):
+    """管线运行统计（进程内，重启后清零）。"""
+
+    stage1_levels: dict[str, dict] = Field(
+        description="Stage 1 各来源各降级级别的尝试次数、近期成功率与平均耗时",
+    )
+    l1_validation: dict[str, dict] = Field(description="L1 校验器调用次数、失败次数与平均耗时")
+    llm_rate_limits: dict[str, dict] = Field(
+        default_factory=dict,
+        description="各 LLM 槽位当前有效 RPM / TPM、AIMD 系数、429 / 503 次数与累计排队耗时",
+    )
+
+
+class StageLatency(BaseModel):
+    """单个阶段的耗时分位数与 token 合计。"""
+
+    stage: str
+    samples: int
+    wall_ms_p50: float
+    wall_ms_p95: float
+    llm_ms_p50: float
+    llm_ms_p95: float
+    db_ms_p50: float
+    db_ms_p95: float
+    llm_calls: int
+    prompt_tokens: int
+    completion_tokens: int
@@ -4,9 +4,17 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from prism_shared.schemas.response import ApiResponse
-from voc_service.api.deps import UserRecord, get_current_user, get_db, get_llm_client, get_settings
+from voc_service.api.deps import (
+    UserRecord,
+    get_current_user,
+    get_db,
+    get_embedding_cache,
+    get_llm_client,
+    get_settings,
+)
 from voc_service.api.schemas.search_schemas import SearchRequest, SearchResponse, SearchResultItem, TagBrief, VoiceBrief
 from voc_service.core.config import VocServiceSettings
+from voc_service.core.embedding_cache import EmbeddingCache
 from voc_service.core.llm_client import LLMClient
 from voc_service.core.search_service import vector_search
 
@@ -19,6 +27,7 @@ async def search(
     db: AsyncSession = Depends(get_db),
     settings: VocServiceSettings = Depends(get_settings),
     llm_client: LLMClient = Depends(get_llm_client),
+    embedding_cache: EmbeddingCache = Depends(get_embedding_cache),
     _current_user: UserRecord = Depends(get_current_user),
 ):
     """语义搜索 API。
@@ -34,6 +43,7 @@ async def search(
         top_k=body.top_k,
         min_confidence=body.min_confidence,
         rerank=body.rerank,
+        embedding_cache=embedding_cache,
     )
 
     return ApiResponse(
@@ -13,6 +13,7 @@ from prism_shared.middleware import AuditMiddleware, RequestIdMiddleware
 from prism_shared.schemas import ApiResponse
 from voc_service.api.router import api_router
 from voc_service.core.config import VocServiceSettings
+from voc_service.core.llm_client import create_llm_http_client
 
 
 def create_app(settings: VocServiceSettings | None = None) -> FastAPI:
@@ -42,7 +43,13 @@ def create_app(settings: VocServiceSettings | None = None) -> FastAPI:
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
+        app.state.voc_llm_http = create_llm_http_client(settings)
         yield
+        # 先停止后台 L2 校验 worker，再关闭其使用的 llm-service 连接池
+        guard_scheduler = getattr(app.state, "voc_guard_scheduler", None)
+        if guard_scheduler is not None:
+            await guard_scheduler.close()
+        await app.state.voc_llm_http.aclose()
         await engine.dispose()
 
     app = FastAPI(
@@ -30,6 +30,10 @@ class VocServiceSettings(BaseAppSettings):
         description="llm-service 基础 URL",
     )
     llm_service_timeout: int = Field(default=180, description="llm-service 调用超时（秒）")
+    llm_http_max_connections: int = Field(default=100, description="到 llm-service 的连接池上限")
+    llm_http_max_keepalive: int = Field(default=20, description="连接池保持的空闲 keep-alive 连接数")
+    llm_http_keepalive_expiry: float = Field(default=60.0, description="空闲 keep-alive 连接的保留时长（秒）")
+    llm_http2: bool = Field(default=True, description="是否启用 HTTP/2（需安装 h2，未安装时使用 HTTP/1.1）")
     mapping_sample_rows: int = Field(default=10, description="Schema 映射采样行数")
     mapping_confidence_auto: float = Field(
         default=0.8,
@@ -40,16 +44,104 @@ class VocServiceSettings(BaseAppSettings):
         description="拒绝映射的置信度阈值",
     )
 
+    mapping_describe_max_tokens: int = Field(
+        default=1500,
+        description="Schema 映射提示词中 df_describe / df_info 各自的 token 上限，超出时截断",
+    )
+
     # --- 管线 ---
     pipeline_batch_size: int = Field(default=20, description="每轮取多少条 Voice 处理")
     pipeline_max_retries: int = Field(default=2, description="失败重试次数")
+    pipeline_retry_base_seconds: float = Field(default=30.0, description="失败重试退避基数（秒），每次失败翻倍并加抖动")
+    pipeline_retry_max_seconds: float = Field(default=3600.0, description="失败重试退避上限（秒）")
     stage1_temperature: float = Field(default=0.5, description="Stage 1 reasoning 温度")
+    stage1_max_input_tokens: int = Field(
+        default=1500,
+        description="Stage 1 单次拆解的 raw_text token 上限（输出约为输入 2.5 倍，生效值不超过 1518），超出时分段拆解",
+    )
+    short_text_fast_path_enabled: bool = Field(
+        default=True,
+        description="极短文本是否复用已有标注（跳过 Stage 1 / Stage 2 的 LLM 调用）",
+    )
+    short_text_max_chars: int = Field(default=8, description="走短文本快速路径的最大字符数（上限 32）")
+    short_text_similarity_threshold: float = Field(
+        default=0.95,
+        description="近似匹配复用已有标注所需的最低 cosine 相似度",
+    )
+    stage1_short_text_chars: int = Field(default=30, description="短于该字符数的文本直接使用简化 Prompt")
+    stage1_adaptive_min_success_rate: float = Field(
+        default=0.5,
+        description="某来源正常 Prompt 近期成功率低于该值时，直接从简化 Prompt 开始",
+    )
+    stage1_adaptive_min_samples: int = Field(default=20, description="自适应判定所需的最少近期样本数")
+    stage1_adaptive_window: int = Field(default=200, description="每个 (来源, 级别) 保留的近期样本数")
+    stage1_adaptive_probe_rate: float = Field(
+        default=0.1,
+        description="低成功率来源仍试探正常 Prompt 的比例（便于成功率回升后恢复）",
+    )
     stage2_temperature: float = Field(default=0.5, description="Stage 2 reasoning 温度")
     normalize_temperature: float = Field(default=0.2, description="标准化 fast 温度")
+    tag_memo_max_entries: int = Field(default=50_000, description="进程内标签标准化记忆条目上限")
+    tag_vocab_enabled: bool = Field(default=True, description="是否按标签名称向量检索标准化合并候选")
+    tag_vocab_top_k: int = Field(default=5, description="每个原始标签检索的最近邻已有标签数")
+    tag_vocab_auto_merge_threshold: float = Field(
+        default=0.92,
+        description="最近邻 cosine 相似度不低于该值时直接合并，不调用 LLM",
+    )
+    tag_vocab_backfill_batch: int = Field(
+        default=200,
+        description="管线每次运行为存量标签补写名称向量的数量上限（0 表示不回填）",
+    )
     guard_l2_temperature: float = Field(default=0.2, description="L2 检查 fast 温度")
+    guard_l2_mode: str = Field(
+        default="background",
+        description="L2 校验模式：inline（同步等待）/ background（后台队列 + 审计表）/ off",
+    )
+    guard_l2_sample_rate: float = Field(default=1.0, description="L2 校验抽样比例（0~1）")
+    guard_l2_skip_confidence: float = Field(
+        default=0.9,
+        description="全部语义单元置信度不低于该值时跳过 L2 校验",
+    )
+    guard_l2_queue_size: int = Field(default=200, description="后台 L2 校验队列容量，满时丢弃新任务")
 
     # --- 搜索 ---
     embedding_batch_size: int = Field(default=20, description="embedding 批次大小")
     search_candidate_multiplier: int = Field(default=2, description="搜索候选倍数（rerank 时取 top_k * multiplier）")
     confidence_high_threshold: float = Field(default=0.8, description="高置信度阈值")
     confidence_medium_threshold: float = Field(default=0.6, description="中置信度阈值")
+
+    # --- Embedding 缓存 ---
+    embedding_model_id: str = Field(
+        default="",
+        description="启动时假定的 embedding 模型标识（留空则在首次响应后才读缓存）；缓存键始终以响应中的实际模型为准",
+    )
+    embedding_cache_max_entries: int = Field(default=10_000, description="进程内 embedding LRU 缓存条目上限")
+    embedding_cache_persistent: bool = Field(default=True, description="是否启用 Postgres 持久化 embedding 缓存层")
+
+    # --- LLM 响应缓存 ---
+    llm_cache_enabled: bool = Field(default=True, description="是否启用 invoke_slot 响应缓存")
+    llm_cache_ttl_seconds: int = Field(default=3600, description="响应缓存有效期（秒）")
+    llm_cache_max_entries: int = Field(default=2000, description="进程内响应缓存条目上限")
+    llm_cache_max_temperature: float = Field(
+        default=0.7,
+        description="可缓存调用的最高温度，高于此值的调用不走缓存",
+    )
+
+    # --- LLM 准入控制（按槽位 RPM / TPM 令牌桶，0 表示不限制） ---
+    # 默认全部关闭：上限取决于 Provider 配额与部署规模，没有通用的安全值。
+    # 启用时按「Provider 对该槽位模型的配额 ÷ voc-service worker 副本数」设置，并留 10%~20% 余量
+    # 给其他调用方；配额只给出 RPM 或 TPM 之一时，另一维度保持 0。
+    llm_fast_rpm: int = Field(default=0, description="fast 槽位每分钟请求数上限（0 表示不限制）")
+    llm_fast_tpm: int = Field(default=0, description="fast 槽位每分钟 token 数上限（0 表示不限制）")
+    llm_reasoning_rpm: int = Field(default=0, description="reasoning 槽位每分钟请求数上限（0 表示不限制）")
+    llm_reasoning_tpm: int = Field(default=0, description="reasoning 槽位每分钟 token 数上限（0 表示不限制）")
+    llm_embedding_rpm: int = Field(default=0, description="embedding 槽位每分钟请求数上限（0 表示不限制）")
+    llm_embedding_tpm: int = Field(default=0, description="embedding 槽位每分钟 token 数上限（0 表示不限制）")
+    llm_rate_decrease_factor: float = Field(
+        default=0.5,
+        description="llm-service 返回 429 / 503 时有效速率的乘性下降系数",
+    )
+    llm_rate_increase_step: float = Field(
+        default=0.02,
+        description="每次调用成功后有效速率的加性恢复步长（占配置上限的比例）",
+    )
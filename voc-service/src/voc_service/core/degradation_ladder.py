@@ -0,0 +1,120 @@
+"""Stage 1 自适应降级阶梯。
+
+按 (来源, 级别) 记录最近的成功率与耗时，据此决定拆解从哪一级开始：
+- 短文本：直接使用简化 Prompt（正常 Prompt 对短文本收益有限）
+- 某来源正常 Prompt 近期成功率低于阈值：直接从简化 Prompt 开始，
+  并以 probe_rate 的概率继续试探正常 Prompt，成功率回升后自动恢复
+
+统计仅保存在进程内，按应用生命周期共享。
+"""
+
+import random
+from collections import deque
+from dataclasses import dataclass, field
+
+from voc_service.core.config import VocServiceSettings
+
+LEVEL_NORMAL = "L1-normal"
+LEVEL_SIMPLIFIED = "L2-simplified"
+LEVEL_FALLBACK = "L3-fallback"
+
+# 降级深度：数值越大越严重
+LEVEL_SEVERITY = {LEVEL_NORMAL: 0, LEVEL_SIMPLIFIED: 1, LEVEL_FALLBACK: 2}
+
+
+@dataclass
+class LevelStats:
+    """单个 (来源, 级别) 的滑动窗口统计。"""
+
+    window: deque = field(default_factory=deque)  # (success, elapsed_ms)
+    attempts: int = 0
+    successes: int = 0
+
+    def record(self, success: bool, elapsed_ms: float, window_size: int) -> None:
+        """记录一次尝试，窗口超出容量时淘汰最早的结果。"""
+        self.attempts += 1
+        self.successes += int(success)
+        self.window.append((success, elapsed_ms))
+        while len(self.window) > window_size:
+            self.window.popleft()
+
+    @property
+    def recent_success_rate(self) -> float | None:
+        """窗口内成功率（无样本返回 None）。"""
+        if not self.window:
+            return None
+        return sum(1 for ok, _ in self.window if ok) / len(self.window)
+
+    def as_dict(self) -> dict:
+        """序列化为 {attempts, successes, recent_success_rate, recent_avg_ms, samples}。"""
+        samples = len(self.window)
+        return {
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "recent_success_rate": round(self.recent_success_rate, 3) if samples else None,
+            "recent_avg_ms": round(sum(ms for _, ms in self.window) / samples, 1) if samples else None,
+            "samples": samples,
+        }
+
+
+class DegradationLadder:
+    """Stage 1 降级阶梯统计 + 起始级别选择。"""
+
+    def __init__(
+        self,
+        *,
+        short_text_chars: int = 30,
+        min_success_rate: float = 0.5,
+        min_samples: int = 20,
+        window_size: int = 200,
+        probe_rate: float = 0.1,
+    ) -> None:
+        self._short_text_chars = short_text_chars
+        self._min_success_rate = min_success_rate
+        self._min_samples = min_samples
+        self._window_size = window_size
+        self._probe_rate = probe_rate
+        self._stats: dict[tuple[str, str], LevelStats] = {}
+        self._fallbacks: dict[str, int] = {}
+
+    @classmethod
+    def from_settings(cls, settings: VocServiceSettings) -> "DegradationLadder":
+        """按服务配置创建实例。"""
+        return cls(
+            short_text_chars=settings.stage1_short_text_chars,
+            min_success_rate=settings.stage1_adaptive_min_success_rate,
+            min_samples=settings.stage1_adaptive_min_samples,
+            window_size=settings.stage1_adaptive_window,
+            probe_rate=settings.stage1_adaptive_probe_rate,
+        )
+
+    def start_level(self, source: str, raw_text: str) -> str:
+        """选择拆解的起始级别。"""
+        if len(raw_text.strip()) < self._short_text_chars:
+            return LEVEL_SIMPLIFIED
+
+        stats = self._stats.get((source, LEVEL_NORMAL))
+        if stats is None or len(stats.window) < self._min_samples:
+            return LEVEL_NORMAL
+        if stats.recent_success_rate >= self._min_success_rate:
+            return LEVEL_NORMAL
+        # 成功率低：默认跳过正常 Prompt，少量试探以便成功率回升后恢复
+        return LEVEL_NORMAL if random.random() < self._probe_rate else LEVEL_SIMPLIFIED
+
+    def record(self, source: str, level: str, *, success: bool, elapsed_ms: float) -> None:
+        """记录一次 LLM 拆解尝试。"""
+        stats = self._stats.setdefault((source, level), LevelStats())
+        stats.record(success, elapsed_ms, self._window_size)
+
+    def record_fallback(self, source: str) -> None:
+        """记录一次兜底（所有 LLM 级别均失败）。"""
+        self._fallbacks[source] = self._fallbacks.get(source, 0) + 1
+
+    def snapshot(self) -> dict[str, dict]:
+        """按来源汇总各级别统计：{source: {level: {...}, "fallbacks": int}}。"""
+        result: dict[str, dict] = {}
+        for (source, level), stats in sorted(self._stats.items()):
+            result.setdefault(source, {})[level] = stats.as_dict()
+        for source, count in self._fallbacks.items():
+            result.setdefault(source, {})["fallbacks"] = count
+        return result
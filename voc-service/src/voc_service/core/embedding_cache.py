@@ -0,0 +1,205 @@
+"""内容寻址 embedding 缓存。
+
+缓存键为 (SHA-256(text), embedding 模型标识, dimensions)，两级存储：
+1. 进程内 LRU：命中时零 IO
+2. Postgres 持久层（voc.embedding_cache）：跨进程 / 跨重启共享
+
+模型标识取自 llm-service 响应中实际提供向量的模型（routing.model_id），而不是配置：
+槽位切换模型或故障转移到降级链中的其他模型时，新向量按新模型存放，旧模型的向量不会被误用。
+尚未观察到响应（模型未知）时不读缓存；响应缺少模型标识时不写缓存。
+
+Stage 3 与语义搜索共用同一缓存实例，已向量化过的文本不再调用 llm-service。
+"""
+
+import hashlib
+from collections import OrderedDict
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from voc_service.core.config import VocServiceSettings
+from voc_service.core.llm_client import LLMClient
+from voc_service.models.embedding_cache import EmbeddingCacheEntry
+
+logger = structlog.get_logger(__name__)
+
+
+def text_hash(text: str) -> str:
+    """计算文本的 SHA-256（缓存键的内容部分）。"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _lru_key(model_id: str, h: str) -> tuple[str, str]:
+    return model_id, h
+
+
+class EmbeddingCache:
+    """embedding 两级缓存（进程内 LRU + Postgres 持久层）。
+
+    实例按应用生命周期共享；持久层读写在 SAVEPOINT 中执行，失败只回滚该 SAVEPOINT 并记日志、
+    按未命中处理，不会中止调用方的事务。
+    """
+
+    def __init__(
+        self,
+        *,
+        model_id: str | None = None,
+        dimensions: int | None = None,
+        max_entries: int = 10_000,
+        persistent: bool = True,
+    ) -> None:
+        self._model_id = model_id or None
+        self._dimensions = dimensions
+        self._max_entries = max_entries
+        self._persistent = persistent
+        self._lru: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls, settings: VocServiceSettings) -> "EmbeddingCache":
+        """按服务配置创建缓存实例。"""
+        return cls(
+            model_id=settings.embedding_model_id,
+            max_entries=settings.embedding_cache_max_entries,
+            persistent=settings.embedding_cache_persistent,
+        )
+
+    @property
+    def model_id(self) -> str | None:
+        """当前缓存读取使用的模型标识（最近一次响应的模型，未知时为 None）。"""
+        return self._model_id
+
+    @property
+    def dimensions(self) -> int | None:
+        """调用 embedding 时透传的 dimensions 参数（None 表示模型默认维度）。"""
+        return self._dimensions
+
+    async def lookup(self, db: AsyncSession | None, texts: list[str]) -> dict[str, list[float]]:
+        """批量查询缓存，返回 {text: vector}，仅包含命中项。"""
+        unique = list(dict.fromkeys(texts))
+        model_id = self._model_id
+        if model_id is None:
+            self.misses += len(unique)
+            return {}
+
+        found: dict[str, list[float]] = {}
+        pending: dict[str, str] = {}  # text_hash → text
+
+        for t in unique:
+            h = text_hash(t)
+            key = _lru_key(model_id, h)
+            vector = self._lru.get(key)
+            if vector is not None:
+                self._lru.move_to_end(key)
+                found[t] = vector
+            else:
+                pending[h] = t
+
+        if pending and db is not None and self._persistent:
+            try:
+                async with db.begin_nested():
+                    result = await db.execute(
+                        select(EmbeddingCacheEntry.text_hash, EmbeddingCacheEntry.embedding).where(
+                            EmbeddingCacheEntry.model_id == model_id,
+                            EmbeddingCacheEntry.dimensions == (self._dimensions or 0),
+                            EmbeddingCacheEntry.text_hash.in_(list(pending)),
+                        )
+                    )
+                for h, embedding in result.all():
+                    vector = [float(v) for v in embedding]
+                    self._remember(_lru_key(model_id, h), vector)
+                    found[pending[h]] = vector
+            except Exception:
+                logger.warning("embedding 缓存持久层查询失败，按未命中处理", exc_info=True)
+
+        self.hits += len(found)
+        self.misses += len(unique) - len(found)
+        return found
+
+    async def store(self, db: AsyncSession | None, vectors: dict[str, list[float]], *, model_id: str | None) -> None:
+        """写入缓存（LRU + 持久层，持久层已存在则忽略）。
+
+        Args:
+            model_id: llm-service 响应中实际提供这些向量的模型；为 None（未知）时不写入。
+                与当前模型不同时（槽位切换 / 故障转移），之后的读取改用该模型
+        """
+        if not vectors:
+            return
+        if model_id is None:
+            logger.warning("embedding 响应缺少模型标识，不写入缓存", count=len(vectors))
+            return
+        if model_id != self._model_id:
+            logger.info("embedding 缓存切换模型", previous=self._model_id, current=model_id)
+            self._model_id = model_id
+
+        rows = []
+        for t, vector in vectors.items():
+            h = text_hash(t)
+            self._remember(_lru_key(model_id, h), vector)
+            rows.append(
+                {
+                    "text_hash": h,
+                    "model_id": model_id,
+                    "dimensions": self._dimensions or 0,
+                    "embedding": vector,
+                }
+            )
+
+        if db is None or not self._persistent:
+            return
+
+        try:
+            async with db.begin_nested():
+                await db.execute(pg_insert(EmbeddingCacheEntry).values(rows).on_conflict_do_nothing())
+        except Exception:
+            logger.warning("embedding 缓存持久层写入失败", count=len(rows), exc_info=True)
+
+    async def embed(
+        self,
+        llm_client: LLMClient,
+        texts: list[str],
+        *,
+        db: AsyncSession | None = None,
+    ) -> list[list[float]]:
+        """带缓存的向量化：仅对未命中的去重文本调用 llm-service，按输入顺序返回。"""
+        vectors, _ = await self.embed_with_model(llm_client, texts, db=db)
+        return vectors
+
+    async def embed_with_model(
+        self,
+        llm_client: LLMClient,
+        texts: list[str],
+        *,
+        db: AsyncSession | None = None,
+    ) -> tuple[list[list[float]], str | None]:
+        """同 embed，并返回这批向量所属的模型（全部命中时为读缓存时的模型）。
+
+        响应模型与读缓存时的模型不一致（槽位切换 / 故障转移）且有命中项时，命中的向量与新向量
+        不在同一向量空间，整批重新向量化，保证同一次返回的向量来自同一模型。
+        """
+        lookup_model = self._model_id
+        cached = await self.lookup(db, texts)
+        missing = [t for t in dict.fromkeys(texts) if t not in cached]
+        model_id = lookup_model
+
+        if missing:
+            vectors, model_id = await llm_client.embedding_with_model(texts=missing, dimensions=self._dimensions)
+            if cached and model_id != lookup_model:
+                missing = list(dict.fromkeys(texts))
+                vectors, model_id = await llm_client.embedding_with_model(texts=missing, dimensions=self._dimensions)
+                cached = {}
+            fresh = dict(zip(missing, vectors, strict=True))
+            await self.store(db, fresh, model_id=model_id)
+            cached.update(fresh)
+
+        return [cached[t] for t in texts], model_id
+
+    def _remember(self, key: tuple[str, str], vector: list[float]) -> None:
+        """写入 LRU 并按容量淘汰最久未使用的条目。"""
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self._max_entries:
+            self._lru.popitem(last=False)
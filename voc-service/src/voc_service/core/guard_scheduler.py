@@ -0,0 +1,231 @@
+"""L2 语义校验调度。
+
+L2 校验结果仅供审查、不影响管线输出，没有必要每条 Voice 都在关键路径上多等一次 fast 槽位往返。
+调度器依次判定：
+1. 全部语义单元置信度 ≥ skip_confidence：跳过
+2. 按 sample_rate 抽样，未抽中：跳过
+3. 按 mode 执行：
+   - inline：同步等待（原有行为），审计记录随管线 session 写入
+   - background：投递到后台队列，由 worker 调用 L2 并以独立 session 写入 voc.guard_audits
+   - off：不执行
+
+管线事务对 Voice 持有行锁，独立 session 写入审计记录时的外键检查要等该事务结束。
+因此 background 模式下提供管线 session 时，任务暂存在该 session 上，事务提交后才投递到队列
+（回滚则丢弃），worker 不会阻塞在行锁上。
+
+L2 调用失败（或响应无法解析出一致性判定）时不写审计记录，只计入 failed，
+避免失败被当作"一致"计入审计统计。
+"""
+
+import asyncio
+import random
+import uuid
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, SessionTransaction
+
+from voc_service.core.config import VocServiceSettings
+from voc_service.core.llm_client import LLMClient
+from voc_service.models.guard_audit import GuardAudit
+from voc_service.pipeline.guards import check_l2
+
+logger = structlog.get_logger(__name__)
+
+GUARD_MODES = ("inline", "background", "off")
+
+# 暂存在管线 session.info 上、等待事务提交的后台校验任务
+_PENDING_KEY = "voc_l2_guard_pending"
+
+
+class L2GuardScheduler:
+    """L2 语义校验调度器。
+
+    实例按应用生命周期共享；后台队列已满时丢弃新任务（只记日志），不反压管线。
+    """
+
+    def __init__(
+        self,
+        *,
+        mode: str = "background",
+        sample_rate: float = 1.0,
+        skip_confidence: float = 0.9,
+        temperature: float = 0.2,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        queue_size: int = 200,
+        workers: int = 2,
+    ) -> None:
+        if mode not in GUARD_MODES:
+            raise ValueError(f"未知的 L2 校验模式：{mode}")
+        self._mode = mode
+        self._sample_rate = sample_rate
+        self._skip_confidence = skip_confidence
+        self._temperature = temperature
+        self._session_factory = session_factory
+        self._queue_size = queue_size
+        self._workers = workers
+        self._queue: asyncio.Queue | None = None
+        self._worker_tasks: list[asyncio.Task] = []
+        self.submitted = 0
+        self.skipped = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: VocServiceSettings,
+        *,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> "L2GuardScheduler":
+        """按服务配置创建调度器。"""
+        return cls(
+            mode=settings.guard_l2_mode,
+            sample_rate=settings.guard_l2_sample_rate,
+            skip_confidence=settings.guard_l2_skip_confidence,
+            temperature=settings.guard_l2_temperature,
+            session_factory=session_factory,
+            queue_size=settings.guard_l2_queue_size,
+        )
+
+    def should_check(self, units: list[dict]) -> bool:
+        """判定本次拆解结果是否需要 L2 校验。"""
+        if self._mode == "off":
+            return False
+        confidences = [u.get("confidence") for u in units]
+        if confidences and all(c is not None and c >= self._skip_confidence for c in confidences):
+            return False
+        return random.random() < self._sample_rate
+
+    async def submit(
+        self,
+        llm_client: LLMClient,
+        *,
+        voice_id: uuid.UUID,
+        raw_text: str,
+        units: list[dict],
+        db: AsyncSession | None = None,
+    ) -> None:
+        """按调度策略执行 L2 校验；background 模式立即返回。
+
+        Args:
+            db: 管线 session。inline 模式审计记录随其写入；background 模式在其事务提交后才投递
+        """
+        if not self.should_check(units):
+            self.skipped += 1
+            return
+
+        self.submitted += 1
+        if self._mode == "inline":
+            audit = await self._check(llm_client, voice_id, raw_text, units)
+            if audit is None:
+                return
+            if db is not None:
+                db.add(audit)
+            else:
+                await self._write(audit)
+            return
+
+        self._ensure_workers()
+        item = (llm_client, voice_id, raw_text, units)
+        if db is not None and db.in_transaction():
+            self._defer_until_commit(db.sync_session, item)
+        else:
+            self._enqueue(item)
+
+    async def close(self) -> None:
+        """停止后台 worker（应用关闭时调用，未处理的任务直接丢弃）。"""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
+
+    def _ensure_workers(self) -> asyncio.Queue:
+        """首次投递时在当前事件循环中创建队列与 worker。"""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._queue_size)
+            self._worker_tasks = [asyncio.create_task(self._worker(self._queue)) for _ in range(self._workers)]
+        return self._queue
+
+    def _enqueue(self, item: tuple) -> None:
+        """投递到后台队列；队列已满或调度器已关闭时丢弃。"""
+        if self._queue is None:
+            self.dropped += 1
+            logger.warning("L2 校验调度器已关闭，丢弃本次校验", voice_id=str(item[1]))
+            return
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("L2 校验队列已满，丢弃本次校验", voice_id=str(item[1]))
+
+    def _defer_until_commit(self, session: Session, item: tuple) -> None:
+        """暂存到 session 上，最外层事务提交后投递；首次暂存时注册事务事件。"""
+        pending = session.info.get(_PENDING_KEY)
+        if pending is None:
+            pending = session.info[_PENDING_KEY] = []
+            event.listen(session, "after_commit", self._on_commit)
+            event.listen(session, "after_transaction_end", self._on_transaction_end)
+        pending.append(item)
+
+    def _on_commit(self, session: Session) -> None:
+        """最外层事务提交：投递暂存的任务（SAVEPOINT 释放不触发投递）。"""
+        if session.in_nested_transaction():
+            return
+        pending = session.info[_PENDING_KEY]
+        for item in pending:
+            self._enqueue(item)
+        pending.clear()
+
+    def _on_transaction_end(self, session: Session, transaction: SessionTransaction) -> None:
+        """最外层事务结束仍未投递（已回滚）：丢弃暂存的任务。"""
+        if transaction.parent is not None:
+            return
+        pending = session.info[_PENDING_KEY]
+        if pending:
+            logger.info("管线事务回滚，丢弃待投递的 L2 校验", count=len(pending))
+            pending.clear()
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        """后台 worker：逐个执行队列中的 L2 校验并写入审计记录。"""
+        while True:
+            llm_client, voice_id, raw_text, units = await queue.get()
+            try:
+                audit = await self._check(llm_client, voice_id, raw_text, units)
+                if audit is not None:
+                    await self._write(audit)
+            except Exception:
+                logger.warning("后台 L2 校验失败", voice_id=str(voice_id), exc_info=True)
+            finally:
+                queue.task_done()
+
+    async def _check(
+        self, llm_client: LLMClient, voice_id: uuid.UUID, raw_text: str, units: list[dict]
+    ) -> GuardAudit | None:
+        """执行 L2 校验，返回审计记录；校验失败时返回 None（不写审计记录）。"""
+        try:
+            result = await check_l2(llm_client, raw_text, units, temperature=self._temperature)
+        except Exception:
+            self.failed += 1
+            logger.warning("L2 校验失败，不写入审计记录", voice_id=str(voice_id), exc_info=True)
+            return None
+        return GuardAudit(
+            voice_id=voice_id,
+            stage="stage1",
+            consistent=result["consistent"],
+            confidence=result.get("confidence"),
+            issues=result.get("issues") or [],
+        )
+
+    async def _write(self, audit: GuardAudit) -> None:
+        """以独立 session 写入审计记录（无 session 工厂时只记日志）。"""
+        if self._session_factory is None:
+            return
+        try:
+            async with self._session_factory() as db:
+                db.add(audit)
+                await db.commit()
+        except Exception:
+            logger.warning("L2 校验审计写入失败", voice_id=str(audit.voice_id), exc_info=True)
@@ -6,11 +6,13 @@ import time
 from pathlib import Path
 from uuid import UUID
 
+import httpx
 import structlog
 
 from voc_service.core import import_service, schema_mapping_service
 from voc_service.core.file_parser import parse_bytes
 from voc_service.core.llm_client import LLMClient
+from voc_service.core.token_budget import output_budget
 from voc_service.models.enums import BatchStatus
 
 logger = structlog.get_logger(__name__)
@@ -36,6 +38,7 @@ async def run_generate_mapping_background(
     confidence_auto: float,
     max_file_size_bytes: int,
     mapping_sample_rows: int,
+    llm_http_client: httpx.AsyncClient | None = None,
 ) -> None:
     """后台执行 LLM 映射生成（使用已存储的 prompt_text）。"""
     try:
@@ -74,12 +77,13 @@ async def run_generate_mapping_background(
 
                 # 3. 调用 LLM
                 t2 = time.monotonic()
-                llm_client = LLMClient(base_url=llm_base_url, timeout=llm_timeout)
+                llm_client = LLMClient(base_url=llm_base_url, timeout=llm_timeout, http_client=llm_http_client)
                 llm_response = await llm_client.invoke_slot(
                     slot="reasoning",
                     messages=messages,
                     temperature=0.1,
-                    max_tokens=8192,
+                    # 每列一条映射（目标字段 + 置信度 + 理由），约 120 token
+                    max_tokens=output_budget(len(sample_result.columns) * 120 + 500, floor=1024, ceiling=8192),
                     api_key=api_key,
                 )
                 logger.info("映射后台步骤耗时", step="llm_invoke", batch_id=str(batch_id), elapsed_ms=_ms(t2))
@@ -10,7 +10,7 @@ from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from prism_shared.exceptions import AppException
-from voc_service.models.enums import BatchStatus
+from voc_service.models.enums import BatchPriority, BatchStatus
 from voc_service.models.ingestion_batch import IngestionBatch
 from voc_service.models.schema_mapping import SchemaMapping
 
@@ -24,6 +24,7 @@ async def create_batch(
     file_name: str,
     file_size_bytes: int,
     total_rows: int,
+    priority: int = BatchPriority.NORMAL,
 ) -> IngestionBatch:
     """创建导入批次，status=pending。"""
     batch = IngestionBatch(
@@ -32,6 +33,7 @@ async def create_batch(
         file_size_bytes=file_size_bytes,
         total_count=total_rows,
         status=BatchStatus.PENDING,
+        priority=priority,
     )
     db.add(batch)
     await db.flush()
@@ -90,17 +92,17 @@ async def execute_import(
     insert_sql_with_source_key = text(
         "INSERT INTO voc.voices"
         " (id, source, raw_text, content_hash, source_key,"
-        " batch_id, processed_status, metadata, created_at, updated_at)"
+        " batch_id, priority, processed_status, metadata, created_at, updated_at)"
         " VALUES (gen_random_uuid(), :source, :raw_text, :content_hash,"
-        " :source_key, :batch_id, 'pending', CAST(:metadata AS jsonb), now(), now())"
+        " :source_key, :batch_id, :priority, 'pending', CAST(:metadata AS jsonb), now(), now())"
         " ON CONFLICT (source, source_key) WHERE source_key IS NOT NULL DO NOTHING"
     )
     insert_sql_without_source_key = text(
         "INSERT INTO voc.voices"
         " (id, source, raw_text, content_hash, source_key,"
-        " batch_id, processed_status, metadata, created_at, updated_at)"
+        " batch_id, priority, processed_status, metadata, created_at, updated_at)"
         " VALUES (gen_random_uuid(), :source, :raw_text, :content_hash,"
-        " NULL, :batch_id, 'pending', CAST(:metadata AS jsonb), now(), now())"
+        " NULL, :batch_id, :priority, 'pending', CAST(:metadata AS jsonb), now(), now())"
         " ON CONFLICT (content_hash) WHERE source_key IS NULL DO NOTHING"
     )
 
@@ -147,6 +149,7 @@ async def execute_import(
                     "raw_text": raw_text,
                     "content_hash": content_hash,
                     "batch_id": batch.id,
+                    "priority": batch.priority,
                     "metadata": metadata_json,
                 }
 
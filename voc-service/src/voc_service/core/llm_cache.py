@@ -0,0 +1,81 @@
+"""LLM 槽位响应缓存。
+
+管线 Prompt 是确定性的：同一 raw_text 在重试、重新导入、跨来源重复时
+会生成完全相同的 messages。缓存键为 (slot, SHA-256(messages), temperature, max_tokens)，
+进程内 TTL + LRU 淘汰；温度高于 max_temperature 的调用视为需要多样性，不走缓存。
+"""
+
+import copy
+import hashlib
+import json
+import time
+from collections import OrderedDict
+
+from voc_service.core.config import VocServiceSettings
+
+
+class LLMResponseCache:
+    """invoke_slot 响应的进程内 TTL + LRU 缓存。"""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: int = 3600,
+        max_entries: int = 2000,
+        max_temperature: float = 0.7,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._max_temperature = max_temperature
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls, settings: VocServiceSettings) -> "LLMResponseCache":
+        """按服务配置创建缓存实例。"""
+        return cls(
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+            max_entries=settings.llm_cache_max_entries,
+            max_temperature=settings.llm_cache_max_temperature,
+        )
+
+    @staticmethod
+    def make_key(*, slot: str, messages: list[dict], temperature: float, max_tokens: int) -> str:
+        """构造缓存键：messages 做规范化 JSON 序列化后取 SHA-256。"""
+        messages_hash = hashlib.sha256(
+            json.dumps(messages, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        ).hexdigest()
+        return f"{slot}:{messages_hash}:{temperature}:{max_tokens}"
+
+    def cacheable(self, temperature: float) -> bool:
+        """高温调用（追求多样性）不缓存。"""
+        return temperature <= self._max_temperature
+
+    def get(self, key: str) -> dict | None:
+        """读取缓存，过期或未命中返回 None。返回副本，调用方可安全修改。"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, response = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(response)
+
+    def put(self, key: str, response: dict) -> None:
+        """写入缓存并按容量淘汰最久未使用的条目。"""
+        self._entries[key] = (time.monotonic() + self._ttl, copy.deepcopy(response))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        """移除指定条目（调用方判定缓存的响应不可用时使用）。"""
+        self._entries.pop(key, None)
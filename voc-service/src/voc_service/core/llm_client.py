@@ -1,20 +1,94 @@
 """llm-service HTTP 客户端。"""
 
+import importlib.util
+
 import httpx
 import structlog
 
 from prism_shared.exceptions import AppException
+from voc_service.core.config import VocServiceSettings
+from voc_service.core.llm_cache import LLMResponseCache
+from voc_service.core.rate_limiter import THROTTLE_STATUS_CODES, LLMAdmissionController
+from voc_service.core.run_ledger import record_llm_call
+from voc_service.core.token_budget import count_message_tokens, count_tokens
 
 logger = structlog.get_logger(__name__)
 
 
+def create_llm_http_client(settings: VocServiceSettings) -> httpx.AsyncClient:
+    """创建到 llm-service 的应用级连接池（在 lifespan 中创建、关闭时 aclose）。
+
+    管线每次 LLM 调用复用 keep-alive 连接，不再为每次调用重新握手；安装了 h2 时启用 HTTP/2 多路复用。
+    """
+    return httpx.AsyncClient(
+        timeout=settings.llm_service_timeout,
+        limits=httpx.Limits(
+            max_connections=settings.llm_http_max_connections,
+            max_keepalive_connections=settings.llm_http_max_keepalive,
+            keepalive_expiry=settings.llm_http_keepalive_expiry,
+        ),
+        http2=settings.llm_http2 and importlib.util.find_spec("h2") is not None,
+    )
+
+
 class LLMClient:
-    """封装对 llm-service 的 HTTP 调用。"""
+    """封装对 llm-service 的 HTTP 调用。
+
+    传入 http_client 时复用应用级连接池；未传入时每次调用临时创建连接（脚本 / 测试场景）。
+    实例本身很轻，可按请求创建以携带当前用户的 JWT。
+    """
 
-    def __init__(self, base_url: str, timeout: int = 60, default_api_key: str | None = None) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        timeout: int = 60,
+        default_api_key: str | None = None,
+        response_cache: LLMResponseCache | None = None,
+        rate_limiter: LLMAdmissionController | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
         self._base_url = base_url.rstrip("/")
         self._timeout = timeout
         self._default_api_key = default_api_key
+        self._response_cache = response_cache
+        self._rate_limiter = rate_limiter
+        self._http = http_client
+
+    async def _post(self, url: str, payload: dict, headers: dict) -> dict:
+        """POST 到 llm-service 并返回 JSON（非 2xx 抛 httpx.HTTPStatusError）。"""
+        if self._http is not None:
+            resp = await self._http.post(url, json=payload, headers=headers, timeout=self._timeout)
+        else:
+            async with httpx.AsyncClient(timeout=self._timeout) as client:
+                resp = await client.post(url, json=payload, headers=headers)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def _admit(self, slot: str, tokens: int) -> int:
+        """按槽位准入（未配置准入控制时直接放行），返回预扣的 token 数。"""
+        if self._rate_limiter is None:
+            return 0
+        return await self._rate_limiter.acquire(slot, tokens)
+
+    def _settle(
+        self,
+        slot: str,
+        *,
+        reserved: int,
+        body: dict | None = None,
+        status_code: int | None = None,
+        congested: bool = False,
+    ) -> None:
+        """调用结束后反馈准入控制：成功时按实际 usage 退还预扣 token；429 / 503、超时与连接失败时降速。"""
+        if self._rate_limiter is None:
+            return
+        if congested or status_code in THROTTLE_STATUS_CODES:
+            self._rate_limiter.on_throttled(slot)
+            return
+        if status_code is not None:
+            return
+        usage = (((body or {}).get("data") or {}).get("result") or {}).get("usage") or {}
+        self._rate_limiter.on_success(slot, reserved=reserved, used=usage.get("total_tokens"))
 
     async def invoke_slot(
         self,
@@ -24,20 +98,36 @@ class LLMClient:
         temperature: float = 0.3,
         max_tokens: int = 4096,
         api_key: str | None = None,
+        use_cache: bool = True,
     ) -> dict:
         """
         调用 llm-service 槽位推理端点。
 
+        配置了响应缓存时，相同 (slot, messages, temperature, max_tokens) 的调用直接返回缓存结果；
+        温度高于缓存阈值或 use_cache=False 时始终请求 llm-service。
+
         Args:
             slot: 槽位类型（fast / reasoning / embedding / rerank）
             messages: 消息列表
             temperature: 温度参数
             max_tokens: 最大生成 token 数
             api_key: JWT token，用于认证
+            use_cache: 是否允许使用响应缓存
 
         Returns:
             推理结果 dict（包含 result.content）
         """
+        cache_key = None
+        if use_cache and self._response_cache is not None and self._response_cache.cacheable(temperature):
+            cache_key = LLMResponseCache.make_key(
+                slot=slot, messages=messages, temperature=temperature, max_tokens=max_tokens
+            )
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("LLM 响应缓存命中", slot=slot)
+                record_llm_call(cached, cached=True)
+                return cached
+
         url = f"{self._base_url}/api/llm/slots/{slot}/invoke"
         payload: dict = {
             "messages": messages,
@@ -49,12 +139,11 @@ class LLMClient:
         if token:
             headers["Authorization"] = f"Bearer {token}"
 
+        reserved = await self._admit(slot, count_message_tokens(messages) + max_tokens)
         try:
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                resp = await client.post(url, json=payload, headers=headers)
-                resp.raise_for_status()
-                return resp.json()
+            body = await self._post(url, payload, headers)
         except httpx.ConnectError as e:
+            self._settle(slot, reserved=reserved, congested=True)
             logger.error("llm-service 连接失败", url=url, error=str(e))
             raise AppException(
                 code="VOC_LLM_UNAVAILABLE",
@@ -62,6 +151,7 @@ class LLMClient:
                 status_code=503,
             ) from e
         except httpx.TimeoutException as e:
+            self._settle(slot, reserved=reserved, congested=True)
             logger.error("llm-service 调用超时", url=url, error=str(e))
             raise AppException(
                 code="VOC_LLM_TIMEOUT",
@@ -69,6 +159,7 @@ class LLMClient:
                 status_code=504,
             ) from e
         except httpx.HTTPStatusError as e:
+            self._settle(slot, reserved=reserved, status_code=e.response.status_code)
             logger.error(
                 "llm-service 返回错误",
                 url=url,
@@ -81,6 +172,20 @@ class LLMClient:
                 status_code=503,
             ) from e
 
+        self._settle(slot, reserved=reserved, body=body)
+        record_llm_call(body)
+        if cache_key is not None:
+            self._response_cache.put(cache_key, body)
+        return body
+
+    def forget(self, *, slot: str, messages: list[dict], temperature: float = 0.3, max_tokens: int = 4096) -> None:
+        """从响应缓存中移除指定调用的结果（调用方判定该响应不可用时使用，避免重试命中坏结果）。"""
+        if self._response_cache is None:
+            return
+        self._response_cache.discard(
+            LLMResponseCache.make_key(slot=slot, messages=messages, temperature=temperature, max_tokens=max_tokens)
+        )
+
     async def embedding(
         self,
         *,
@@ -89,6 +194,21 @@ class LLMClient:
         api_key: str | None = None,
     ) -> list[list[float]]:
         """调用 slot-based embedding 端点，返回向量列表。"""
+        vectors, _ = await self.embedding_with_model(texts=texts, dimensions=dimensions, api_key=api_key)
+        return vectors
+
+    async def embedding_with_model(
+        self,
+        *,
+        texts: list[str],
+        dimensions: int | None = None,
+        api_key: str | None = None,
+    ) -> tuple[list[list[float]], str | None]:
+        """调用 slot-based embedding 端点，返回 (向量列表, 实际响应的模型标识)。
+
+        槽位故障转移时响应可能来自降级链中的其他模型；模型标识取自 routing.model_id，
+        响应中缺失时为 None。
+        """
         url = f"{self._base_url}/api/llm/slots/embedding/invoke"
         payload: dict = {"input": texts}
         if dimensions is not None:
@@ -99,13 +219,16 @@ class LLMClient:
         if token:
             headers["Authorization"] = f"Bearer {token}"
 
+        reserved = await self._admit("embedding", sum(count_tokens(t) for t in texts))
         try:
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                resp = await client.post(url, json=payload, headers=headers)
-                resp.raise_for_status()
-                body = resp.json()
-                return [item["values"] for item in body["data"]["result"]["embeddings"]]
+            body = await self._post(url, payload, headers)
+            self._settle("embedding", reserved=reserved, body=body)
+            record_llm_call(body)
+            data = body["data"]
+            model_id = (data.get("routing") or {}).get("model_id") or data["result"].get("model")
+            return [item["values"] for item in data["result"]["embeddings"]], model_id
         except httpx.ConnectError as e:
+            self._settle("embedding", reserved=reserved, congested=True)
             logger.error("llm-service embedding 连接失败", url=url, error=str(e))
             raise AppException(
                 code="VOC_LLM_UNAVAILABLE",
@@ -113,6 +236,7 @@ class LLMClient:
                 status_code=503,
             ) from e
         except httpx.TimeoutException as e:
+            self._settle("embedding", reserved=reserved, congested=True)
             logger.error("llm-service embedding 调用超时", url=url, error=str(e))
             raise AppException(
                 code="VOC_LLM_TIMEOUT",
@@ -120,6 +244,7 @@ class LLMClient:
                 status_code=504,
             ) from e
         except httpx.HTTPStatusError as e:
+            self._settle("embedding", reserved=reserved, status_code=e.response.status_code)
             logger.error(
                 "llm-service embedding 返回错误",
                 url=url,
@@ -156,11 +281,8 @@ class LLMClient:
             headers["Authorization"] = f"Bearer {token}"
 
         try:
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                resp = await client.post(url, json=payload, headers=headers)
-                resp.raise_for_status()
-                body = resp.json()
-                return body["data"]["result"]["results"]
+            body = await self._post(url, payload, headers)
+            return body["data"]["result"]["results"]
         except httpx.ConnectError as e:
             logger.error("llm-service rerank 连接失败", url=url, error=str(e))
             raise AppException(
@@ -47,6 +47,10 @@ def extract_json_from_llm_response(llm_response: dict) -> dict:
 def parse_json_from_text(text: str) -> dict:
     """从文本中提取 JSON（支持 markdown 代码块）。
 
+    直接解析失败时容错恢复：取第一个括号配平的对象（忽略前后说明文字）；
+    被 max_tokens 截断时，回退到最后一个完整的数组元素并补齐括号，
+    返回 units / tagged_units 等数组的有效前缀。
+
     Args:
         text: 可能包含 markdown 代码块的 JSON 文本
 
@@ -68,9 +72,77 @@ def parse_json_from_text(text: str) -> dict:
     try:
         return json.loads(json_str)
     except json.JSONDecodeError as e:
+        recovered = _recover_json_object(json_str)
+        if recovered is not None:
+            logger.warning("LLM 输出 JSON 不完整，已恢复有效部分", content_length=len(json_str), error=str(e))
+            return recovered
         logger.error("JSON 解析失败", content=text[:500], error=str(e))
         raise AppException(
             code="VOC_LLM_RESPONSE_INVALID",
             message=f"LLM 输出 JSON 解析失败：{e}",
             status_code=422,
         ) from e
+
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+# 截断恢复时最多尝试的截断点数量（从后往前）
+_MAX_RECOVERY_ATTEMPTS = 32
+
+
+def _recover_json_object(text: str) -> dict | None:
+    """单遍扫描恢复 JSON 对象，无法恢复时返回 None。
+
+    扫描时跟踪字符串 / 转义状态与括号栈：
+    - 第一个对象在文本内闭合：截取该对象解析（丢弃前后多余文字）
+    - 文本结束仍未闭合（截断）：记录每个"数组元素刚好完整结束"的位置，
+      从最后一个开始截断并按当时的括号栈补齐闭合符，取第一个可解析的结果
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+
+    stack: list[str] = []
+    cut_points: list[tuple[int, str]] = []  # (截断位置, 需补齐的闭合符)
+    in_string = False
+    escaped = False
+
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(ch)
+        elif ch in "}]":
+            if not stack or _CLOSERS[stack[-1]] != ch:
+                return None
+            stack.pop()
+            if not stack:
+                return _loads_object(text[start : i + 1])
+            # 数组元素完整结束：可在此截断
+            if stack[-1] == "[":
+                cut_points.append((i + 1, "".join(_CLOSERS[c] for c in reversed(stack))))
+
+    for end, closers in reversed(cut_points[-_MAX_RECOVERY_ATTEMPTS:]):
+        recovered = _loads_object(text[start:end] + closers)
+        if recovered is not None:
+            return recovered
+    return None
+
+
+def _loads_object(text: str) -> dict | None:
+    """解析为 dict，失败或非对象返回 None。"""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
@@ -1,14 +1,24 @@
 """管线编排：Stage 1 + Stage 2 处理 pending Voice。"""
 
+from datetime import UTC, datetime
 from uuid import UUID
 
 import structlog
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from voc_service.core.config import VocServiceSettings
+from voc_service.core.degradation_ladder import DegradationLadder
+from voc_service.core.embedding_cache import EmbeddingCache
+from voc_service.core.guard_scheduler import L2GuardScheduler
 from voc_service.core.llm_client import LLMClient
-from voc_service.models.voice import Voice
+from voc_service.core.retry_policy import RetryPolicy
+from voc_service.core.run_ledger import PipelineRunLedger, install_db_timing
+from voc_service.core.tag_memo import TagNormalizationMemo
+from voc_service.core.tag_vocabulary import TagVocabularyIndex
+from voc_service.core.voice_claim import claim_voices
+from voc_service.models.semantic_unit import SemanticUnit
+from voc_service.pipeline.short_text import ShortTextFastPath
 from voc_service.pipeline.stage1_splitting import SemanticSplitter
 from voc_service.pipeline.stage2_tagging import TagEmergenceProcessor
 from voc_service.pipeline.stage3_embedding import EmbeddingProcessor
@@ -23,42 +33,60 @@ async def process_pending_voices(
     settings: VocServiceSettings,
     batch_id: UUID | None = None,
     limit: int | None = None,
+    embedding_cache: EmbeddingCache | None = None,
+    tag_memo: TagNormalizationMemo | None = None,
+    tag_vocabulary: TagVocabularyIndex | None = None,
+    guard_scheduler: L2GuardScheduler | None = None,
+    degradation_ladder: DegradationLadder | None = None,
 ) -> dict:
     """编排 Stage 1 + Stage 2 管线。
 
     流程：
-    1. SELECT Voice WHERE processed_status='pending' FOR UPDATE SKIP LOCKED
+    1. 认领 pending 或 (failed 且到达重试时间) 的 Voice：优先级通道 + 批次间轮转，FOR UPDATE SKIP LOCKED
     2. 逐条处理（AsyncSession 不可在多个协程间共享）
-    3. Stage 1：语义拆解 → db.add_all(units) → flush
-    4. Stage 2：标签涌现 + 标准化 → upsert tags → flush
-    5. 更新 Voice.processed_status = completed/failed
-    6. 返回 {processed, failed, skipped}
+    3. 短文本快速路径：复用相同 / 近似文本的已有标注，命中则跳过 Stage 1 + Stage 2
+    4. Stage 1：语义拆解 → db.add_all(units) → flush
+       Stage 2：标签涌现 + 标准化 → upsert tags → flush
+    5. 更新 Voice.processed_status = completed/failed（失败时按退避策略安排下次重试）
+    6. 写入运行账本（每条 Voice 各阶段的耗时 / token），返回 {processed, failed, skipped, run_id}
 
     Returns:
-        {"processed": int, "failed": int, "skipped": int}
+        {"processed": int, "failed": int, "skipped": int, "run_id": UUID | None}
     """
     effective_limit = limit or settings.pipeline_batch_size
+    retry_policy = RetryPolicy.from_settings(settings)
 
-    # 构建查询
-    query = (
-        select(Voice)
-        .where(Voice.processed_status == "pending")
-        .with_for_update(skip_locked=True)
-        .limit(effective_limit)
+    # 存量标签（迁移 007 之前创建）尚无名称向量：每次运行按使用量补写一批，直至全部回填
+    if tag_vocabulary is not None and settings.tag_vocab_backfill_batch > 0:
+        try:
+            async with db.begin_nested():
+                indexed = await tag_vocabulary.backfill(db, llm_client, limit=settings.tag_vocab_backfill_batch)
+        except Exception:
+            logger.warning("标签词表回填失败，跳过", exc_info=True)
+        else:
+            if indexed:
+                logger.info("标签词表回填完成一批", indexed=indexed)
+
+    # 按优先级通道 + 批次间公平轮转认领
+    voices = await claim_voices(
+        db,
+        eligible=retry_policy.eligible_clause(),
+        limit=effective_limit,
+        batch_id=batch_id,
     )
-    if batch_id is not None:
-        query = query.where(Voice.batch_id == batch_id)
-
-    result = await db.execute(query)
-    voices = list(result.scalars().all())
 
     if not voices:
         logger.info("无待处理的 Voice")
-        return {"processed": 0, "failed": 0, "skipped": 0}
+        return {"processed": 0, "failed": 0, "skipped": 0, "run_id": None}
 
     logger.info("开始管线处理", count=len(voices), batch_id=str(batch_id) if batch_id else None)
 
-    splitter = SemanticSplitter(llm_client, settings)
+    if isinstance(db.bind, AsyncEngine):
+        install_db_timing(db.bind)
+    ledger = PipelineRunLedger(batch_id=batch_id)
+
+    fast_path = ShortTextFastPath(llm_client, db, settings, embedding_cache=embedding_cache)
+    splitter = SemanticSplitter(llm_client, settings, guard=guard_scheduler, ladder=degradation_ladder, db=db)
     processed = 0
     failed = 0
 
@@ -66,22 +94,35 @@ async def process_pending_voices(
         try:
             # 标记为处理中
             voice.processed_status = "processing"
+            if voice.retry_count:
+                # 重试：清理上次失败时已写入的语义单元（标签关联随外键级联删除）
+                await db.execute(delete(SemanticUnit).where(SemanticUnit.voice_id == voice.id))
             await db.flush()
 
-            # Stage 1: 语义拆解
-            units = await splitter.split(voice)
-            db.add_all(units)
-            await db.flush()
-
-            # Stage 2: 标签涌现 + 标准化
-            tagger = TagEmergenceProcessor(llm_client, db, settings)
-            await tagger.tag(units)
-            await db.flush()
+            # 短文本快速路径：复用已有标注
+            units = None
+            if fast_path.applies(voice):
+                with ledger.stage(voice.id, "fast_path"):
+                    units = await fast_path.build(voice)
+
+            if units is None:
+                # Stage 1: 语义拆解
+                with ledger.stage(voice.id, "stage1"):
+                    units = await splitter.split(voice)
+                    db.add_all(units)
+                    await db.flush()
+
+                # Stage 2: 标签涌现 + 标准化
+                with ledger.stage(voice.id, "stage2"):
+                    tagger = TagEmergenceProcessor(llm_client, db, settings, memo=tag_memo, vocabulary=tag_vocabulary)
+                    await tagger.tag(units)
+                    await db.flush()
 
             # Stage 3: 向量化
-            embedder = EmbeddingProcessor(llm_client, settings)
-            embedded = await embedder.embed(units)
-            await db.flush()
+            with ledger.stage(voice.id, "stage3"):
+                embedder = EmbeddingProcessor(llm_client, settings, db=db, cache=embedding_cache)
+                embedded = await embedder.embed(units)
+                await db.flush()
 
             logger.info(
                 "Stage 3 向量化完成",
@@ -93,6 +134,7 @@ async def process_pending_voices(
             # 标记为完成
             voice.processed_status = "completed"
             voice.processing_error = None
+            voice.next_attempt_at = None
             processed += 1
 
             logger.info(
@@ -108,16 +150,19 @@ async def process_pending_voices(
                 error=str(e),
                 exc_info=True,
             )
-            voice.processed_status = "failed"
-            voice.processing_error = str(e)[:500]
-            voice.retry_count += 1
+            will_retry = retry_policy.schedule_failure(voice, str(e), now=datetime.now(UTC))
+            if not will_retry:
+                logger.warning("Voice 已达重试上限", voice_id=str(voice.id), retry_count=voice.retry_count)
             failed += 1
 
-    # 最终提交由 get_db 依赖的上下文管理器处理
-    logger.info("管线处理完成", processed=processed, failed=failed)
-
-    return {
+    summary = {
         "processed": processed,
         "failed": failed,
         "skipped": 0,
     }
+    run = ledger.persist(db, summary)
+
+    # 最终提交由 get_db 依赖的上下文管理器处理
+    logger.info("管线处理完成", processed=processed, failed=failed, run_id=str(run.id))
+
+    return {**summary, "run_id": run.id}
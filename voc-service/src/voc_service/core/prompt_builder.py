@@ -1,5 +1,6 @@
 """Schema 映射提示词构建器。"""
 
+from voc_service.core.token_budget import truncate_to_tokens
 from voc_service.prompts.schema_mapping import (
     SCHEMA_MAPPING_SYSTEM_V3,
     VOICE_TABLE_DDL,
@@ -18,8 +19,16 @@ class PromptBuilder:
         df_info: str = "",
         sample_data: str = "",
         historical_reference: str = "",
+        describe_max_tokens: int | None = None,
     ) -> str:
-        """填充 V3 模板占位符，返回完整提示词文本。"""
+        """填充 V3 模板占位符，返回完整提示词文本。
+
+        指定 describe_max_tokens 时，df_describe / df_info 超出预算的部分被截断（宽表统计信息可达数万 token）。
+        """
+        if describe_max_tokens is not None:
+            df_describe = truncate_to_tokens(df_describe, describe_max_tokens)
+            df_info = truncate_to_tokens(df_info, describe_max_tokens)
+
         fields_sorted = ", ".join(sorted(columns))
         primary_key = ", ".join(dedup_columns) if dedup_columns else "未指定"
 
@@ -0,0 +1,202 @@
+"""LLM 槽位客户端准入控制。
+
+每个槽位（fast / reasoning / embedding）两只令牌桶：请求数 / 分钟（RPM）与 token 数 / 分钟（TPM）。
+调用前按预估 token（Prompt + max_tokens）申请，令牌不足时排队等待；响应返回后按实际 usage 退还多扣的部分。
+申请时立即预扣（余额可为负），按欠额算出等待时间后在锁外等待：后到的请求看到更大的欠额、等待更久，
+仍按到达顺序放行，且一个等待方不会阻塞同槽位其他请求的申请。
+
+速率按 AIMD 自适应：
+- llm-service 返回 429 / 503、调用超时或连接失败：有效速率乘以 decrease_factor（同一冷却窗口内只降一次）
+- 调用成功：有效速率增加配置值的 increase_step，直到恢复配置上限
+
+实例按应用生命周期共享，管线并发提高时实际吞吐跟随 provider 容量变化，而不是把每条 Voice 推进降级阶梯。
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+
+from voc_service.core.config import VocServiceSettings
+
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+class TokenBucket:
+    """令牌桶：按 per_minute 匀速补充，容量为 burst_seconds 内的补充量。"""
+
+    def __init__(self, per_minute: float, *, burst_seconds: float = 10.0) -> None:
+        self._burst_seconds = burst_seconds
+        self._rate = 0.0
+        self._capacity = 0.0
+        self._tokens = 0.0
+        self.set_rate(per_minute)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+
+    @property
+    def per_minute(self) -> float:
+        """当前补充速率（每分钟）。"""
+        return self._rate * 60
+
+    def set_rate(self, per_minute: float) -> None:
+        """调整补充速率（已有令牌不超过新容量）。"""
+        self._rate = per_minute / 60
+        self._capacity = max(1.0, self._rate * self._burst_seconds)
+        self._tokens = min(self._tokens, self._capacity)
+
+    def try_take(self, cost: float) -> float:
+        """尝试扣除 cost 个令牌：成功返回 0，否则返回需要等待的秒数（不扣除）。
+
+        单次 cost 超过容量时按容量计，避免永远无法满足。
+        """
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        cost = min(cost, self._capacity)
+        if self._tokens >= cost:
+            self._tokens -= cost
+            return 0.0
+        return (cost - self._tokens) / self._rate
+
+    def reserve(self, cost: float) -> float:
+        """预扣 cost 个令牌（余额可为负），返回还清欠额需要等待的秒数。
+
+        单次 cost 超过容量时按容量计，避免永远无法满足。
+        """
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        self._tokens -= min(cost, self._capacity)
+        return max(0.0, -self._tokens / self._rate)
+
+    def refund(self, amount: float) -> None:
+        """退还多扣的令牌。"""
+        self._tokens = min(self._capacity, self._tokens + amount)
+
+
+@dataclass
+class SlotLimiter:
+    """单个槽位的 RPM + TPM 令牌桶与 AIMD 速率系数。"""
+
+    rpm: int
+    tpm: int
+    requests: TokenBucket | None
+    tokens: TokenBucket | None
+    scale: float = 1.0
+    last_decrease: float = 0.0
+    throttled: int = 0
+    waited_ms: float = 0.0
+
+    def apply_scale(self) -> None:
+        """按 AIMD 系数更新两只令牌桶的速率。"""
+        if self.requests is not None:
+            self.requests.set_rate(self.rpm * self.scale)
+        if self.tokens is not None:
+            self.tokens.set_rate(self.tpm * self.scale)
+
+
+class LLMAdmissionController:
+    """按槽位的客户端准入控制（RPM / TPM 令牌桶 + AIMD）。"""
+
+    def __init__(
+        self,
+        limits: dict[str, tuple[int, int]],
+        *,
+        decrease_factor: float = 0.5,
+        increase_step: float = 0.02,
+        min_scale: float = 0.05,
+        cooldown_seconds: float = 2.0,
+    ) -> None:
+        """limits: {slot: (rpm, tpm)}，rpm 或 tpm 为 0 表示该维度不限制；未列出的槽位不限流。"""
+        self._decrease_factor = decrease_factor
+        self._increase_step = increase_step
+        self._min_scale = min_scale
+        self._cooldown = cooldown_seconds
+        self._slots: dict[str, SlotLimiter] = {}
+        for slot, (rpm, tpm) in limits.items():
+            if rpm <= 0 and tpm <= 0:
+                continue
+            self._slots[slot] = SlotLimiter(
+                rpm=rpm,
+                tpm=tpm,
+                requests=TokenBucket(rpm) if rpm > 0 else None,
+                tokens=TokenBucket(tpm) if tpm > 0 else None,
+            )
+
+    @classmethod
+    def from_settings(cls, settings: VocServiceSettings) -> "LLMAdmissionController":
+        """按服务配置创建实例。"""
+        return cls(
+            {
+                "fast": (settings.llm_fast_rpm, settings.llm_fast_tpm),
+                "reasoning": (settings.llm_reasoning_rpm, settings.llm_reasoning_tpm),
+                "embedding": (settings.llm_embedding_rpm, settings.llm_embedding_tpm),
+            },
+            decrease_factor=settings.llm_rate_decrease_factor,
+            increase_step=settings.llm_rate_increase_step,
+        )
+
+    async def acquire(self, slot: str, tokens: int) -> int:
+        """申请一次调用（预估 tokens 个 token），令牌不足时等待。返回实际预扣的 token 数。"""
+        limiter = self._slots.get(slot)
+        if limiter is None:
+            return 0
+
+        # 预扣不含 await，在事件循环中是原子的；等待在预扣之后进行，不阻塞其他请求申请
+        wait = 0.0
+        for bucket, cost in ((limiter.requests, 1), (limiter.tokens, tokens)):
+            if bucket is not None:
+                wait = max(wait, bucket.reserve(cost))
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._refund(limiter, requests=1, tokens=tokens)
+                raise
+            limiter.waited_ms += wait * 1000
+        return tokens
+
+    @staticmethod
+    def _refund(limiter: SlotLimiter, *, requests: int, tokens: int) -> None:
+        """退还预扣的令牌（等待中被取消）。"""
+        if limiter.requests is not None:
+            limiter.requests.refund(requests)
+        if limiter.tokens is not None:
+            limiter.tokens.refund(tokens)
+
+    def on_success(self, slot: str, *, reserved: int = 0, used: int | None = None) -> None:
+        """调用成功：退还多扣的 token，速率加性恢复。"""
+        limiter = self._slots.get(slot)
+        if limiter is None:
+            return
+        if limiter.tokens is not None and used is not None and reserved > used:
+            limiter.tokens.refund(reserved - used)
+        if limiter.scale < 1.0:
+            limiter.scale = min(1.0, limiter.scale + self._increase_step)
+            limiter.apply_scale()
+
+    def on_throttled(self, slot: str) -> None:
+        """llm-service 返回 429 / 503：速率乘性下降（冷却窗口内的并发失败只降一次）。"""
+        limiter = self._slots.get(slot)
+        if limiter is None:
+            return
+        limiter.throttled += 1
+        now = time.monotonic()
+        if now - limiter.last_decrease < self._cooldown:
+            return
+        limiter.last_decrease = now
+        limiter.scale = max(self._min_scale, limiter.scale * self._decrease_factor)
+        limiter.apply_scale()
+
+    def snapshot(self) -> dict[str, dict]:
+        """各槽位当前有效速率与统计。"""
+        return {
+            slot: {
+                "rpm": round(limiter.requests.per_minute, 1) if limiter.requests else None,
+                "tpm": round(limiter.tokens.per_minute) if limiter.tokens else None,
+                "scale": round(limiter.scale, 3),
+                "throttled": limiter.throttled,
+                "waited_ms": round(limiter.waited_ms, 1),
+            }
+            for slot, limiter in self._slots.items()
+        }
@@ -0,0 +1,64 @@
+"""失败 Voice 的重试调度。
+
+Voice 处理失败后按指数退避 + 全抖动（full jitter）计算下次尝试时间：
+    delay = random(0, min(cap, base * 2 ** (retry_count - 1)))
+下限取 base 的一半，避免刚失败立刻被下一轮认领。
+retry_count 超过 max_retries 后不再调度（next_attempt_at 置空），需人工重新触发。
+
+认领查询通过 eligible_clause() 同时选出 pending 与到期的 failed Voice，
+LLM 短暂不可用时吞吐可自动恢复。
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import ColumnElement, and_, func, or_
+
+from voc_service.core.config import VocServiceSettings
+from voc_service.models.voice import Voice
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """指数退避 + 抖动的重试策略。"""
+
+    max_retries: int = 2
+    base_seconds: float = 30.0
+    max_seconds: float = 3600.0
+
+    @classmethod
+    def from_settings(cls, settings: VocServiceSettings) -> "RetryPolicy":
+        """按服务配置创建策略。"""
+        return cls(
+            max_retries=settings.pipeline_max_retries,
+            base_seconds=settings.pipeline_retry_base_seconds,
+            max_seconds=settings.pipeline_retry_max_seconds,
+        )
+
+    def delay(self, retry_count: int) -> float:
+        """第 retry_count 次失败后的等待秒数。"""
+        ceiling = min(self.max_seconds, self.base_seconds * 2 ** max(retry_count - 1, 0))
+        return max(self.base_seconds / 2, random.uniform(0, ceiling))
+
+    def schedule_failure(self, voice: Voice, error: str, *, now: datetime) -> bool:
+        """记录一次失败并安排下次尝试；超过重试上限时返回 False。"""
+        voice.processed_status = "failed"
+        voice.processing_error = error[:500]
+        voice.retry_count = (voice.retry_count or 0) + 1
+        if voice.retry_count > self.max_retries:
+            voice.next_attempt_at = None
+            return False
+        voice.next_attempt_at = now + timedelta(seconds=self.delay(voice.retry_count))
+        return True
+
+    def eligible_clause(self) -> ColumnElement[bool]:
+        """认领条件：pending，或 failed 且未超过重试上限、已到下次尝试时间。"""
+        return or_(
+            Voice.processed_status == "pending",
+            and_(
+                Voice.processed_status == "failed",
+                Voice.retry_count <= self.max_retries,
+                Voice.next_attempt_at <= func.now(),
+            ),
+        )
@@ -0,0 +1,189 @@
+"""管线运行账本：按 Voice × 阶段记录耗时与 token。
+
+阶段计量通过 ContextVar 传递，LLMClient 与 SQL 执行事件在当前阶段内自动累加，
+各 Stage 处理器无需显式传参：
+- wall_ms：阶段总耗时
+- llm_ms：llm-service 返回的 routing.failover_trace 中各次尝试的 provider 耗时之和
+- db_ms：阶段内 SQL 执行耗时之和（engine cursor 事件）
+- prompt_tokens / completion_tokens：llm-service 返回的 usage
+- level：Stage 1 最终使用的降级级别
+
+一轮运行结束后写入 voc.pipeline_runs / voc.pipeline_stage_metrics，
+聚合接口按阶段返回 p50 / p95。
+"""
+
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from voc_service.core.degradation_ladder import LEVEL_SEVERITY
+from voc_service.models.pipeline_run import PipelineRun, PipelineStageMetric
+
+
+@dataclass
+class StageMeter:
+    """单条 Voice 单个阶段的计量。"""
+
+    voice_id: uuid.UUID
+    stage: str
+    wall_ms: float = 0.0
+    llm_ms: float = 0.0
+    db_ms: float = 0.0
+    llm_calls: int = 0
+    llm_cache_hits: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    level: str | None = None
+    succeeded: bool = True
+
+
+_current_stage: ContextVar[StageMeter | None] = ContextVar("voc_pipeline_stage", default=None)
+
+
+def record_llm_call(body: dict | None, *, cached: bool = False) -> None:
+    """记录一次 LLM 调用（由 LLMClient 调用；不在阶段计量内时忽略）。"""
+    meter = _current_stage.get()
+    if meter is None:
+        return
+    if cached:
+        meter.llm_cache_hits += 1
+        return
+
+    meter.llm_calls += 1
+    data = (body or {}).get("data") or {}
+    usage = (data.get("result") or {}).get("usage") or {}
+    meter.prompt_tokens += usage.get("prompt_tokens") or 0
+    meter.completion_tokens += usage.get("completion_tokens") or 0
+
+    trace = (data.get("routing") or {}).get("failover_trace") or []
+    trace_ms = sum(item.get("latency_ms") or 0 for item in trace)
+    meter.llm_ms += trace_ms or (data.get("result") or {}).get("latency_ms") or 0
+
+
+def record_level(level: str) -> None:
+    """记录 Stage 1 使用的降级级别（分段拆解时保留最深的级别）。"""
+    meter = _current_stage.get()
+    if meter is None:
+        return
+    if meter.level is None or LEVEL_SEVERITY.get(level, -1) > LEVEL_SEVERITY.get(meter.level, -1):
+        meter.level = level
+
+
+# --- SQL 耗时 ---
+
+_QUERY_START_KEY = "voc_query_start"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get(_QUERY_START_KEY)
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+    meter = _current_stage.get()
+    if meter is not None:
+        meter.db_ms += elapsed_ms
+
+
+def install_db_timing(engine: AsyncEngine) -> None:
+    """为 engine 注册 SQL 计时事件（幂等）。"""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# --- 运行账本 ---
+
+
+@dataclass
+class PipelineRunLedger:
+    """一次管线运行的账本。"""
+
+    batch_id: uuid.UUID | None = None
+    meters: list[StageMeter] = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+
+    @contextmanager
+    def stage(self, voice_id: uuid.UUID, stage: str) -> Iterator[StageMeter]:
+        """阶段计量上下文：期间的 LLM 调用与 SQL 执行计入该阶段；异常时标记失败并继续抛出。"""
+        meter = StageMeter(voice_id=voice_id, stage=stage)
+        self.meters.append(meter)
+        token = _current_stage.set(meter)
+        started = time.monotonic()
+        try:
+            yield meter
+        except BaseException:
+            meter.succeeded = False
+            raise
+        finally:
+            meter.wall_ms = (time.monotonic() - started) * 1000
+            _current_stage.reset(token)
+
+    def persist(self, db: AsyncSession, result: dict) -> PipelineRun:
+        """将运行记录与阶段计量加入 session（随调用方事务提交）。"""
+        run = PipelineRun(
+            id=uuid.uuid4(),
+            batch_id=self.batch_id,
+            processed=result.get("processed", 0),
+            failed=result.get("failed", 0),
+            skipped=result.get("skipped", 0),
+            wall_ms=(time.monotonic() - self.started) * 1000,
+        )
+        db.add(run)
+        db.add_all(
+            PipelineStageMetric(
+                run_id=run.id,
+                voice_id=m.voice_id,
+                stage=m.stage,
+                wall_ms=m.wall_ms,
+                llm_ms=m.llm_ms,
+                db_ms=m.db_ms,
+                llm_calls=m.llm_calls,
+                llm_cache_hits=m.llm_cache_hits,
+                prompt_tokens=m.prompt_tokens,
+                completion_tokens=m.completion_tokens,
+                level=m.level,
+                succeeded=m.succeeded,
+            )
+            for m in self.meters
+        )
+        return run
+
+
+async def stage_latency_summary(db: AsyncSession, *, since: datetime) -> list[dict]:
+    """按阶段聚合 since 之后的计量：样本数、wall / llm / db 耗时 p50 / p95、token 合计。"""
+    m = PipelineStageMetric
+
+    def pct(column, q: float):
+        return func.percentile_cont(q).within_group(column)
+
+    result = await db.execute(
+        select(
+            m.stage,
+            func.count().label("samples"),
+            pct(m.wall_ms, 0.5).label("wall_ms_p50"),
+            pct(m.wall_ms, 0.95).label("wall_ms_p95"),
+            pct(m.llm_ms, 0.5).label("llm_ms_p50"),
+            pct(m.llm_ms, 0.95).label("llm_ms_p95"),
+            pct(m.db_ms, 0.5).label("db_ms_p50"),
+            pct(m.db_ms, 0.95).label("db_ms_p95"),
+            func.sum(m.llm_calls).label("llm_calls"),
+            func.sum(m.prompt_tokens).label("prompt_tokens"),
+            func.sum(m.completion_tokens).label("completion_tokens"),
+        )
+        .where(m.created_at >= since)
+        .group_by(m.stage)
+        .order_by(m.stage)
+    )
+    return [dict(row._mapping) for row in result.all()]
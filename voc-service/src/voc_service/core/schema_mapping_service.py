@@ -12,6 +12,7 @@ from prism_shared.exceptions import AppException
 from voc_service.core.llm_client import LLMClient
 from voc_service.core.llm_response import extract_json_from_llm_response
 from voc_service.core.prompt_builder import PromptBuilder
+from voc_service.core.token_budget import output_budget
 from voc_service.models.schema_mapping import SchemaMapping
 
 logger = structlog.get_logger(__name__)
@@ -80,7 +81,7 @@ async def find_or_create_mapping(
         slot="reasoning",
         messages=messages,
         temperature=0.3,
-        max_tokens=4096,
+        max_tokens=output_budget(len(columns) * 120 + 500, floor=1024),
         api_key=api_key,
     )
 
@@ -7,6 +7,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from voc_service.core.config import VocServiceSettings
+from voc_service.core.embedding_cache import EmbeddingCache
 from voc_service.core.llm_client import LLMClient
 
 logger = structlog.get_logger(__name__)
@@ -32,18 +33,22 @@ async def vector_search(
     top_k: int = 20,
     min_confidence: float = 0.0,
     rerank: bool = False,
+    embedding_cache: EmbeddingCache | None = None,
 ) -> dict:
     """语义向量搜索。
 
     流程：
-    1. query → embedding（调用 llm_client.embedding）
+    1. query → embedding（优先命中 embedding_cache，未命中时调用 llm_client.embedding）
     2. pgvector ANN（cosine 距离）+ confidence 过滤
     3. 可选 rerank 重排序
     4. 补充标签信息
     5. confidence_tier 三档计算（基于语义单元拆解置信度）
     """
     # 1. 查询向量化
-    vectors = await llm_client.embedding(texts=[query])
+    if embedding_cache is not None:
+        vectors = await embedding_cache.embed(llm_client, [query], db=db)
+    else:
+        vectors = await llm_client.embedding(texts=[query])
     query_vector = vectors[0]
 
     # 2. pgvector ANN 搜索
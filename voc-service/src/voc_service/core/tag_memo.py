@@ -0,0 +1,86 @@
+"""标签标准化记忆：raw_name → normalized_name。
+
+两级存储：进程内字典 + Postgres 持久层（voc.tag_normalizations）。
+Stage 2 先查记忆，仅把从未标准化过的原始标签名发送给 fast 槽位。
+"""
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from voc_service.core.config import VocServiceSettings
+from voc_service.models.tag_normalization import TagNormalization
+
+logger = structlog.get_logger(__name__)
+
+
+class TagNormalizationMemo:
+    """标签标准化记忆（进程内字典 + 持久层）。
+
+    实例按应用生命周期共享；持久层读写在 SAVEPOINT 中执行，失败只回滚该 SAVEPOINT 并记日志、
+    按未命中处理，不会中止调用方的事务。
+    """
+
+    def __init__(self, *, max_entries: int = 50_000) -> None:
+        self._max_entries = max_entries
+        self._memory: dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls, settings: VocServiceSettings) -> "TagNormalizationMemo":
+        """按服务配置创建记忆实例。"""
+        return cls(max_entries=settings.tag_memo_max_entries)
+
+    async def lookup(self, db: AsyncSession | None, raw_names: list[str]) -> dict[str, str]:
+        """批量查询记忆，返回 {raw_name: normalized_name}，仅包含命中项。"""
+        found = {name: self._memory[name] for name in raw_names if name in self._memory}
+        pending = [name for name in raw_names if name not in found]
+
+        if pending and db is not None:
+            try:
+                async with db.begin_nested():
+                    result = await db.execute(
+                        select(TagNormalization.raw_name, TagNormalization.normalized_name).where(
+                            TagNormalization.raw_name.in_(pending)
+                        )
+                    )
+                for raw_name, normalized_name in result.all():
+                    self._remember(raw_name, normalized_name)
+                    found[raw_name] = normalized_name
+            except Exception:
+                logger.warning("标签标准化记忆查询失败，按未命中处理", exc_info=True)
+
+        self.hits += len(found)
+        self.misses += len(raw_names) - len(found)
+        return found
+
+    async def store(self, db: AsyncSession | None, mapping: dict[str, str]) -> None:
+        """写入记忆（持久层已存在则保留先写入者，保证多 worker 结果一致）。"""
+        mapping = {raw: name for raw, name in mapping.items() if raw and name and len(raw) <= 200 and len(name) <= 200}
+        if not mapping:
+            return
+
+        for raw_name, normalized_name in mapping.items():
+            self._remember(raw_name, normalized_name)
+
+        if db is None:
+            return
+
+        try:
+            async with db.begin_nested():
+                await db.execute(
+                    pg_insert(TagNormalization)
+                    .values([{"raw_name": raw, "normalized_name": name} for raw, name in mapping.items()])
+                    .on_conflict_do_nothing(index_elements=["raw_name"])
+                )
+        except Exception:
+            logger.warning("标签标准化记忆写入失败", count=len(mapping), exc_info=True)
+
+    def _remember(self, raw_name: str, normalized_name: str) -> None:
+        """写入进程内字典，超过容量时淘汰最早写入的条目。"""
+        self._memory.pop(raw_name, None)
+        self._memory[raw_name] = normalized_name
+        while len(self._memory) > self._max_entries:
+            self._memory.pop(next(iter(self._memory)))
@@ -0,0 +1,128 @@
+"""标签词表向量索引。
+
+标签名称向量存放在 voc.emergent_tags.name_embedding（pgvector HNSW，cosine）。
+标准化时对每个新的原始名称检索 k 个最近邻已有标签：
+- 最高相似度 ≥ auto_merge_threshold：直接合并，不调用 LLM
+- 其余：仅将这些候选作为合并参考发送给 fast 槽位
+
+Prompt 规模与词表大小无关，词表增长到数万标签时合并质量保持稳定。
+名称向量复用 EmbeddingCache，同名标签 / 原始名称不会重复向量化。
+
+迁移 007 之前创建的标签没有名称向量，由 backfill 按使用量降序分批补写（管线每次运行补写一批）；
+回填完成前检索不到近邻时，调用方退回按使用量选取合并参考。
+"""
+
+import structlog
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from voc_service.core.config import VocServiceSettings
+from voc_service.core.embedding_cache import EmbeddingCache
+from voc_service.core.llm_client import LLMClient
+from voc_service.models.emergent_tag import EmergentTag
+
+logger = structlog.get_logger(__name__)
+
+
+class TagVocabularyIndex:
+    """标签词表最近邻索引（pgvector HNSW）。
+
+    实例按应用生命周期共享；向量化或检索失败只记日志，由调用方退回原有流程。
+    """
+
+    def __init__(
+        self,
+        *,
+        cache: EmbeddingCache,
+        top_k: int = 5,
+        auto_merge_threshold: float = 0.92,
+    ) -> None:
+        self._cache = cache
+        self._top_k = top_k
+        self._auto_merge_threshold = auto_merge_threshold
+
+    @classmethod
+    def from_settings(cls, settings: VocServiceSettings, *, cache: EmbeddingCache) -> "TagVocabularyIndex":
+        """按服务配置创建索引实例。"""
+        return cls(
+            cache=cache,
+            top_k=settings.tag_vocab_top_k,
+            auto_merge_threshold=settings.tag_vocab_auto_merge_threshold,
+        )
+
+    async def nearest(
+        self,
+        db: AsyncSession,
+        llm_client: LLMClient,
+        raw_names: list[str],
+    ) -> dict[str, list[tuple[str, float]]]:
+        """检索每个原始名称的 k 个最近邻已有标签。
+
+        Returns:
+            {raw_name: [(tag_name, cosine_similarity), ...]}，按相似度降序
+        """
+        vectors = await self._cache.embed(llm_client, raw_names, db=db)
+
+        distance = EmergentTag.name_embedding.cosine_distance
+        neighbours: dict[str, list[tuple[str, float]]] = {}
+        for raw_name, vector in zip(raw_names, vectors, strict=True):
+            result = await db.execute(
+                select(EmergentTag.name, distance(vector).label("distance"))
+                .where(
+                    EmergentTag.status == "active",
+                    EmergentTag.name_embedding.is_not(None),
+                )
+                .order_by(distance(vector))
+                .limit(self._top_k)
+            )
+            neighbours[raw_name] = [(name, 1.0 - float(d)) for name, d in result.all()]
+        return neighbours
+
+    def auto_merge_target(self, candidates: list[tuple[str, float]]) -> str | None:
+        """最近邻相似度达到自动合并阈值时返回合并目标，否则返回 None。"""
+        if candidates and candidates[0][1] >= self._auto_merge_threshold:
+            return candidates[0][0]
+        return None
+
+    async def index_tags(self, db: AsyncSession, llm_client: LLMClient, tags: list[EmergentTag]) -> int:
+        """为尚无名称向量的标签补写 name_embedding，返回写入数量。"""
+        if not tags:
+            return 0
+
+        result = await db.execute(
+            select(EmergentTag.id, EmergentTag.name).where(
+                EmergentTag.id.in_([t.id for t in tags]),
+                EmergentTag.name_embedding.is_(None),
+            )
+        )
+        return await self._write_embeddings(db, llm_client, result.all())
+
+    async def backfill(self, db: AsyncSession, llm_client: LLMClient, *, limit: int) -> int:
+        """为存量 active 标签补写 name_embedding：按使用量降序，每次最多 limit 个，返回写入数量。"""
+        result = await db.execute(
+            select(EmergentTag.id, EmergentTag.name)
+            .where(
+                EmergentTag.status == "active",
+                EmergentTag.name_embedding.is_(None),
+            )
+            .order_by(EmergentTag.usage_count.desc())
+            .limit(limit)
+        )
+        return await self._write_embeddings(db, llm_client, result.all())
+
+    async def _write_embeddings(self, db: AsyncSession, llm_client: LLMClient, pending: list) -> int:
+        """向量化 [(tag_id, name), ...] 并写入 name_embedding。"""
+        if not pending:
+            return 0
+
+        try:
+            vectors = await self._cache.embed(llm_client, [name for _, name in pending], db=db)
+        except Exception:
+            logger.warning("标签名称向量化失败，跳过词表索引", count=len(pending), exc_info=True)
+            return 0
+
+        await db.execute(
+            update(EmergentTag),
+            [{"id": tag_id, "name_embedding": vector} for (tag_id, _), vector in zip(pending, vectors, strict=True)],
+        )
+        return len(pending)
@@ -0,0 +1,102 @@
+"""Prompt token 预算。
+
+本地计数 Prompt token，用于：
+1. 截断 / 切分超长输入（raw_text、df_describe 等），避免触发 provider 上下文上限
+2. 按预期输出规模设置 max_tokens，避免统一给 4096 / 8192 造成过度分配
+
+安装了 tiktoken 时使用 cl100k_base 编码精确计数；否则按字符类别估算
+（CJK 字符约 1 token / 字，其他字符约 4 字符 / token），估算值偏保守。
+"""
+
+import importlib
+import re
+from functools import lru_cache
+
+TRUNCATION_MARKER = "\n…（内容过长，已截断）"
+
+# 单条 message 的角色 / 分隔符开销
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+_CJK_RE = re.compile(r"[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uff00-\uffef]")
+# 切分优先落在句末标点或换行之后
+_SENTENCE_END_RE = re.compile(r"(?<=[。！？!?；;\n])")
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """加载 tiktoken 编码器（未安装时返回 None）。"""
+    try:
+        tiktoken = importlib.import_module("tiktoken")
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """计算文本 token 数。"""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def count_message_tokens(messages: list[dict]) -> int:
+    """计算消息列表的 Prompt token 数（含每条消息的固定开销）。"""
+    return sum(count_tokens(m.get("content") or "") + _MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """截断到不超过 max_tokens（含截断标记），未超出时原样返回。"""
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    budget = max(max_tokens - count_tokens(TRUNCATION_MARKER), 0)
+    encoding = _encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:budget]) + TRUNCATION_MARKER
+
+    # 估算模式：二分查找满足预算的最长前缀
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(text[:mid]) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo] + TRUNCATION_MARKER
+
+
+def split_to_tokens(text: str, max_tokens: int) -> list[str]:
+    """按句子边界切分为若干段，每段不超过 max_tokens；单句超长时硬截断为多段。"""
+    if count_tokens(text) <= max_tokens:
+        return [text]
+
+    chunks: list[str] = []
+    current = ""
+    for sentence in _SENTENCE_END_RE.split(text):
+        if not sentence:
+            continue
+        if count_tokens(current + sentence) <= max_tokens:
+            current += sentence
+            continue
+        if current:
+            chunks.append(current)
+        while count_tokens(sentence) > max_tokens:
+            head = truncate_to_tokens(sentence, max_tokens + count_tokens(TRUNCATION_MARKER))
+            head = head.removesuffix(TRUNCATION_MARKER)
+            if not head:
+                break
+            chunks.append(head)
+            sentence = sentence[len(head) :]
+        current = sentence
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+def output_budget(expected_tokens: int, *, floor: int = 256, ceiling: int = 4096) -> int:
+    """按预期输出规模确定 max_tokens（限制在 [floor, ceiling] 区间内）。"""
+    return max(floor, min(ceiling, expected_tokens))
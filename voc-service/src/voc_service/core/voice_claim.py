@@ -0,0 +1,100 @@
+"""管线认领：优先级通道 + 批次间公平轮转。
+
+按 created_at 全局认领时，先导入的 20 万行回填批次会饿死之后上传的小批次。认领改为：
+1. 每个有待处理 Voice 的批次（及无批次的 Voice）各取最早的 limit 条作为候选
+2. 候选按批次内序号 rn 轮转：第 rn 轮的排序键为 rn × 2^priority，
+   即 urgent 每轮取 1 条时 normal 每 2 轮、backfill 每 4 轮取 1 条，
+   小批次很快处理完，回填批次仍持续推进
+3. 对排序后的前 limit 条加 FOR UPDATE SKIP LOCKED（并重新校验 eligible）；
+   被其他 worker 锁定的行跳过后，排除本轮见过的候选再补取，
+   直到认领满 limit 条或没有剩余候选——并发 worker 各自拿到不同的 N 条，而不是争抢同一批前 N 条
+
+指定 batch_id 时只有一个通道，直接按 created_at 认领。
+"""
+
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, and_, exists, func, select, true, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from voc_service.models.ingestion_batch import IngestionBatch
+from voc_service.models.voice import Voice
+
+
+async def claim_voices(
+    db: AsyncSession,
+    *,
+    eligible: ColumnElement[bool],
+    limit: int,
+    batch_id: UUID | None = None,
+) -> list[Voice]:
+    """认领至多 limit 条满足 eligible 的 Voice（行锁随调用方事务释放）。"""
+    if batch_id is not None:
+        result = await db.execute(
+            select(Voice)
+            .where(Voice.batch_id == batch_id, eligible)
+            .order_by(Voice.created_at)
+            .with_for_update(skip_locked=True)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    claimed: list[Voice] = []
+    seen: set[UUID] = set()
+    while len(claimed) < limit:
+        candidate_ids = await _pick_candidates(db, eligible=eligible, limit=limit - len(claimed), exclude=seen)
+        if not candidate_ids:
+            break
+        seen.update(candidate_ids)
+        claimed.extend(await _lock_candidates(db, candidate_ids, eligible=eligible))
+    return claimed
+
+
+async def _pick_candidates(
+    db: AsyncSession, *, eligible: ColumnElement[bool], limit: int, exclude: set[UUID]
+) -> list[UUID]:
+    """按优先级通道 + 批次轮转选出前 limit 条候选 ID（不加锁，跳过 exclude 中已见过的行）。"""
+    if exclude:
+        eligible = and_(eligible, Voice.id.not_in(exclude))
+    columns = (Voice.id, Voice.batch_id, Voice.priority, Voice.created_at)
+
+    # 有待处理 Voice 的批次 → 各取最早的 limit 条（LATERAL 走 idx_voices_batch_status）
+    lanes = (
+        select(IngestionBatch.id).where(exists().where(Voice.batch_id == IngestionBatch.id, eligible)).subquery("lanes")
+    )
+    per_batch = (
+        select(*columns)
+        .where(Voice.batch_id == lanes.c.id, eligible)
+        .order_by(Voice.created_at)
+        .limit(limit)
+        .lateral("per_batch")
+    )
+    batched = select(per_batch).select_from(lanes.join(per_batch, true()))
+    unbatched = (
+        select(*columns)
+        .where(Voice.batch_id.is_(None), eligible)
+        .order_by(Voice.priority, Voice.created_at)
+        .limit(limit)
+        .subquery("unbatched")
+    )
+    candidates = union_all(batched, select(unbatched)).subquery("candidates")
+
+    rn = func.row_number().over(partition_by=candidates.c.batch_id, order_by=candidates.c.created_at)
+    ranked = select(
+        candidates.c.id,
+        candidates.c.created_at,
+        (rn * func.power(2, candidates.c.priority)).label("turn"),
+    ).subquery("ranked")
+    result = await db.execute(select(ranked.c.id).order_by(ranked.c.turn, ranked.c.created_at).limit(limit))
+    return list(result.scalars().all())
+
+
+async def _lock_candidates(
+    db: AsyncSession, candidate_ids: list[UUID], *, eligible: ColumnElement[bool]
+) -> list[Voice]:
+    """锁定候选中未被其他 worker 锁定、且仍满足 eligible 的行，保持候选顺序。"""
+    result = await db.execute(
+        select(Voice).where(Voice.id.in_(candidate_ids), eligible).with_for_update(skip_locked=True)
+    )
+    order = {voice_id: i for i, voice_id in enumerate(candidate_ids)}
+    return sorted(result.scalars().all(), key=lambda voice: order[voice.id])
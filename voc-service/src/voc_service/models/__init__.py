@@ -1,5 +1,6 @@
 """SQLAlchemy ORM 模型。"""
 
+from voc_service.models.embedding_cache import EmbeddingCacheEntry
 from voc_service.models.emergent_tag import EmergentTag
 from voc_service.models.enums import (
     BatchStatus,
@@ -11,20 +12,28 @@ from voc_service.models.enums import (
     SourceFormat,
     TagStatus,
 )
+from voc_service.models.guard_audit import GuardAudit
 from voc_service.models.ingestion_batch import IngestionBatch
+from voc_service.models.pipeline_run import PipelineRun, PipelineStageMetric
 from voc_service.models.schema_mapping import SchemaMapping
 from voc_service.models.semantic_unit import SemanticUnit
 from voc_service.models.tag_feedback import TagFeedback
+from voc_service.models.tag_normalization import TagNormalization
 from voc_service.models.unit_tag_association import UnitTagAssociation
 from voc_service.models.voice import Voice
 
 __all__ = [
     # 模型
+    "EmbeddingCacheEntry",
     "EmergentTag",
+    "GuardAudit",
     "IngestionBatch",
+    "PipelineRun",
+    "PipelineStageMetric",
     "SchemaMapping",
     "SemanticUnit",
     "TagFeedback",
+    "TagNormalization",
     "UnitTagAssociation",
     "Voice",
     # 枚举
@@ -0,0 +1,26 @@
+"""EmbeddingCacheEntry ORM 模型。"""
+
+from datetime import datetime
+
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from prism_shared.db.base import Base
+
+
+class EmbeddingCacheEntry(Base):
+    """内容寻址 embedding 缓存（持久层）。
+
+    组合主键 (text_hash, model_id, dimensions)，不使用 UUIDMixin。
+    同一文本在同一模型、同一维度下只向量化一次，Stage 3 与语义搜索共享。
+    """
+
+    __tablename__ = "embedding_cache"
+    __table_args__ = ({"schema": "voc"},)
+
+    text_hash: Mapped[str] = mapped_column(String(64), primary_key=True, comment="SHA-256(text)")
+    model_id: Mapped[str] = mapped_column(String(200), primary_key=True, comment="embedding 模型标识")
+    dimensions: Mapped[int] = mapped_column(Integer, primary_key=True, comment="向量维度，0 表示模型默认维度")
+    embedding = mapped_column(Vector(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
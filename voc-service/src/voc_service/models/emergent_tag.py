@@ -2,6 +2,7 @@
 
 import uuid
 
+from pgvector.sqlalchemy import Vector
 from sqlalchemy import Float, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -15,6 +16,7 @@ class EmergentTag(Base, UUIDMixin, TimestampMixin):
     由 AI 管线 Stage 2 从语义单元中自动发现和标准化，
     通过 usage_count 反映涌现强度。
     支持 parent_tag_id 自引用实现标签合并。
+    name_embedding 为标签名称向量，供标准化时检索最近邻合并候选。
     """
 
     __tablename__ = "emergent_tags"
@@ -45,6 +47,7 @@ class EmergentTag(Base, UUIDMixin, TimestampMixin):
         nullable=True,
         comment="合并到的父标签",
     )
+    name_embedding = mapped_column(Vector(1024), nullable=True, deferred=True)
 
     # 关联
     parent_tag = relationship("EmergentTag", remote_side="EmergentTag.id", lazy="selectin")
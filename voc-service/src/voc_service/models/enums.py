@@ -1,6 +1,6 @@
 """VOC 服务枚举类型定义。"""
 
-from enum import StrEnum
+from enum import IntEnum, StrEnum
 
 
 class IngestionSource(StrEnum):
@@ -27,6 +27,14 @@ class BatchStatus(StrEnum):
     FAILED = "failed"
 
 
+class BatchPriority(IntEnum):
+    """批次处理优先级（数值越小越优先）。"""
+
+    URGENT = 0
+    NORMAL = 1
+    BACKFILL = 2
+
+
 class ProcessedStatus(StrEnum):
     """Voice 处理状态。"""
 
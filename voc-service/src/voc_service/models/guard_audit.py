@@ -0,0 +1,33 @@
+"""GuardAudit ORM 模型。"""
+
+import uuid
+
+from sqlalchemy import Boolean, Float, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from prism_shared.db.base import Base, TimestampMixin, UUIDMixin
+
+
+class GuardAudit(Base, UUIDMixin, TimestampMixin):
+    """L2 语义一致性校验审计记录。
+
+    L2 校验为建议性结果，不阻塞管线；后台执行时结果写入本表供离线审查。
+    """
+
+    __tablename__ = "guard_audits"
+    __table_args__ = (
+        Index("idx_guard_audits_voice", "voice_id"),
+        Index("idx_guard_audits_consistent", "consistent"),
+        {"schema": "voc"},
+    )
+
+    voice_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("voc.voices.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    stage: Mapped[str] = mapped_column(String(20), nullable=False, server_default="stage1")
+    consistent: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    confidence: Mapped[float | None] = mapped_column(Float, nullable=True)
+    issues: Mapped[list | None] = mapped_column(JSONB, nullable=True, comment="L2 返回的问题列表")
@@ -0,0 +1,65 @@
+"""PipelineRun / PipelineStageMetric ORM 模型。"""
+
+import uuid
+
+from sqlalchemy import Boolean, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from prism_shared.db.base import Base, TimestampMixin, UUIDMixin
+
+
+class PipelineRun(Base, UUIDMixin, TimestampMixin):
+    """管线运行记录：一次 process_pending_voices 调用。"""
+
+    __tablename__ = "pipeline_runs"
+    __table_args__ = (
+        Index("idx_pipeline_runs_created", "created_at"),
+        {"schema": "voc"},
+    )
+
+    batch_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("voc.ingestion_batches.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    processed: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    failed: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    skipped: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    wall_ms: Mapped[float] = mapped_column(Float, nullable=False, comment="整轮耗时（毫秒）")
+
+
+class PipelineStageMetric(Base, UUIDMixin, TimestampMixin):
+    """单条 Voice 单个阶段的耗时与 token 记录。
+
+    llm_ms 取 llm-service 返回的 routing.failover_trace 中各次尝试的 provider 耗时之和，
+    db_ms 为该阶段内 SQL 执行耗时之和。
+    """
+
+    __tablename__ = "pipeline_stage_metrics"
+    __table_args__ = (
+        Index("idx_stage_metrics_run", "run_id"),
+        Index("idx_stage_metrics_stage_created", "stage", "created_at"),
+        {"schema": "voc"},
+    )
+
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("voc.pipeline_runs.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    voice_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("voc.voices.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    stage: Mapped[str] = mapped_column(String(30), nullable=False, comment="fast_path/stage1/stage2/stage3")
+    wall_ms: Mapped[float] = mapped_column(Float, nullable=False)
+    llm_ms: Mapped[float] = mapped_column(Float, default=0, server_default="0")
+    db_ms: Mapped[float] = mapped_column(Float, default=0, server_default="0")
+    llm_calls: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    llm_cache_hits: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    prompt_tokens: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    completion_tokens: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    level: Mapped[str | None] = mapped_column(String(30), nullable=True, comment="Stage 1 最终使用的降级级别")
+    succeeded: Mapped[bool] = mapped_column(Boolean, default=True, server_default="true")
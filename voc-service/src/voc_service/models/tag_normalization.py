@@ -0,0 +1,23 @@
+"""TagNormalization ORM 模型。"""
+
+from sqlalchemy import Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from prism_shared.db.base import Base, TimestampMixin
+
+
+class TagNormalization(Base, TimestampMixin):
+    """标签标准化记忆表。
+
+    持久化 LLM 标准化结果 raw_name → normalized_name，以 raw_name 为主键，不使用 UUIDMixin。
+    Stage 2 只把从未见过的原始标签名发送给 fast 槽位。
+    """
+
+    __tablename__ = "tag_normalizations"
+    __table_args__ = (
+        Index("idx_tag_norm_normalized", "normalized_name"),
+        {"schema": "voc"},
+    )
+
+    raw_name: Mapped[str] = mapped_column(String(200), primary_key=True, comment="LLM 原始输出")
+    normalized_name: Mapped[str] = mapped_column(String(200), nullable=False, comment="标准化后的名称")
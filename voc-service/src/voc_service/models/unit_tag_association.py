@@ -39,6 +39,6 @@ class UnitTagAssociation(Base):
         String(30),
         nullable=False,
         server_default="llm_emergent",
-        comment="标签来源：llm_emergent/human_annotation/human_correction",
+        comment="标签来源：llm_emergent/fast_path_reuse/human_annotation/human_correction",
     )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
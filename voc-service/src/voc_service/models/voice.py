@@ -1,8 +1,9 @@
 """Voice ORM 模型。"""
 
 import uuid
+from datetime import datetime
 
-from sqlalchemy import ForeignKey, Index, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, SmallInteger, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -19,10 +20,17 @@ class Voice(Base, UUIDMixin, TimestampMixin):
 
     __tablename__ = "voices"
     __table_args__ = (
-        # 复合索引：覆盖按批次查状态的高频查询，替代单列 batch_id 索引
-        Index("idx_voices_batch_status", "batch_id", "processed_status"),
+        # 复合索引：覆盖按批次查状态的高频查询与按批次认领（按 created_at 取前 N 条）
+        Index("idx_voices_batch_status", "batch_id", "processed_status", "created_at"),
         Index("idx_voices_status", "processed_status"),
+        # 优先级通道认领
+        Index("idx_voices_claim", "processed_status", "priority", "created_at"),
         Index("idx_voices_created", "created_at", postgresql_using="btree"),
+        Index(
+            "idx_voices_retry_due",
+            "next_attempt_at",
+            postgresql_where=text("processed_status = 'failed' AND next_attempt_at IS NOT NULL"),
+        ),
         {"schema": "voc"},
     )
 
@@ -51,6 +59,18 @@ class Voice(Base, UUIDMixin, TimestampMixin):
     )
     processing_error: Mapped[str | None] = mapped_column(Text, nullable=True)
     retry_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    priority: Mapped[int] = mapped_column(
+        SmallInteger,
+        nullable=False,
+        default=1,
+        server_default="1",
+        comment="处理优先级（来自所属批次），数值越小越优先",
+    )
+    next_attempt_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="失败后的下次自动重试时间（超过重试上限时为空）",
+    )
     # Python 属性名用 metadata_ 避免与 SQLAlchemy Base.metadata 冲突
     metadata_: Mapped[dict] = mapped_column("metadata", JSONB, default=dict, server_default="{}")
 
@@ -1,7 +1,11 @@
 """管线校验层：L1 格式校验 + L2 语义一致性校验。"""
 
+import time
+from dataclasses import dataclass
+
 import jsonschema
 import structlog
+from jsonschema.protocols import Validator
 
 from voc_service.core.llm_client import LLMClient
 from voc_service.core.llm_response import extract_json_from_llm_response
@@ -78,15 +82,83 @@ class L1ValidationError(Exception):
         self.errors = errors or []
 
 
+@dataclass
+class ValidatorStats:
+    """单个 schema 的 L1 校验计数。"""
+
+    calls: int = 0
+    failures: int = 0
+    total_ns: int = 0
+
+    def as_dict(self) -> dict:
+        """序列化为 {calls, failures, avg_us}。"""
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "avg_us": round(self.total_ns / self.calls / 1000, 1) if self.calls else 0.0,
+        }
+
+
+class SchemaValidatorRegistry:
+    """预编译 L1 校验器。
+
+    每个 schema 只做一次 check_schema + 构建校验器，之后复用；
+    按 schema 对象身份查找，未注册的 schema 首次使用时编译并缓存。
+    缓存项持有 schema 的强引用并在复用前校验身份：schema 不会被回收，其 id 也不会被其他对象复用。
+    """
+
+    def __init__(self) -> None:
+        self._validators: dict[int, tuple[dict, str, Validator]] = {}
+        self._stats: dict[str, ValidatorStats] = {}
+
+    def register(self, name: str, schema: dict) -> None:
+        """编译并注册 schema（schema 本身非法时在注册时即抛出）。"""
+        validator_cls = jsonschema.validators.validator_for(schema, default=jsonschema.Draft202012Validator)
+        validator_cls.check_schema(schema)
+        self._validators[id(schema)] = (schema, name, validator_cls(schema))
+        self._stats.setdefault(name, ValidatorStats())
+
+    def validate(self, data: dict, schema: dict) -> list[jsonschema.ValidationError]:
+        """一次遍历收集全部错误，按出错位置排序返回。"""
+        entry = self._validators.get(id(schema))
+        if entry is None or entry[0] is not schema:
+            self.register(f"schema-{id(schema):x}", schema)
+            entry = self._validators[id(schema)]
+        _, name, validator = entry
+
+        start = time.perf_counter_ns()
+        errors = sorted(validator.iter_errors(data), key=lambda e: list(e.absolute_path))
+        stats = self._stats[name]
+        stats.total_ns += time.perf_counter_ns() - start
+        stats.calls += 1
+        if errors:
+            stats.failures += 1
+        return errors
+
+    def stats(self) -> dict[str, dict]:
+        """返回各 schema 的调用次数、失败次数与平均耗时（微秒）。"""
+        return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+
+l1_validators = SchemaValidatorRegistry()
+l1_validators.register("stage1", STAGE1_SCHEMA)
+l1_validators.register("stage2", STAGE2_SCHEMA)
+
+
+def _format_error(error: jsonschema.ValidationError) -> str:
+    """错误信息附带 JSON 路径，便于定位到具体 unit / tag。"""
+    path = "/".join(str(p) for p in error.absolute_path)
+    return f"{path}: {error.message}" if path else error.message
+
+
 def validate_l1(data: dict, schema: dict) -> None:
-    """L1 格式校验，失败抛出 L1ValidationError。"""
-    try:
-        jsonschema.validate(instance=data, schema=schema)
-    except jsonschema.ValidationError as e:
+    """L1 格式校验（复用预编译校验器），失败抛出 L1ValidationError，errors 包含全部错误。"""
+    errors = l1_validators.validate(data, schema)
+    if errors:
         raise L1ValidationError(
-            message=f"L1 校验失败：{e.message}",
-            errors=[e.message],
-        ) from e
+            message=f"L1 校验失败：{errors[0].message}",
+            errors=[_format_error(e) for e in errors],
+        )
 
 
 async def validate_l2(
@@ -101,6 +173,21 @@ async def validate_l2(
     返回 {"consistent": bool, "confidence": float, "issues": [...]}
     非阻塞：失败只记日志不中断管线。
     """
+    try:
+        return await check_l2(llm_client, raw_text, units, temperature=temperature)
+    except Exception:
+        logger.warning("L2 校验失败，跳过", exc_info=True)
+        return {"consistent": True, "confidence": 0.0, "issues": []}
+
+
+async def check_l2(
+    llm_client: LLMClient,
+    raw_text: str,
+    units: list[dict],
+    *,
+    temperature: float = 0.2,
+) -> dict:
+    """同 validate_l2，但调用失败或响应缺少 consistent 判定时抛出异常（供需要区分失败的调用方使用）。"""
     messages = build_guard_l2_messages(raw_text, units)
     try:
         response = await llm_client.invoke_slot(
@@ -110,13 +197,16 @@ async def validate_l2(
             max_tokens=1024,
         )
         result = extract_json_from_llm_response(response)
-        logger.info(
-            "L2 校验完成",
-            consistent=result.get("consistent"),
-            confidence=result.get("confidence"),
-            issues_count=len(result.get("issues", [])),
-        )
-        return result
+        if not isinstance(result.get("consistent"), bool):
+            raise ValueError("L2 响应缺少 consistent 判定")
     except Exception:
-        logger.warning("L2 校验失败，跳过", exc_info=True)
-        return {"consistent": True, "confidence": 0.0, "issues": []}
+        llm_client.forget(slot="fast", messages=messages, temperature=temperature, max_tokens=1024)
+        raise
+
+    logger.info(
+        "L2 校验完成",
+        consistent=result.get("consistent"),
+        confidence=result.get("confidence"),
+        issues_count=len(result.get("issues", [])),
+    )
+    return result
@@ -0,0 +1,186 @@
+"""短文本快速路径 — 跳过 Stage 1 / Stage 2 的 LLM 调用。
+
+"好评"、"不错" 这类极短 Voice 无需拆解：直接生成单个 SemanticUnit，
+意图 / 情感 / 标签复用已标注的相同或近似文本（不调用生成槽位）：
+1. 精确匹配：相同文本的已标注语义单元（短文本部分索引）
+2. 近似匹配：文本向量在 HNSW 索引中的最近邻，相似度 ≥ 阈值
+
+均未命中时返回 None，由调用方走完整管线。同一轮内相同文本的命中结果复用。
+"""
+
+import uuid
+from dataclasses import dataclass
+
+import structlog
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from voc_service.core.config import VocServiceSettings
+from voc_service.core.embedding_cache import EmbeddingCache
+from voc_service.core.llm_client import LLMClient
+from voc_service.models.emergent_tag import EmergentTag
+from voc_service.models.semantic_unit import SemanticUnit
+from voc_service.models.unit_tag_association import UnitTagAssociation
+from voc_service.models.voice import Voice
+
+logger = structlog.get_logger(__name__)
+
+# 与迁移 009 中部分索引 idx_units_short_text 的谓词保持一致
+SHORT_TEXT_INDEX_MAX_CHARS = 32
+
+
+@dataclass
+class LabelledMatch:
+    """可复用的已标注语义单元。"""
+
+    unit_id: uuid.UUID
+    intent: str | None
+    sentiment: str | None
+    confidence: float | None
+    similarity: float
+    tags: list[tuple[uuid.UUID, float, bool]]  # (tag_id, relevance, is_primary)
+
+
+class ShortTextFastPath:
+    """短文本快速路径：Voice → 单个 SemanticUnit（复用已有标注）。"""
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        db: AsyncSession,
+        settings: VocServiceSettings,
+        *,
+        embedding_cache: EmbeddingCache | None = None,
+    ) -> None:
+        self._llm = llm_client
+        self._db = db
+        self._enabled = settings.short_text_fast_path_enabled
+        self._max_chars = min(settings.short_text_max_chars, SHORT_TEXT_INDEX_MAX_CHARS)
+        self._similarity_threshold = settings.short_text_similarity_threshold
+        self._embedding_cache = embedding_cache
+        self._matches: dict[str, LabelledMatch] = {}
+
+    def applies(self, voice: Voice) -> bool:
+        """是否满足快速路径的长度条件。"""
+        return self._enabled and 0 < len(voice.raw_text.strip()) <= self._max_chars
+
+    async def build(self, voice: Voice) -> list[SemanticUnit] | None:
+        """复用已有标注生成语义单元与标签关联，未找到可复用标注时返回 None。"""
+        text = voice.raw_text.strip()
+        match = self._matches.get(text)
+        if match is None:
+            match = await self._find_match(text)
+            if match is None:
+                return None
+            self._matches[text] = match
+
+        unit = SemanticUnit(
+            voice_id=voice.id,
+            text=voice.raw_text,
+            summary=voice.raw_text[:200],
+            intent=match.intent,
+            sentiment=match.sentiment,
+            confidence=match.confidence,
+            sequence_index=0,
+        )
+        self._db.add(unit)
+        await self._db.flush()
+
+        if match.tags:
+            await self._db.execute(
+                pg_insert(UnitTagAssociation)
+                .values(
+                    [
+                        {
+                            "unit_id": unit.id,
+                            "tag_id": tag_id,
+                            "relevance": relevance,
+                            "is_primary": is_primary,
+                            "source": "fast_path_reuse",
+                        }
+                        for tag_id, relevance, is_primary in match.tags
+                    ]
+                )
+                .on_conflict_do_nothing()
+            )
+            await self._db.execute(
+                update(EmergentTag)
+                .where(EmergentTag.id.in_([tag_id for tag_id, _, _ in match.tags]))
+                .values(usage_count=EmergentTag.usage_count + 1)
+            )
+
+        logger.info(
+            "短文本快速路径命中",
+            voice_id=str(voice.id),
+            reused_unit_id=str(match.unit_id),
+            similarity=round(match.similarity, 4),
+            tags=len(match.tags),
+        )
+        return [unit]
+
+    async def _find_match(self, text: str) -> LabelledMatch | None:
+        """先精确匹配，再按向量近似匹配。"""
+        columns = (SemanticUnit.id, SemanticUnit.intent, SemanticUnit.sentiment, SemanticUnit.confidence)
+        labelled = (
+            SemanticUnit.confidence > 0,
+            SemanticUnit.intent != "unclassified",
+        )
+
+        result = await self._db.execute(
+            select(*columns)
+            .where(
+                func.char_length(SemanticUnit.text) <= SHORT_TEXT_INDEX_MAX_CHARS,
+                SemanticUnit.text == text,
+                *labelled,
+            )
+            .order_by(SemanticUnit.created_at.desc())
+            .limit(1)
+        )
+        row = result.first()
+        if row is not None:
+            return await self._to_match(row, similarity=1.0)
+
+        try:
+            if self._embedding_cache is not None:
+                # 缓存读写与 LLM 调用在 SAVEPOINT 中执行，失败不会中止当前事务
+                async with self._db.begin_nested():
+                    [vector] = await self._embedding_cache.embed(self._llm, [text], db=self._db)
+            else:
+                [vector] = await self._llm.embedding(texts=[text])
+        except Exception:
+            logger.warning("短文本向量化失败，走完整管线", exc_info=True)
+            return None
+
+        distance = SemanticUnit.embedding.cosine_distance(vector)
+        result = await self._db.execute(
+            select(*columns, distance.label("distance"))
+            .where(SemanticUnit.embedding.is_not(None), *labelled)
+            .order_by(distance)
+            .limit(1)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        similarity = 1.0 - float(row.distance)
+        if similarity < self._similarity_threshold:
+            return None
+        return await self._to_match(row, similarity=similarity)
+
+    async def _to_match(self, row, *, similarity: float) -> LabelledMatch:
+        """读取被复用单元的标签关联。"""
+        result = await self._db.execute(
+            select(
+                UnitTagAssociation.tag_id,
+                UnitTagAssociation.relevance,
+                UnitTagAssociation.is_primary,
+            ).where(UnitTagAssociation.unit_id == row.id)
+        )
+        return LabelledMatch(
+            unit_id=row.id,
+            intent=row.intent,
+            sentiment=row.sentiment,
+            confidence=row.confidence,
+            similarity=similarity,
+            tags=[(tag_id, relevance, is_primary) for tag_id, relevance, is_primary in result.all()],
+        )
@@ -1,10 +1,17 @@
 """Stage 1: 语义拆解 — Voice → N × SemanticUnit。"""
 
+import time
+
 import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from voc_service.core.config import VocServiceSettings
+from voc_service.core.degradation_ladder import LEVEL_FALLBACK, LEVEL_NORMAL, LEVEL_SIMPLIFIED, DegradationLadder
+from voc_service.core.guard_scheduler import L2GuardScheduler
 from voc_service.core.llm_client import LLMClient
 from voc_service.core.llm_response import extract_json_from_llm_response
+from voc_service.core.run_ledger import record_level
+from voc_service.core.token_budget import count_tokens, output_budget, split_to_tokens
 from voc_service.models.semantic_unit import SemanticUnit
 from voc_service.models.voice import Voice
 from voc_service.pipeline.guards import (
@@ -20,6 +27,13 @@ from voc_service.prompts.stage1 import (
 
 logger = structlog.get_logger(__name__)
 
+# 输出包含原文切分 + 每个单元的摘要 / 意图 / 情感，约为输入的 2.5 倍
+_OUTPUT_RATIO = 2.5
+_OUTPUT_OVERHEAD_TOKENS = 300
+_OUTPUT_CEILING_TOKENS = 4096
+# 单段输入上限：预期输出不超过 max_tokens 上限，否则长分段的拆解结果会被截断
+MAX_CHUNK_TOKENS = int((_OUTPUT_CEILING_TOKENS - _OUTPUT_OVERHEAD_TOKENS) / _OUTPUT_RATIO)
+
 
 class SemanticSplitter:
     """Stage 1: Voice → N × SemanticUnit。
@@ -28,23 +42,74 @@ class SemanticSplitter:
     1. 正常 Prompt(reasoning, temperature=0.5) + L1 校验
     2. 简化 Prompt(reasoning, temperature=0.3) + L1 校验
     3. 兜底：整条 raw_text → 单个 SemanticUnit(confidence=0, intent=unclassified)
+
+    提供 DegradationLadder 时记录各级别成功率 / 耗时，并据此自适应选择起始级别
+    （短文本或正常 Prompt 近期频繁失败的来源直接从简化 Prompt 开始）。
+    提供 L2GuardScheduler 时由调度器决定 L2 校验是否执行、是否离开关键路径
+    （审计记录随 db 写入或在 db 事务提交后投递）；否则同步等待 L2 校验。
     """
 
-    def __init__(self, llm_client: LLMClient, settings: VocServiceSettings) -> None:
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        settings: VocServiceSettings,
+        *,
+        guard: L2GuardScheduler | None = None,
+        ladder: DegradationLadder | None = None,
+        db: AsyncSession | None = None,
+    ) -> None:
         self._llm = llm_client
         self._settings = settings
+        self._guard = guard
+        self._db = db
+        self._ladder = ladder
 
     async def split(self, voice: Voice) -> list[SemanticUnit]:
-        """对一条 Voice 执行语义拆解，返回 SemanticUnit 列表。"""
-        raw_text = voice.raw_text
+        """对一条 Voice 执行语义拆解，返回 SemanticUnit 列表。
+
+        raw_text 超出 stage1_max_input_tokens（不超过 MAX_CHUNK_TOKENS）时按句子边界切分为多段，
+        逐段拆解后按顺序合并。
+        """
+        max_input_tokens = min(self._settings.stage1_max_input_tokens, MAX_CHUNK_TOKENS)
+        chunks = split_to_tokens(voice.raw_text, max_input_tokens)
+        if len(chunks) > 1:
+            logger.info("Stage 1 输入超出 token 预算，分段拆解", voice_id=str(voice.id), chunks=len(chunks))
+
+        units_data: list[dict] = []
+        for chunk in chunks:
+            units_data.extend(await self._split_text(voice, chunk))
+
+        # 构建 SemanticUnit ORM 对象
+        return [
+            SemanticUnit(
+                voice_id=voice.id,
+                text=u["text"],
+                summary=u.get("summary", ""),
+                intent=u.get("intent"),
+                sentiment=u.get("sentiment"),
+                confidence=u.get("confidence"),
+                sequence_index=idx,
+            )
+            for idx, u in enumerate(units_data)
+        ]
+
+    async def _split_text(self, voice: Voice, raw_text: str) -> list[dict]:
+        """对一段文本执行三级降级拆解，返回语义单元字典列表。"""
+        source = voice.source
+        start_level = self._ladder.start_level(source, raw_text) if self._ladder is not None else LEVEL_NORMAL
 
         # --- Level 1：正常 Prompt ---
-        units_data = await self._try_split(
-            raw_text,
-            build_stage1_messages(raw_text),
-            temperature=self._settings.stage1_temperature,
-            level="L1-normal",
-        )
+        units_data = None
+        if start_level == LEVEL_NORMAL:
+            units_data = await self._try_split(
+                raw_text,
+                build_stage1_messages(raw_text),
+                temperature=self._settings.stage1_temperature,
+                level=LEVEL_NORMAL,
+                source=source,
+            )
+        else:
+            logger.info("Stage 1 跳过正常 Prompt", voice_id=str(voice.id), source=source)
 
         # --- Level 2：简化 Prompt 降级 ---
         if units_data is None:
@@ -52,45 +117,40 @@ class SemanticSplitter:
                 raw_text,
                 build_stage1_simplified_messages(raw_text),
                 temperature=0.3,
-                level="L2-simplified",
+                level=LEVEL_SIMPLIFIED,
+                source=source,
             )
 
         # --- Level 3：兜底 ---
         if units_data is None:
             logger.warning("Stage 1 三级降级均失败，使用兜底", voice_id=str(voice.id))
+            if self._ladder is not None:
+                self._ladder.record_fallback(source)
+            record_level(LEVEL_FALLBACK)
             return [
-                SemanticUnit(
-                    voice_id=voice.id,
-                    text=raw_text,
-                    summary=raw_text[:200],
-                    intent="unclassified",
-                    sentiment="neutral",
-                    confidence=0.0,
-                    sequence_index=0,
-                )
+                {
+                    "text": raw_text,
+                    "summary": raw_text[:200],
+                    "intent": "unclassified",
+                    "sentiment": "neutral",
+                    "confidence": 0.0,
+                }
             ]
 
         # L2 语义一致性校验（非阻塞）
-        await validate_l2(
-            self._llm,
-            raw_text,
-            units_data["units"],
-            temperature=self._settings.guard_l2_temperature,
-        )
-
-        # 构建 SemanticUnit ORM 对象
-        return [
-            SemanticUnit(
-                voice_id=voice.id,
-                text=u["text"],
-                summary=u.get("summary", ""),
-                intent=u.get("intent"),
-                sentiment=u.get("sentiment"),
-                confidence=u.get("confidence"),
-                sequence_index=idx,
+        if self._guard is not None:
+            await self._guard.submit(
+                self._llm, voice_id=voice.id, raw_text=raw_text, units=units_data["units"], db=self._db
             )
-            for idx, u in enumerate(units_data["units"])
-        ]
+        else:
+            await validate_l2(
+                self._llm,
+                raw_text,
+                units_data["units"],
+                temperature=self._settings.guard_l2_temperature,
+            )
+
+        return units_data["units"]
 
     async def _try_split(
         self,
@@ -99,14 +159,21 @@ class SemanticSplitter:
         *,
         temperature: float,
         level: str,
+        source: str,
     ) -> dict | None:
         """尝试一次 LLM 调用 + L1 校验，失败返回 None。"""
+        max_tokens = output_budget(
+            int(count_tokens(raw_text) * _OUTPUT_RATIO) + _OUTPUT_OVERHEAD_TOKENS,
+            floor=512,
+            ceiling=_OUTPUT_CEILING_TOKENS,
+        )
+        started = time.monotonic()
         try:
             response = await self._llm.invoke_slot(
                 slot="reasoning",
                 messages=messages,
                 temperature=temperature,
-                max_tokens=4096,
+                max_tokens=max_tokens,
             )
             data = extract_json_from_llm_response(response)
             validate_l1(data, STAGE1_SCHEMA)
@@ -115,12 +182,22 @@ class SemanticSplitter:
                 level=level,
                 units_count=len(data["units"]),
             )
+            self._record(source, level, success=True, started=started)
+            record_level(level)
             return data
         except (L1ValidationError, Exception) as e:
+            # 不可用的响应不能留在缓存里，否则重试会命中同一个坏结果
+            self._llm.forget(slot="reasoning", messages=messages, temperature=temperature, max_tokens=max_tokens)
             logger.warning(
                 "Stage 1 拆解失败",
                 level=level,
                 error=str(e),
                 raw_text_preview=raw_text[:100],
             )
+            self._record(source, level, success=False, started=started)
             return None
+
+    def _record(self, source: str, level: str, *, success: bool, started: float) -> None:
+        """向降级阶梯记录本次尝试的结果与耗时。"""
+        if self._ladder is not None:
+            self._ladder.record(source, level, success=success, elapsed_ms=(time.monotonic() - started) * 1000)
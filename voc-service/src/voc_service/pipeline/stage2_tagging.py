@@ -1,13 +1,16 @@
 """Stage 2: 标签涌现 + 标准化 — SemanticUnit → EmergentTag + UnitTagAssociation。"""
 
 import structlog
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from voc_service.core.config import VocServiceSettings
 from voc_service.core.llm_client import LLMClient
 from voc_service.core.llm_response import extract_json_from_llm_response
+from voc_service.core.tag_memo import TagNormalizationMemo
+from voc_service.core.tag_vocabulary import TagVocabularyIndex
+from voc_service.core.token_budget import output_budget
 from voc_service.models.emergent_tag import EmergentTag
 from voc_service.models.semantic_unit import SemanticUnit
 from voc_service.models.unit_tag_association import UnitTagAssociation
@@ -27,9 +30,10 @@ class TagEmergenceProcessor:
 
     两步流程：
     1. reasoning 槽位生成原始标签 + L1 校验
-    2. fast 槽位标准化（合并同义、去冗余修饰）
-    3. UPSERT EmergentTag
-    4. 创建 UnitTagAssociation
+    2. fast 槽位标准化（合并同义、去冗余修饰；命中标准化记忆的原始名称跳过 LLM，
+       提供词表索引时仅以最近邻标签作为合并参考，高相似度直接合并）
+    3. 集合式 UPSERT EmergentTag（单条 INSERT ... ON CONFLICT）
+    4. 多行插入 UnitTagAssociation
     """
 
     def __init__(
@@ -37,10 +41,15 @@ class TagEmergenceProcessor:
         llm_client: LLMClient,
         db: AsyncSession,
         settings: VocServiceSettings,
+        *,
+        memo: TagNormalizationMemo | None = None,
+        vocabulary: TagVocabularyIndex | None = None,
     ) -> None:
         self._llm = llm_client
         self._db = db
         self._settings = settings
+        self._memo = memo
+        self._vocabulary = vocabulary
 
     async def tag(self, units: list[SemanticUnit]) -> list[EmergentTag]:
         """对一组 SemanticUnit 执行标签涌现，返回关联的 EmergentTag 列表。"""
@@ -74,44 +83,78 @@ class TagEmergenceProcessor:
         # Step 2: fast 槽位标准化
         normalize_map = await self._normalize_tags(all_raw_names)
 
-        # Step 3 + 4: UPSERT EmergentTag + 创建关联
-        all_tags: list[EmergentTag] = []
+        # 按 (unit, 标准化名称) 聚合：不同原始名称标准化后可能落到同一标签
+        associations: dict[tuple[int, str], dict] = {}
         for tu in tagging_data["tagged_units"]:
             unit_index = tu["unit_index"]
             if unit_index < 0 or unit_index >= len(units):
                 logger.warning("unit_index 越界", unit_index=unit_index, total=len(units))
                 continue
 
-            unit = units[unit_index]
             for tag_info in tu["tags"]:
                 raw_name = tag_info["raw_name"]
                 normalized_name = normalize_map.get(raw_name, raw_name)
-                confidence = tag_info.get("confidence", 0.8)
+                key = (unit_index, normalized_name)
+                relevance = tag_info.get("relevance", 1.0)
+                is_primary = tag_info.get("is_primary", False)
 
-                tag = await self._upsert_tag(normalized_name, raw_name, confidence)
-                all_tags.append(tag)
+                existing = associations.get(key)
+                if existing is None:
+                    associations[key] = {
+                        "raw_name": raw_name,
+                        "confidence": tag_info.get("confidence", 0.8),
+                        "relevance": relevance,
+                        "is_primary": is_primary,
+                    }
+                else:
+                    existing["relevance"] = max(existing["relevance"], relevance)
+                    existing["is_primary"] = existing["is_primary"] or is_primary
 
-                # 创建关联
-                assoc = UnitTagAssociation(
-                    unit_id=unit.id,
-                    tag_id=tag.id,
-                    relevance=tag_info.get("relevance", 1.0),
-                    is_primary=tag_info.get("is_primary", False),
-                    source="llm_emergent",
-                )
-                self._db.add(assoc)
+        if not associations:
+            return []
+
+        # Step 3: 集合式 UPSERT EmergentTag（单条语句）
+        tags_by_name = await self._bulk_upsert_tags(associations)
+
+        # Step 4: 多行插入 UnitTagAssociation
+        await self._db.execute(
+            pg_insert(UnitTagAssociation)
+            .values(
+                [
+                    {
+                        "unit_id": units[unit_index].id,
+                        "tag_id": tags_by_name[name].id,
+                        "relevance": info["relevance"],
+                        "is_primary": info["is_primary"],
+                        "source": "llm_emergent",
+                    }
+                    for (unit_index, name), info in associations.items()
+                ]
+            )
+            .on_conflict_do_nothing()
+        )
+
+        # 新标签写入词表索引，后续标准化即可检索到；尽力而为，失败只回滚 SAVEPOINT，不影响本条 Voice
+        if self._vocabulary is not None:
+            try:
+                async with self._db.begin_nested():
+                    await self._vocabulary.index_tags(self._db, self._llm, list(tags_by_name.values()))
+            except Exception:
+                logger.warning("标签词表索引写入失败，跳过", count=len(tags_by_name), exc_info=True)
 
-        return all_tags
+        return list(tags_by_name.values())
 
     async def _generate_raw_tags(self, units: list[dict]) -> dict | None:
         """调用 reasoning 槽位生成原始标签。"""
         messages = build_stage2_tagging_messages(units)
+        # 每个单元最多 3 个标签，约 150 token
+        max_tokens = output_budget(len(units) * 150 + 200, floor=512)
         try:
             response = await self._llm.invoke_slot(
                 slot="reasoning",
                 messages=messages,
                 temperature=self._settings.stage2_temperature,
-                max_tokens=4096,
+                max_tokens=max_tokens,
             )
             data = extract_json_from_llm_response(response)
             validate_l1(data, STAGE2_SCHEMA)
@@ -121,6 +164,13 @@ class TagEmergenceProcessor:
             )
             return data
         except (L1ValidationError, Exception) as e:
+            # 不可用的响应不能留在缓存里，否则重试会命中同一个坏结果
+            self._llm.forget(
+                slot="reasoning",
+                messages=messages,
+                temperature=self._settings.stage2_temperature,
+                max_tokens=max_tokens,
+            )
             logger.warning("Stage 2 标签生成失败", error=str(e))
             return None
 
@@ -128,69 +178,145 @@ class TagEmergenceProcessor:
         self,
         raw_names: list[str],
     ) -> dict[str, str]:
-        """标签标准化：raw_name → normalized_name 映射。"""
+        """标签标准化：raw_name → normalized_name 映射。
+
+        先查标准化记忆，再经词表索引自动合并高相似度名称，
+        剩余原始名称合并为一次 fast 槽位调用，结果写回记忆。
+        """
         if not raw_names:
             return {}
 
-        # 查询已有标签用于合并参考
-        result = await self._db.execute(select(EmergentTag.name).where(EmergentTag.status == "active").limit(100))
-        existing_tags = [row[0] for row in result.all()]
+        mapping: dict[str, str] = {}
+        if self._memo is not None:
+            mapping = await self._memo.lookup(self._db, raw_names)
+
+        unseen = [name for name in raw_names if name not in mapping]
+        if not unseen:
+            logger.info("标签标准化全部命中记忆", count=len(mapping))
+            return mapping
+
+        fresh: dict[str, str] = {}
+        existing_tags = await self._merge_candidates(unseen, fresh)
+        auto_merged = len(fresh)
+        unseen = [name for name in unseen if name not in fresh]
+        if not unseen:
+            if self._memo is not None:
+                await self._memo.store(self._db, fresh)
+            mapping.update(fresh)
+            logger.info("标签标准化完成（全部自动合并）", auto_merged=len(fresh))
+            return mapping
 
-        messages = build_normalize_messages(raw_names, existing_tags or None)
+        messages = build_normalize_messages(unseen, existing_tags or None)
+        # 每个原始名称一条 {raw_name, normalized_name, merged_into}，约 50 token
+        max_tokens = output_budget(len(unseen) * 50 + 100, ceiling=2048)
         try:
             response = await self._llm.invoke_slot(
                 slot="fast",
                 messages=messages,
                 temperature=self._settings.normalize_temperature,
-                max_tokens=2048,
+                max_tokens=max_tokens,
             )
             data = extract_json_from_llm_response(response)
 
-            mapping: dict[str, str] = {}
             for item in data.get("normalized", []):
                 raw = item.get("raw_name", "")
+                if raw not in unseen:
+                    continue
                 # 如果有 merged_into 且不为 null，使用合并目标
                 merged = item.get("merged_into")
                 normalized = merged if merged else item.get("normalized_name", raw)
-                mapping[raw] = normalized
+                fresh[raw] = normalized
+
+            if self._memo is not None:
+                await self._memo.store(self._db, fresh)
+            mapping.update(fresh)
 
-            logger.info("标签标准化完成", count=len(mapping))
+            logger.info(
+                "标签标准化完成",
+                count=len(fresh),
+                memo_hits=len(raw_names) - len(unseen) - auto_merged,
+                auto_merged=auto_merged,
+                candidates=len(existing_tags),
+            )
             return mapping
         except Exception as e:
+            self._llm.forget(
+                slot="fast",
+                messages=messages,
+                temperature=self._settings.normalize_temperature,
+                max_tokens=max_tokens,
+            )
             logger.warning("标签标准化失败，使用原始名称", error=str(e))
-            return {name: name for name in raw_names}
+            # 自动合并结果不依赖 LLM，照常写入记忆
+            if self._memo is not None:
+                await self._memo.store(self._db, fresh)
+            mapping.update(fresh)
+            mapping.update({name: name for name in unseen})
+            return mapping
 
-    async def _upsert_tag(
-        self,
-        name: str,
-        raw_name: str,
-        confidence: float,
-    ) -> EmergentTag:
-        """UPSERT EmergentTag：已存在则 usage_count +1，否则新建。"""
-        # 查找已有标签
-        result = await self._db.execute(select(EmergentTag).where(EmergentTag.name == name))
-        existing = result.scalar_one_or_none()
-
-        if existing is not None:
-            existing.usage_count += 1
-            return existing
-
-        # 新建标签
-        tag = EmergentTag(
-            name=name,
-            raw_name=raw_name,
-            usage_count=1,
-            confidence=confidence,
-            status="active",
+    async def _merge_candidates(self, unseen: list[str], auto_merged: dict[str, str]) -> list[str]:
+        """确定发送给 LLM 的合并参考标签。
+
+        有词表索引时检索每个原始名称的最近邻：达到阈值的直接写入 auto_merged，
+        其余名称的候选合并去重后返回。无索引、检索失败或检索不到任何候选（存量标签名称向量
+        尚未回填）时退回使用量最高的 100 个标签。
+        检索在 SAVEPOINT 中执行，失败时只回滚该 SAVEPOINT，回退查询仍可在当前事务中执行。
+        """
+        if self._vocabulary is not None:
+            try:
+                async with self._db.begin_nested():
+                    neighbours = await self._vocabulary.nearest(self._db, self._llm, unseen)
+            except Exception:
+                logger.warning("标签词表检索失败，退回按使用量选取合并参考", exc_info=True)
+            else:
+                candidates: dict[str, None] = {}
+                for raw_name, nearest in neighbours.items():
+                    target = self._vocabulary.auto_merge_target(nearest)
+                    if target is not None:
+                        auto_merged[raw_name] = target
+                    else:
+                        candidates.update(dict.fromkeys(name for name, _ in nearest))
+                if candidates or all(name in auto_merged for name in unseen):
+                    return list(candidates)
+                logger.info("标签词表无近邻，退回按使用量选取合并参考", count=len(unseen))
+
+        result = await self._db.execute(
+            select(EmergentTag.name)
+            .where(EmergentTag.status == "active")
+            .order_by(EmergentTag.usage_count.desc())
+            .limit(100)
         )
-        self._db.add(tag)
-        try:
-            await self._db.flush()
-        except IntegrityError:
-            # 并发竞争：另一个 worker 先创建了同名标签
-            await self._db.rollback()
-            result = await self._db.execute(select(EmergentTag).where(EmergentTag.name == name))
-            tag = result.scalar_one()
-            tag.usage_count += 1
-
-        return tag
+        return [row[0] for row in result.all()]
+
+    async def _bulk_upsert_tags(self, associations: dict[tuple[int, str], dict]) -> dict[str, EmergentTag]:
+        """UPSERT EmergentTag：已存在则 usage_count 累加关联次数，否则新建。
+
+        单条 INSERT ... ON CONFLICT (name) DO UPDATE ... RETURNING 完成全部标签，
+        并发 worker 同时创建同名标签时由数据库合并，无需回滚当前事务。
+        行按名称排序，保证多 worker 间加锁顺序一致，避免死锁。
+        """
+        rows: dict[str, dict] = {}
+        for (_, name), info in associations.items():
+            row = rows.get(name)
+            if row is None:
+                rows[name] = {
+                    "name": name,
+                    "raw_name": info["raw_name"],
+                    "usage_count": 1,
+                    "confidence": info["confidence"],
+                    "status": "active",
+                }
+            else:
+                row["usage_count"] += 1
+
+        stmt = pg_insert(EmergentTag).values([rows[name] for name in sorted(rows)])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EmergentTag.name],
+            set_={
+                "usage_count": EmergentTag.usage_count + stmt.excluded.usage_count,
+                "updated_at": func.now(),
+            },
+        ).returning(EmergentTag)
+
+        result = await self._db.scalars(stmt, execution_options={"populate_existing": True})
+        return {tag.name: tag for tag in result.all()}
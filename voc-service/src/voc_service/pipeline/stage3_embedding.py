@@ -3,11 +3,20 @@
 将 SemanticUnit.text 通过 embedding 槽位转换为 1024 维向量，
 写入 SemanticUnit.embedding 字段。按 batch_size 分批调用，
 单批失败跳过不阻塞后续批次。
+
+提供 EmbeddingCache 时，每批经 EmbeddingCache.embed_with_model 处理：先按文本内容查缓存，
+仅对未命中的去重文本调用 llm-service，命中项与新向量不属于同一模型时整批重新向量化。
+
+同一条 voice 的所有向量必须来自同一模型（否则 pgvector 相似度无意义）：批次之间响应模型
+发生变化（槽位切换 / 故障转移）时，丢弃已得到的向量并按新模型重新向量化一次；
+仍不一致则放弃本次向量化，留待重新处理。
 """
 
 import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from voc_service.core.config import VocServiceSettings
+from voc_service.core.embedding_cache import EmbeddingCache
 from voc_service.core.llm_client import LLMClient
 from voc_service.models.semantic_unit import SemanticUnit
 
@@ -17,9 +26,18 @@ logger = structlog.get_logger(__name__)
 class EmbeddingProcessor:
     """Stage 3: SemanticUnit.text → embedding vector (1024 维)。"""
 
-    def __init__(self, llm_client: LLMClient, settings: VocServiceSettings) -> None:
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        settings: VocServiceSettings,
+        *,
+        db: AsyncSession | None = None,
+        cache: EmbeddingCache | None = None,
+    ) -> None:
         self._llm = llm_client
         self._batch_size = settings.embedding_batch_size
+        self._db = db
+        self._cache = cache
 
     async def embed(self, units: list[SemanticUnit]) -> int:
         """批量向量化语义单元。
@@ -33,24 +51,34 @@ class EmbeddingProcessor:
         if not units:
             return 0
 
+        texts = list(dict.fromkeys(u.text for u in units))
+        vectors_by_text = await self._embed_texts(texts)
+        if vectors_by_text is None:
+            logger.warning("批次间 embedding 模型不一致，按新模型重新向量化", count=len(texts))
+            vectors_by_text = await self._embed_texts(texts)
+        if vectors_by_text is None:
+            logger.error("embedding 模型持续变化，放弃本次向量化", count=len(texts))
+            vectors_by_text = {}
+
         embedded_count = 0
+        for unit in units:
+            vector = vectors_by_text.get(unit.text)
+            if vector is not None:
+                unit.embedding = vector
+                embedded_count += 1
 
-        for i in range(0, len(units), self._batch_size):
-            batch = units[i : i + self._batch_size]
-            texts = [u.text for u in batch]
+        return embedded_count
 
-            try:
-                vectors = await self._llm.embedding(texts=texts)
+    async def _embed_texts(self, texts: list[str]) -> dict[str, list[float]] | None:
+        """按 batch_size 分批向量化去重文本，单批失败跳过；批次间模型不一致时返回 None。"""
+        vectors_by_text: dict[str, list[float]] = {}
+        served_model: str | None = None
 
-                for unit, vector in zip(batch, vectors, strict=True):
-                    unit.embedding = vector
-                    embedded_count += 1
+        for i in range(0, len(texts), self._batch_size):
+            batch = texts[i : i + self._batch_size]
 
-                logger.info(
-                    "批次向量化完成",
-                    batch_index=i // self._batch_size,
-                    batch_size=len(batch),
-                )
+            try:
+                vectors, model_id = await self._embed_batch(batch)
             except Exception:
                 logger.error(
                     "批次向量化失败，跳过该批次",
@@ -58,5 +86,30 @@ class EmbeddingProcessor:
                     batch_size=len(batch),
                     exc_info=True,
                 )
+                continue
 
-        return embedded_count
+            if vectors_by_text and model_id != served_model:
+                logger.warning(
+                    "embedding 响应模型变化",
+                    batch_index=i // self._batch_size,
+                    previous=served_model,
+                    current=model_id,
+                )
+                return None
+            served_model = model_id
+            vectors_by_text.update(zip(batch, vectors, strict=True))
+
+            logger.info(
+                "批次向量化完成",
+                batch_index=i // self._batch_size,
+                batch_size=len(batch),
+                model_id=model_id,
+            )
+
+        return vectors_by_text
+
+    async def _embed_batch(self, batch: list[str]) -> tuple[list[list[float]], str | None]:
+        """向量化单个批次，返回向量与其所属模型。"""
+        if self._cache is not None:
+            return await self._cache.embed_with_model(self._llm, batch, db=self._db)
+        return await self._llm.embedding_with_model(texts=batch)
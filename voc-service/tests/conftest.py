@@ -42,6 +42,7 @@ def settings() -> VocServiceSettings:
         llm_service_timeout=10,
         confidence_high_threshold=0.8,
         confidence_medium_threshold=0.6,
+        embedding_cache_persistent=False,
     )
 
 
@@ -89,6 +90,11 @@ def mock_llm_client() -> MagicMock:
 
     client.embedding = AsyncMock(side_effect=mock_embedding)
 
+    async def mock_embedding_with_model(*, texts: list[str], **kwargs: Any) -> tuple[list[list[float]], str]:
+        return [[0.1] * 1024 for _ in texts], "test-embedding"
+
+    client.embedding_with_model = AsyncMock(side_effect=mock_embedding_with_model)
+
     # rerank：按原序返回，score 递减
     async def mock_rerank(*, query: str, documents: list[str], top_n: int | None = None, **kwargs: Any) -> list[dict]:
         n = top_n or len(documents)
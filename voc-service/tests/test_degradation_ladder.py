@@ -0,0 +1,39 @@
+"""Stage 1 自适应降级阶梯单元测试。"""
+
+from voc_service.core.degradation_ladder import LEVEL_NORMAL, LEVEL_SIMPLIFIED, DegradationLadder
+
+LONG_TEXT = "这款手机的充电速度非常快，但是续航表现一般，屏幕显示效果很好，整体比较满意。"
+
+
+class TestDegradationLadder:
+    """起始级别选择 + 统计。"""
+
+    def test_short_text_starts_simplified(self):
+        ladder = DegradationLadder(short_text_chars=10)
+        assert ladder.start_level("csv", "太慢了") == LEVEL_SIMPLIFIED
+
+    def test_insufficient_samples_starts_normal(self):
+        ladder = DegradationLadder(short_text_chars=10, min_samples=5)
+        for _ in range(4):
+            ladder.record("csv", LEVEL_NORMAL, success=False, elapsed_ms=100)
+        assert ladder.start_level("csv", LONG_TEXT) == LEVEL_NORMAL
+
+    def test_failing_source_skips_normal(self):
+        """近期成功率低于阈值的来源直接从简化 Prompt 开始，其他来源不受影响。"""
+        ladder = DegradationLadder(short_text_chars=10, min_samples=5, min_success_rate=0.5, probe_rate=0.0)
+        for _ in range(5):
+            ladder.record("api", LEVEL_NORMAL, success=False, elapsed_ms=100)
+        assert ladder.start_level("api", LONG_TEXT) == LEVEL_SIMPLIFIED
+        assert ladder.start_level("csv", LONG_TEXT) == LEVEL_NORMAL
+
+    def test_snapshot(self):
+        ladder = DegradationLadder()
+        ladder.record("csv", LEVEL_NORMAL, success=True, elapsed_ms=100)
+        ladder.record("csv", LEVEL_NORMAL, success=False, elapsed_ms=300)
+        ladder.record_fallback("csv")
+
+        stats = ladder.snapshot()["csv"]
+        assert stats[LEVEL_NORMAL]["attempts"] == 2
+        assert stats[LEVEL_NORMAL]["recent_success_rate"] == 0.5
+        assert stats[LEVEL_NORMAL]["recent_avg_ms"] == 200.0
+        assert stats["fallbacks"] == 1
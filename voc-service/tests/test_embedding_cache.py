@@ -0,0 +1,184 @@
+"""内容寻址 embedding 缓存单元测试。"""
+
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from voc_service.core.embedding_cache import EmbeddingCache, text_hash
+from voc_service.models.semantic_unit import SemanticUnit
+from voc_service.pipeline.stage3_embedding import EmbeddingProcessor
+
+pytestmark = pytest.mark.asyncio
+
+
+def _make_llm_client(*models: str | None) -> MagicMock:
+    """Mock LLMClient：每个文本返回以文本长度为值的 4 维向量，响应模型依次取 models（缺省 bge-m3）。"""
+    client = MagicMock()
+    served = list(models) or ["bge-m3"]
+
+    async def mock_embedding_with_model(*, texts: list[str], **kwargs: Any) -> tuple[list[list[float]], str | None]:
+        model = served.pop(0) if len(served) > 1 else served[0]
+        return [[float(len(t))] * 4 for t in texts], model
+
+    client.embedding_with_model = AsyncMock(side_effect=mock_embedding_with_model)
+    return client
+
+
+class TestEmbeddingCache:
+    """EmbeddingCache 进程内 LRU 层。"""
+
+    async def test_repeated_texts_embedded_once(self):
+        """重复文本只调用一次 llm-service，结果按输入顺序返回。"""
+        cache = EmbeddingCache(model_id="bge-m3", persistent=False)
+        llm = _make_llm_client()
+
+        vectors = await cache.embed(llm, ["质量很好", "物流快", "质量很好"])
+        assert vectors == [[4.0] * 4, [3.0] * 4, [4.0] * 4]
+        llm.embedding_with_model.assert_awaited_once()
+        assert llm.embedding_with_model.await_args.kwargs["texts"] == ["质量很好", "物流快"]
+
+        # 第二次完全命中，不再调用
+        await cache.embed(llm, ["物流快"])
+        assert llm.embedding_with_model.await_count == 1
+        assert cache.hits == 1
+
+    async def test_lru_eviction(self):
+        """超过容量后淘汰最久未使用的条目。"""
+        cache = EmbeddingCache(model_id="bge-m3", max_entries=2, persistent=False)
+        llm = _make_llm_client()
+
+        await cache.embed(llm, ["a", "b"])
+        await cache.embed(llm, ["a"])  # a 变为最近使用
+        await cache.embed(llm, ["c"])  # 淘汰 b
+
+        found = await cache.lookup(None, ["a", "b", "c"])
+        assert set(found) == {"a", "c"}
+
+    async def test_persistent_tier_hit(self):
+        """LRU 未命中时从持久层读取，不调用 llm-service。"""
+        cache = EmbeddingCache(model_id="bge-m3")
+        llm = _make_llm_client()
+
+        db = AsyncMock(spec=AsyncSession)
+        result = MagicMock()
+        result.all.return_value = [(text_hash("续航差"), [0.5, 0.5])]
+        db.execute = AsyncMock(return_value=result)
+
+        vectors = await cache.embed(llm, ["续航差"], db=db)
+        assert vectors == [[0.5, 0.5]]
+        llm.embedding_with_model.assert_not_awaited()
+
+    async def test_persistent_lookup_failure_treated_as_miss(self):
+        """持久层查询异常 → 按未命中处理，继续调用 llm-service。"""
+        cache = EmbeddingCache(model_id="bge-m3")
+        llm = _make_llm_client()
+        db = AsyncMock(spec=AsyncSession)
+        db.execute = AsyncMock(side_effect=Exception("db down"))
+
+        vectors = await cache.embed(llm, ["好评"], db=db)
+        assert vectors == [[2.0] * 4]
+
+    async def test_persistent_failures_roll_back_savepoint_only(self):
+        """持久层读写在 SAVEPOINT 中执行：异常只回滚 SAVEPOINT，不中止调用方事务。"""
+        cache = EmbeddingCache(model_id="bge-m3")
+        llm = _make_llm_client()
+        db = AsyncMock(spec=AsyncSession)
+        db.execute = AsyncMock(side_effect=Exception("db down"))
+
+        await cache.embed(llm, ["好评"], db=db)
+
+        savepoint = db.begin_nested.return_value
+        assert db.begin_nested.call_count == 2  # lookup + store
+        assert savepoint.__aexit__.await_count == 2
+        assert all(call.args[0] is Exception for call in savepoint.__aexit__.await_args_list)
+        db.rollback.assert_not_awaited()
+
+
+class TestEmbeddingCacheModelKey:
+    """缓存键以 llm-service 响应中的实际模型为准。"""
+
+    async def test_unknown_model_skips_lookup_until_first_response(self):
+        cache = EmbeddingCache(persistent=False)
+        llm = _make_llm_client("bge-m3")
+
+        await cache.embed(llm, ["好评"])
+        assert cache.model_id == "bge-m3"
+        assert await cache.lookup(None, ["好评"]) == {"好评": [2.0] * 4}
+
+    async def test_model_switch_does_not_reuse_old_vectors(self):
+        """槽位切换 / 故障转移到其他模型：旧模型的命中项整批重新向量化，新向量按新模型存放。"""
+        cache = EmbeddingCache(model_id="bge-m3", persistent=False)
+        await cache.embed(_make_llm_client("bge-m3"), ["好评"])
+
+        llm = _make_llm_client("text-embedding-3")
+        vectors = await cache.embed(llm, ["好评", "物流快"])
+
+        assert vectors == [[2.0] * 4, [3.0] * 4]
+        assert llm.embedding_with_model.await_args.kwargs["texts"] == ["好评", "物流快"]
+        assert cache.model_id == "text-embedding-3"
+        # 新模型的条目已写入，之后的读取使用新模型
+        assert set(await cache.lookup(None, ["好评", "物流快"])) == {"好评", "物流快"}
+
+    async def test_missing_model_not_stored(self):
+        """响应缺少模型标识时不写入缓存（fail closed）。"""
+        cache = EmbeddingCache(model_id="bge-m3", persistent=False)
+        llm = _make_llm_client(None)
+
+        await cache.embed(llm, ["好评"])
+        await cache.embed(llm, ["好评"])
+        assert llm.embedding_with_model.await_count == 2
+
+
+class TestEmbeddingProcessorWithCache:
+    """Stage 3 使用缓存跳过已向量化文本。"""
+
+    async def test_skips_cached_texts(self, settings):
+        cache = EmbeddingCache(model_id="bge-m3", persistent=False)
+        llm = _make_llm_client()
+        await cache.embed(llm, ["质量很好"])
+
+        units = [SemanticUnit(text="质量很好"), SemanticUnit(text="物流快"), SemanticUnit(text="物流快")]
+        processor = EmbeddingProcessor(llm, settings, cache=cache)
+
+        embedded = await processor.embed(units)
+
+        assert embedded == 3
+        assert llm.embedding_with_model.await_count == 2
+        assert llm.embedding_with_model.await_args.kwargs["texts"] == ["物流快"]
+        assert units[0].embedding == [4.0] * 4
+
+    async def test_cached_hits_from_other_model_are_reembedded(self, settings):
+        """读缓存的模型与响应模型不一致：该批命中项与新向量一起按新模型重新向量化。"""
+        cache = EmbeddingCache(model_id="bge-m3", persistent=False)
+        await cache.embed(_make_llm_client("bge-m3"), ["质量很好"])
+
+        llm = _make_llm_client("text-embedding-3")
+        units = [SemanticUnit(text="质量很好"), SemanticUnit(text="物流快")]
+        processor = EmbeddingProcessor(llm, settings, cache=cache)
+
+        assert await processor.embed(units) == 2
+        assert llm.embedding_with_model.await_args.kwargs["texts"] == ["质量很好", "物流快"]
+        assert cache.model_id == "text-embedding-3"
+
+    async def test_model_switch_between_batches_reembeds_all(self, settings):
+        """批次间响应模型变化：丢弃前面批次的向量，全部按新模型重新向量化。"""
+        cache = EmbeddingCache(model_id="bge-m3", persistent=False)
+        llm = _make_llm_client("bge-m3", "text-embedding-3")
+        units = [SemanticUnit(text="质量很好"), SemanticUnit(text="物流快")]
+        processor = EmbeddingProcessor(llm, settings.model_copy(update={"embedding_batch_size": 1}), cache=cache)
+
+        assert await processor.embed(units) == 2
+        called = [call.kwargs["texts"] for call in llm.embedding_with_model.await_args_list]
+        assert called == [["质量很好"], ["物流快"], ["质量很好"]]
+        assert cache.model_id == "text-embedding-3"
+
+    async def test_model_switch_without_cache(self, settings):
+        """未配置缓存时同样检查批次间模型一致；持续变化则放弃向量化。"""
+        llm = _make_llm_client("bge-m3", "text-embedding-3", "bge-m3", "text-embedding-3")
+        units = [SemanticUnit(text="质量很好"), SemanticUnit(text="物流快")]
+        processor = EmbeddingProcessor(llm, settings.model_copy(update={"embedding_batch_size": 1}))
+
+        assert await processor.embed(units) == 0
+        assert all(unit.embedding is None for unit in units)
@@ -1,14 +1,22 @@
 """管线校验层单元测试（L1 格式校验 + L2 语义一致性校验）。"""
 
+import asyncio
+import uuid
 from unittest.mock import AsyncMock, MagicMock
 
+import jsonschema
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from voc_service.app import create_app
+from voc_service.core.guard_scheduler import L2GuardScheduler
 from voc_service.core.llm_response import extract_json_from_llm_response, parse_json_from_text
 from voc_service.pipeline.guards import (
     STAGE1_SCHEMA,
     STAGE2_SCHEMA,
     L1ValidationError,
+    SchemaValidatorRegistry,
+    l1_validators,
     validate_l1,
     validate_l2,
 )
@@ -49,6 +57,35 @@ class TestL1Validation:
         with pytest.raises(L1ValidationError):
             validate_l1(data, STAGE1_SCHEMA)
 
+    def test_collects_all_errors(self):
+        """多处错误一次性全部返回，并带 JSON 路径。"""
+        data = {
+            "units": [
+                {"text": "", "summary": "s", "intent": "i", "sentiment": "angry", "confidence": 0.5},
+            ]
+        }
+        with pytest.raises(L1ValidationError) as exc_info:
+            validate_l1(data, STAGE1_SCHEMA)
+        assert len(exc_info.value.errors) == 2
+        assert all(e.startswith("units/0/") for e in exc_info.value.errors)
+
+    def test_stats_counted(self):
+        """预编译校验器累计调用次数。"""
+        before = l1_validators.stats()["stage2"]["calls"]
+        validate_l1({"tagged_units": [{"unit_index": 0, "tags": [{"raw_name": "续航"}]}]}, STAGE2_SCHEMA)
+        assert l1_validators.stats()["stage2"]["calls"] == before + 1
+
+    def test_reused_schema_id_not_served_stale_validator(self):
+        """缓存项的 schema 与当前 schema 不是同一对象（id 被复用）时重新编译，不误用旧校验器。"""
+        registry = SchemaValidatorRegistry()
+        stale = {"type": "object", "required": ["a"]}
+        schema = {"type": "object", "required": ["b"]}
+        registry._validators[id(schema)] = (stale, "stale", jsonschema.Draft202012Validator(stale))
+
+        errors = registry.validate({"a": 1}, schema)
+
+        assert [e.message for e in errors] == ["'b' is a required property"]
+
     def test_stage1_empty_units(self):
         """空 units 数组 → L1ValidationError（minItems=1）。"""
         data = {"units": []}
@@ -182,6 +219,20 @@ class TestLLMResponseParsing:
         with pytest.raises(AppException, match="LLM 未返回内容"):
             extract_json_from_llm_response(response)
 
+    def test_recover_truncated_units(self):
+        """max_tokens 截断 → 返回完整元素构成的有效前缀。"""
+        text = (
+            '```json\n{"units": [{"text": "充电慢", "sentiment": "negative"}, '
+            '{"text": "屏幕{好}", "sentiment": "positive"}, {"text": "续航'
+        )
+        result = parse_json_from_text(text)
+        assert [u["text"] for u in result["units"]] == ["充电慢", "屏幕{好}"]
+
+    def test_recover_object_with_surrounding_prose(self):
+        """JSON 前后有说明文字 → 取第一个配平的对象。"""
+        result = parse_json_from_text('结果如下：{"units": [{"text": "a"}]} 以上。')
+        assert result == {"units": [{"text": "a"}]}
+
     def test_extract_invalid_json(self):
         """非法 JSON → AppException。"""
         from prism_shared.exceptions import AppException
@@ -190,6 +241,192 @@ class TestLLMResponseParsing:
             parse_json_from_text("not a json {{{")
 
 
+# --- L2 校验调度 ---
+
+
+L2_UNITS = [{"text": "充电速度太慢了", "intent": "complaint", "sentiment": "negative", "confidence": 0.5}]
+
+
+def _l2_client(content: str | Exception = '{"consistent": true, "confidence": 0.9, "issues": []}') -> MagicMock:
+    client = MagicMock()
+    if isinstance(content, Exception):
+        client.invoke_slot = AsyncMock(side_effect=content)
+    else:
+        client.invoke_slot = AsyncMock(return_value={"data": {"result": {"content": content}}})
+    return client
+
+
+def _make_session_factory() -> tuple[MagicMock, MagicMock]:
+    """Mock session 工厂，返回 (factory, session)。"""
+    session = MagicMock()
+    session.commit = AsyncMock()
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory, session
+
+
+@pytest.mark.asyncio
+class TestL2GuardScheduler:
+    """L2GuardScheduler 抽样 / 高置信度跳过 / 后台执行。"""
+
+    async def test_high_confidence_skipped(self):
+        """全部单元置信度达到阈值 → 不调用 L2。"""
+        client = _l2_client()
+        scheduler = L2GuardScheduler(mode="inline", skip_confidence=0.9)
+
+        await scheduler.submit(
+            client, voice_id=uuid.uuid4(), raw_text="好评", units=[{"text": "好评", "confidence": 0.95}]
+        )
+
+        client.invoke_slot.assert_not_awaited()
+        assert scheduler.skipped == 1
+
+    async def test_sample_rate_zero_skipped(self):
+        client = _l2_client()
+        scheduler = L2GuardScheduler(mode="inline", sample_rate=0.0)
+
+        await scheduler.submit(
+            client,
+            voice_id=uuid.uuid4(),
+            raw_text="差评",
+            units=[{"text": "差评", "intent": "complaint", "sentiment": "negative", "confidence": 0.5}],
+        )
+
+        client.invoke_slot.assert_not_awaited()
+
+    async def test_background_off_critical_path(self):
+        """background 模式 → submit 立即返回，由后台 worker 完成校验。"""
+        client = _l2_client()
+        scheduler = L2GuardScheduler(mode="background")
+
+        await scheduler.submit(
+            client,
+            voice_id=uuid.uuid4(),
+            raw_text="差评",
+            units=[{"text": "差评", "intent": "complaint", "sentiment": "negative", "confidence": 0.5}],
+        )
+        client.invoke_slot.assert_not_awaited()
+
+        await scheduler._queue.join()
+        client.invoke_slot.assert_awaited_once()
+        await scheduler.close()
+
+
+@pytest.mark.asyncio
+class TestAuditRecords:
+    """审计记录只写入真实的校验结果。"""
+
+    async def test_result_written_as_audit(self):
+        factory, session = _make_session_factory()
+        scheduler = L2GuardScheduler(mode="inline", session_factory=factory)
+        llm = _l2_client('{"consistent": false, "confidence": 0.7, "issues": [{"type": "distortion"}]}')
+
+        await scheduler.submit(llm, voice_id=uuid.uuid4(), raw_text="充电速度太慢了", units=L2_UNITS)
+
+        audit = session.add.call_args.args[0]
+        assert audit.consistent is False
+        assert audit.confidence == 0.7
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.parametrize("content", [Exception("网络错误"), '{"confidence": 0.9}'])
+    async def test_failed_check_not_written(self, content):
+        """L2 调用失败或响应缺少判定：不写审计记录，计入 failed。"""
+        factory, session = _make_session_factory()
+        scheduler = L2GuardScheduler(mode="inline", session_factory=factory)
+
+        await scheduler.submit(_l2_client(content), voice_id=uuid.uuid4(), raw_text="测试", units=L2_UNITS)
+
+        session.add.assert_not_called()
+        assert scheduler.failed == 1
+
+    async def test_inline_audit_joins_pipeline_session(self):
+        """inline 模式审计记录随管线 session 写入，不另开连接等待 Voice 行锁。"""
+        factory, session = _make_session_factory()
+        scheduler = L2GuardScheduler(mode="inline", session_factory=factory)
+        pipeline_db = MagicMock()
+        llm = _l2_client()
+
+        await scheduler.submit(llm, voice_id=uuid.uuid4(), raw_text="测试", units=L2_UNITS, db=pipeline_db)
+
+        assert pipeline_db.add.call_args.args[0].consistent is True
+        factory.assert_not_called()
+
+
+@pytest.mark.asyncio
+class TestBackgroundAfterCommit:
+    """background 模式：管线事务提交后才投递，回滚则丢弃。"""
+
+    @pytest.fixture
+    async def scheduler(self):
+        factory, _ = _make_session_factory()
+        scheduler = L2GuardScheduler(mode="background", session_factory=factory)
+        yield scheduler
+        await scheduler.close()
+
+    async def test_enqueued_only_after_commit(self, scheduler):
+        llm = _l2_client()
+        db = AsyncSession()
+        db.sync_session.begin()
+
+        await scheduler.submit(llm, voice_id=uuid.uuid4(), raw_text="测试", units=L2_UNITS, db=db)
+        await asyncio.sleep(0)
+        llm.invoke_slot.assert_not_awaited()
+
+        await db.commit()
+        await scheduler._queue.join()
+        llm.invoke_slot.assert_awaited_once()
+
+    async def test_discarded_on_rollback(self, scheduler):
+        llm = _l2_client()
+        db = AsyncSession()
+        db.sync_session.begin()
+
+        await scheduler.submit(llm, voice_id=uuid.uuid4(), raw_text="测试", units=L2_UNITS, db=db)
+        await db.rollback()
+        # 下一个事务提交时不会投递已回滚事务的任务
+        db.sync_session.begin()
+        await db.commit()
+
+        assert scheduler._queue.empty()
+        llm.invoke_slot.assert_not_awaited()
+
+    async def test_without_transaction_enqueued_immediately(self, scheduler):
+        llm = _l2_client()
+
+        await scheduler.submit(llm, voice_id=uuid.uuid4(), raw_text="测试", units=L2_UNITS)
+        await scheduler._queue.join()
+
+        llm.invoke_slot.assert_awaited_once()
+
+    async def test_full_queue_drops(self):
+        scheduler = L2GuardScheduler(mode="background", queue_size=1, workers=0)
+        llm = _l2_client()
+
+        for _ in range(2):
+            await scheduler.submit(llm, voice_id=uuid.uuid4(), raw_text="测试", units=L2_UNITS)
+
+        assert scheduler.dropped == 1
+        await scheduler.close()
+
+
+@pytest.mark.asyncio
+class TestShutdownOrder:
+    """应用关闭：先停止 L2 worker，再关闭其使用的 llm-service 连接池。"""
+
+    async def test_scheduler_closed_before_http_client(self, settings):
+        app = create_app(settings)
+        closed_http_first: list[bool] = []
+
+        async with app.router.lifespan_context(app):
+            scheduler = MagicMock()
+            scheduler.close = AsyncMock(side_effect=lambda: closed_http_first.append(app.state.voc_llm_http.is_closed))
+            app.state.voc_guard_scheduler = scheduler
+
+        assert closed_http_first == [False]
+        assert app.state.voc_llm_http.is_closed
+
+
 # --- Prompt 构建 ---
 
 
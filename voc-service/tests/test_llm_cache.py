@@ -0,0 +1,107 @@
+"""LLM 槽位响应缓存单元测试。"""
+
+import httpx
+import pytest
+
+from voc_service.core import llm_client as llm_client_module
+from voc_service.core.llm_cache import LLMResponseCache
+from voc_service.core.llm_client import LLMClient
+
+MESSAGES = [{"role": "user", "content": "充电速度太慢了"}]
+
+
+class TestLLMResponseCache:
+    """LLMResponseCache TTL / LRU / 温度阈值。"""
+
+    def test_key_is_stable_and_param_sensitive(self):
+        """相同参数 → 相同键；温度或 max_tokens 不同 → 不同键。"""
+        k1 = LLMResponseCache.make_key(slot="reasoning", messages=MESSAGES, temperature=0.5, max_tokens=4096)
+        k2 = LLMResponseCache.make_key(slot="reasoning", messages=list(MESSAGES), temperature=0.5, max_tokens=4096)
+        assert k1 == k2
+        assert k1 != LLMResponseCache.make_key(slot="reasoning", messages=MESSAGES, temperature=0.3, max_tokens=4096)
+        assert k1 != LLMResponseCache.make_key(slot="fast", messages=MESSAGES, temperature=0.5, max_tokens=4096)
+
+    def test_ttl_expiry(self, monkeypatch: pytest.MonkeyPatch):
+        """超过 TTL → 未命中。"""
+        now = [1000.0]
+        monkeypatch.setattr("voc_service.core.llm_cache.time.monotonic", lambda: now[0])
+        cache = LLMResponseCache(ttl_seconds=10)
+
+        cache.put("k", {"data": 1})
+        assert cache.get("k") == {"data": 1}
+        now[0] += 11
+        assert cache.get("k") is None
+
+    def test_lru_eviction(self):
+        """超过容量 → 淘汰最久未使用的条目。"""
+        cache = LLMResponseCache(max_entries=2)
+        cache.put("a", {})
+        cache.put("b", {})
+        cache.get("a")
+        cache.put("c", {})
+        assert cache.get("b") is None
+        assert cache.get("a") == {}
+
+    def test_high_temperature_not_cacheable(self):
+        cache = LLMResponseCache(max_temperature=0.7)
+        assert cache.cacheable(0.5)
+        assert not cache.cacheable(0.9)
+
+
+@pytest.mark.asyncio
+class TestLLMClientCaching:
+    """LLMClient.invoke_slot 命中缓存时不请求 llm-service。"""
+
+    @pytest.fixture()
+    def calls(self, monkeypatch: pytest.MonkeyPatch) -> list[httpx.Request]:
+        recorded: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            recorded.append(request)
+            return httpx.Response(200, json={"data": {"result": {"content": "{}"}}})
+
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            llm_client_module.httpx,
+            "AsyncClient",
+            lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+        )
+        return recorded
+
+    async def test_identical_calls_hit_cache(self, calls: list[httpx.Request]):
+        client = LLMClient(base_url="http://prism.test:8601", response_cache=LLMResponseCache())
+
+        await client.invoke_slot(slot="reasoning", messages=MESSAGES, temperature=0.5)
+        await client.invoke_slot(slot="reasoning", messages=MESSAGES, temperature=0.5)
+        assert len(calls) == 1
+
+        # 显式退出缓存 / forget 后重新请求
+        await client.invoke_slot(slot="reasoning", messages=MESSAGES, temperature=0.5, use_cache=False)
+        client.forget(slot="reasoning", messages=MESSAGES, temperature=0.5)
+        await client.invoke_slot(slot="reasoning", messages=MESSAGES, temperature=0.5)
+        assert len(calls) == 3
+
+    async def test_high_temperature_bypasses_cache(self, calls: list[httpx.Request]):
+        client = LLMClient(base_url="http://prism.test:8601", response_cache=LLMResponseCache(max_temperature=0.7))
+
+        await client.invoke_slot(slot="fast", messages=MESSAGES, temperature=1.0)
+        await client.invoke_slot(slot="fast", messages=MESSAGES, temperature=1.0)
+        assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_http_client_is_reused_and_not_closed():
+    """传入应用级连接池时，所有调用复用同一个 AsyncClient，调用结束后不关闭。"""
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        return httpx.Response(200, json={"data": {"result": {"content": "{}", "embeddings": [{"values": [0.1]}]}}})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        client = LLMClient(base_url="http://prism.test:8601", http_client=http_client)
+        await client.invoke_slot(slot="fast", messages=MESSAGES, use_cache=False)
+        assert await client.embedding(texts=["好评"]) == [[0.1]]
+        assert not http_client.is_closed
+
+    assert seen == ["/api/llm/slots/fast/invoke", "/api/llm/slots/embedding/invoke"]
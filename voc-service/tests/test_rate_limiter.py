@@ -0,0 +1,117 @@
+"""LLM 槽位准入控制单元测试。"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from prism_shared.exceptions import AppException
+from voc_service.core.llm_client import LLMClient
+from voc_service.core.rate_limiter import LLMAdmissionController, TokenBucket
+
+
+class TestTokenBucket:
+    """令牌桶扣减 / 等待时间。"""
+
+    def test_take_until_empty(self):
+        bucket = TokenBucket(60, burst_seconds=2)  # 1 个 / 秒，容量 2
+        assert bucket.try_take(1) == 0
+        assert bucket.try_take(1) == 0
+        assert bucket.try_take(1) == pytest.approx(1.0, abs=0.05)
+
+    def test_oversized_cost_is_capped(self):
+        bucket = TokenBucket(600, burst_seconds=1)  # 容量 10
+        assert bucket.try_take(1000) == 0
+
+
+class TestAdmissionController:
+    """AIMD 调整 + token 退还。"""
+
+    def test_throttle_decreases_and_success_recovers(self):
+        controller = LLMAdmissionController(
+            {"fast": (600, 60_000)}, decrease_factor=0.5, increase_step=0.25, cooldown_seconds=60
+        )
+        controller.on_throttled("fast")
+        controller.on_throttled("fast")  # 冷却窗口内只降一次
+        snapshot = controller.snapshot()["fast"]
+        assert snapshot["scale"] == 0.5
+        assert snapshot["rpm"] == 300
+        assert snapshot["throttled"] == 2
+
+        controller.on_success("fast")
+        controller.on_success("fast")
+        controller.on_success("fast")
+        assert controller.snapshot()["fast"]["scale"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_unlimited_slot_passes_through(self):
+        controller = LLMAdmissionController({"fast": (0, 0)})
+        assert await controller.acquire("fast", 10_000) == 0
+        assert await controller.acquire("rerank", 10) == 0
+        assert controller.snapshot() == {}
+
+    @pytest.mark.asyncio
+    async def test_refund_unused_tokens(self):
+        controller = LLMAdmissionController({"reasoning": (0, 600)}, cooldown_seconds=0)  # 10 token / 秒，容量 100
+        reserved = await controller.acquire("reasoning", 100)
+        controller.on_success("reasoning", reserved=reserved, used=40)
+        # 退还 60 后可立即再申请 60
+        assert controller._slots["reasoning"].tokens.try_take(60) == 0
+
+    @pytest.mark.asyncio
+    async def test_waiters_do_not_block_each_other(self, monkeypatch):
+        """等待方各自按欠额等待，不互相阻塞申请；后到者等待更久。"""
+        waits: list[float] = []
+        release = asyncio.Event()
+        real_sleep = asyncio.sleep
+
+        async def fake_sleep(seconds: float) -> None:
+            if seconds == 0:
+                return await real_sleep(0)
+            waits.append(seconds)
+            await release.wait()
+
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        controller = LLMAdmissionController({"fast": (6, 0)})  # 0.1 个 / 秒，容量 1
+
+        assert await controller.acquire("fast", 0) == 0
+        waiters = [asyncio.create_task(controller.acquire("fast", 0)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        assert waits == [pytest.approx(10.0, abs=0.1), pytest.approx(20.0, abs=0.1)]
+        release.set()
+        await asyncio.gather(*waiters)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_refunds_reservation(self):
+        controller = LLMAdmissionController({"fast": (6, 0)})
+        await controller.acquire("fast", 0)
+
+        waiter = asyncio.create_task(controller.acquire("fast", 0))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        # 退还后欠额清零：下一次申请只需等一个补充周期
+        assert controller._slots["fast"].requests.reserve(1) == pytest.approx(10.0, abs=0.1)
+
+
+class TestLLMClientFeedback:
+    """llm-service 超时 / 连接失败作为拥塞信号反馈准入控制。"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error", [httpx.ReadTimeout("timed out"), httpx.ConnectError("refused")])
+    async def test_transport_error_throttles(self, error):
+        controller = LLMAdmissionController({"fast": (600, 0)}, cooldown_seconds=0)
+        http = MagicMock()
+        http.post = AsyncMock(side_effect=error)
+        client = LLMClient("http://llm.test", rate_limiter=controller, http_client=http)
+
+        with pytest.raises(AppException):
+            await client.invoke_slot(slot="fast", messages=[{"role": "user", "content": "hi"}], use_cache=False)
+
+        snapshot = controller.snapshot()["fast"]
+        assert snapshot["throttled"] == 1
+        assert snapshot["scale"] == 0.5
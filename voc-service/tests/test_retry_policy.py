@@ -0,0 +1,37 @@
+"""失败 Voice 重试策略单元测试。"""
+
+from datetime import UTC, datetime
+
+from voc_service.core.retry_policy import RetryPolicy
+from voc_service.models.voice import Voice
+
+NOW = datetime(2026, 2, 19, tzinfo=UTC)
+
+
+class TestRetryPolicy:
+    """退避计算 + 失败调度。"""
+
+    def test_delay_is_bounded(self):
+        policy = RetryPolicy(base_seconds=10, max_seconds=60)
+        for retry_count in range(1, 10):
+            delay = policy.delay(retry_count)
+            assert 5 <= delay <= 60
+        assert all(policy.delay(1) <= 10 for _ in range(50))
+
+    def test_failure_schedules_next_attempt(self):
+        policy = RetryPolicy(max_retries=2, base_seconds=10, max_seconds=60)
+        voice = Voice(raw_text="x", retry_count=0)
+
+        assert policy.schedule_failure(voice, "LLM 超时", now=NOW)
+        assert voice.processed_status == "failed"
+        assert voice.retry_count == 1
+        assert voice.next_attempt_at > NOW
+
+    def test_exhausted_retries_are_not_scheduled(self):
+        policy = RetryPolicy(max_retries=2)
+        voice = Voice(raw_text="x", retry_count=2)
+
+        assert not policy.schedule_failure(voice, "e" * 1000, now=NOW)
+        assert voice.retry_count == 3
+        assert voice.next_attempt_at is None
+        assert len(voice.processing_error) == 500
@@ -0,0 +1,72 @@
+"""管线运行账本单元测试。"""
+
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from voc_service.core import run_ledger
+from voc_service.core.degradation_ladder import LEVEL_NORMAL, LEVEL_SIMPLIFIED
+from voc_service.core.run_ledger import PipelineRunLedger, record_level, record_llm_call
+
+INVOKE_BODY = {
+    "data": {
+        "result": {"usage": {"prompt_tokens": 120, "completion_tokens": 30}, "latency_ms": 999},
+        "routing": {
+            "failover_trace": [
+                {"provider_name": "a", "success": False, "latency_ms": 200},
+                {"provider_name": "b", "success": True, "latency_ms": 300},
+            ]
+        },
+    }
+}
+
+
+class TestPipelineRunLedger:
+    """阶段计量 + 持久化。"""
+
+    def test_stage_accumulates_llm_usage(self):
+        ledger = PipelineRunLedger()
+        voice_id = uuid.uuid4()
+        with ledger.stage(voice_id, "stage1") as meter:
+            record_llm_call(INVOKE_BODY)
+            record_llm_call(INVOKE_BODY, cached=True)
+            record_level(LEVEL_SIMPLIFIED)
+            record_level(LEVEL_NORMAL)
+
+        assert meter.llm_calls == 1
+        assert meter.llm_cache_hits == 1
+        assert meter.prompt_tokens == 120
+        assert meter.completion_tokens == 30
+        assert meter.llm_ms == 500  # 按 failover_trace 求和
+        assert meter.level == LEVEL_SIMPLIFIED
+        assert meter.succeeded
+
+    def test_level_kept_by_severity_not_name(self, monkeypatch):
+        """最深级别按严重程度比较，与级别名称的字典序无关。"""
+        monkeypatch.setattr(run_ledger, "LEVEL_SEVERITY", {"normal": 0, "simplified": 1, "fallback": 2})
+        with PipelineRunLedger().stage(uuid.uuid4(), "stage1") as meter:
+            record_level("fallback")
+            record_level("simplified")
+        assert meter.level == "fallback"
+
+    def test_calls_outside_stage_are_ignored(self):
+        ledger = PipelineRunLedger()
+        record_llm_call(INVOKE_BODY)
+        with ledger.stage(uuid.uuid4(), "stage3") as meter:
+            pass
+        assert meter.llm_calls == 0
+
+    def test_failed_stage_is_marked_and_persisted(self):
+        ledger = PipelineRunLedger()
+        with pytest.raises(RuntimeError), ledger.stage(uuid.uuid4(), "stage2"):
+            raise RuntimeError("boom")
+
+        db = MagicMock()
+        run = ledger.persist(db, {"processed": 0, "failed": 1, "skipped": 0})
+        db.add.assert_called_once_with(run)
+        [metric] = list(db.add_all.call_args.args[0])
+        assert metric.run_id == run.id
+        assert metric.stage == "stage2"
+        assert metric.succeeded is False
+        assert run.failed == 1
@@ -0,0 +1,87 @@
+"""短文本快速路径单元测试。"""
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from voc_service.core.embedding_cache import EmbeddingCache
+from voc_service.pipeline.short_text import ShortTextFastPath
+
+
+def _result(rows: list) -> MagicMock:
+    result = MagicMock()
+    result.first.return_value = rows[0] if rows else None
+    result.all.return_value = rows
+    return result
+
+
+def _voice(text: str) -> SimpleNamespace:
+    return SimpleNamespace(id=uuid.uuid4(), raw_text=text)
+
+
+class TestShortTextFastPath:
+    """精确匹配复用标注，不调用 LLM。"""
+
+    def test_applies_by_length(self, settings, mock_llm_client: MagicMock):
+        fast_path = ShortTextFastPath(mock_llm_client, AsyncMock(), settings)
+        assert fast_path.applies(_voice("好评"))
+        assert not fast_path.applies(_voice("这款手机的充电速度非常快，但是续航表现一般"))
+        assert not fast_path.applies(_voice("   "))
+
+    @pytest.mark.asyncio
+    async def test_exact_match_reuses_labels(self, settings, mock_llm_client: MagicMock):
+        tag_id = uuid.uuid4()
+        labelled = SimpleNamespace(id=uuid.uuid4(), intent="praise", sentiment="positive", confidence=0.9)
+        db = AsyncMock()
+        db.add = MagicMock()
+        db.execute = AsyncMock(
+            side_effect=[
+                _result([labelled]),  # 精确匹配
+                _result([(tag_id, 1.0, True)]),  # 标签关联
+                _result([]),  # 插入关联
+                _result([]),  # usage_count + 1
+                _result([]),  # 第二条：插入关联
+                _result([]),  # 第二条：usage_count + 1
+            ]
+        )
+
+        fast_path = ShortTextFastPath(mock_llm_client, db, settings)
+        units = await fast_path.build(_voice("好评"))
+
+        assert len(units) == 1
+        assert units[0].sentiment == "positive"
+        assert units[0].intent == "praise"
+        mock_llm_client.invoke_slot.assert_not_awaited()
+        mock_llm_client.embedding.assert_not_awaited()
+
+        # 同一轮内相同文本直接复用命中结果
+        await fast_path.build(_voice("好评"))
+        assert db.execute.await_count == 6
+
+    @pytest.mark.asyncio
+    async def test_no_match_returns_none(self, settings, mock_llm_client: MagicMock):
+        db = AsyncMock()
+        db.execute = AsyncMock(side_effect=[_result([]), _result([])])
+
+        fast_path = ShortTextFastPath(mock_llm_client, db, settings)
+        assert await fast_path.build(_voice("一般")) is None
+
+    @pytest.mark.asyncio
+    async def test_embedding_failure_rolls_back_savepoint_only(self, settings, mock_llm_client: MagicMock):
+        """向量化失败只回滚 SAVEPOINT，走完整管线，调用方事务不受影响。"""
+        db = AsyncMock(spec=AsyncSession)
+        db.execute = AsyncMock(return_value=_result([]))
+        mock_llm_client.embedding_with_model = AsyncMock(side_effect=Exception("llm down"))
+
+        fast_path = ShortTextFastPath(
+            mock_llm_client, db, settings, embedding_cache=EmbeddingCache(model_id="test", persistent=False)
+        )
+        assert await fast_path.build(_voice("一般")) is None
+
+        savepoint = db.begin_nested.return_value
+        savepoint.__aexit__.assert_awaited_once()
+        assert savepoint.__aexit__.await_args.args[0] is Exception
+        db.rollback.assert_not_awaited()
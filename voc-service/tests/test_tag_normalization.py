@@ -0,0 +1,214 @@
+"""Stage 2 标签标准化记忆 / 词表索引单元测试。"""
+
+import json
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from voc_service.core.embedding_cache import EmbeddingCache
+from voc_service.core.tag_memo import TagNormalizationMemo
+from voc_service.core.tag_vocabulary import TagVocabularyIndex
+from voc_service.models.emergent_tag import EmergentTag
+from voc_service.models.semantic_unit import SemanticUnit
+from voc_service.pipeline.stage2_tagging import TagEmergenceProcessor
+
+pytestmark = pytest.mark.asyncio
+
+
+def _make_db() -> AsyncMock:
+    """Mock AsyncSession：所有查询返回空结果。"""
+    db = AsyncMock(spec=AsyncSession)
+    empty = MagicMock()
+    empty.all.return_value = []
+    db.execute = AsyncMock(return_value=empty)
+    return db
+
+
+def _normalize_response(pairs: dict[str, str]) -> dict:
+    normalized = [{"raw_name": raw, "normalized_name": name, "merged_into": None} for raw, name in pairs.items()]
+    return {"data": {"result": {"content": json.dumps({"normalized": normalized}, ensure_ascii=False)}}}
+
+
+class TestNormalizeWithMemo:
+    """_normalize_tags 命中记忆时跳过 fast 槽位调用。"""
+
+    async def test_only_unseen_names_sent_to_llm(self, settings, mock_llm_client: MagicMock):
+        memo = TagNormalizationMemo()
+        await memo.store(None, {"续航差": "电池续航"})
+        mock_llm_client.invoke_slot = AsyncMock(return_value=_normalize_response({"物流很快": "物流速度"}))
+
+        processor = TagEmergenceProcessor(mock_llm_client, _make_db(), settings, memo=memo)
+        mapping = await processor._normalize_tags(["续航差", "物流很快"])
+
+        assert mapping == {"续航差": "电池续航", "物流很快": "物流速度"}
+        prompt = mock_llm_client.invoke_slot.await_args.kwargs["messages"][1]["content"]
+        assert "物流很快" in prompt
+        assert "续航差" not in prompt
+
+        # 结果写回记忆，再次出现时不再调用
+        mapping = await processor._normalize_tags(["物流很快"])
+        assert mapping == {"物流很快": "物流速度"}
+        assert mock_llm_client.invoke_slot.await_count == 1
+
+    async def test_all_hits_skip_llm(self, settings, mock_llm_client: MagicMock):
+        memo = TagNormalizationMemo()
+        await memo.store(None, {"续航差": "电池续航"})
+
+        processor = TagEmergenceProcessor(mock_llm_client, _make_db(), settings, memo=memo)
+        mapping = await processor._normalize_tags(["续航差"])
+
+        assert mapping == {"续航差": "电池续航"}
+        mock_llm_client.invoke_slot.assert_not_awaited()
+
+    async def test_llm_failure_not_memoized(self, settings, mock_llm_client: MagicMock):
+        """标准化失败 → 使用原始名称，且不写入记忆。"""
+        memo = TagNormalizationMemo()
+        mock_llm_client.invoke_slot = AsyncMock(side_effect=Exception("timeout"))
+
+        processor = TagEmergenceProcessor(mock_llm_client, _make_db(), settings, memo=memo)
+        mapping = await processor._normalize_tags(["续航差"])
+
+        assert mapping == {"续航差": "续航差"}
+        assert await memo.lookup(None, ["续航差"]) == {}
+
+    async def test_persistent_failure_rolls_back_savepoint_only(self):
+        """持久层读写异常只回滚 SAVEPOINT，按未命中处理，不中止调用方事务。"""
+        memo = TagNormalizationMemo()
+        db = AsyncMock(spec=AsyncSession)
+        db.execute = AsyncMock(side_effect=Exception("db down"))
+
+        assert await memo.lookup(db, ["续航差"]) == {}
+        await memo.store(db, {"续航差": "电池续航"})
+
+        savepoint = db.begin_nested.return_value
+        assert savepoint.__aexit__.await_count == 2
+        assert all(call.args[0] is Exception for call in savepoint.__aexit__.await_args_list)
+        db.rollback.assert_not_awaited()
+        assert await memo.lookup(None, ["续航差"]) == {"续航差": "电池续航"}
+
+
+def _make_neighbour_db(rows_per_query: list[list[tuple[str, float]]]) -> AsyncMock:
+    """Mock AsyncSession：依次返回每个原始名称的最近邻 (name, cosine_distance)。"""
+    results = []
+    for rows in rows_per_query:
+        result = MagicMock()
+        result.all.return_value = rows
+        results.append(result)
+    db = AsyncMock(spec=AsyncSession)
+    db.execute = AsyncMock(side_effect=results)
+    return db
+
+
+class TestNormalizeWithVocabulary:
+    """_normalize_tags 经词表索引检索最近邻合并候选。"""
+
+    async def test_auto_merge_and_candidates_only(self, settings, mock_llm_client: MagicMock):
+        vocabulary = TagVocabularyIndex(
+            cache=EmbeddingCache(model_id="test", persistent=False), auto_merge_threshold=0.9
+        )
+        db = _make_neighbour_db(
+            [
+                [("电池续航", 0.02), ("充电速度", 0.3)],  # 相似度 0.98 → 自动合并
+                [("配送速度", 0.2), ("包装质量", 0.4)],  # 相似度 0.8 → 交给 LLM
+            ]
+        )
+        mock_llm_client.invoke_slot = AsyncMock(return_value=_normalize_response({"物流很快": "配送速度"}))
+
+        processor = TagEmergenceProcessor(mock_llm_client, db, settings, vocabulary=vocabulary)
+        mapping = await processor._normalize_tags(["续航不行", "物流很快"])
+
+        assert mapping == {"续航不行": "电池续航", "物流很快": "配送速度"}
+        prompt = mock_llm_client.invoke_slot.await_args.kwargs["messages"][1]["content"]
+        assert "续航不行" not in prompt
+        assert "配送速度" in prompt
+        assert "包装质量" in prompt
+        assert "充电速度" not in prompt
+
+    async def test_all_auto_merged_skip_llm(self, settings, mock_llm_client: MagicMock):
+        vocabulary = TagVocabularyIndex(
+            cache=EmbeddingCache(model_id="test", persistent=False), auto_merge_threshold=0.9
+        )
+        db = _make_neighbour_db([[("电池续航", 0.0)]])
+
+        processor = TagEmergenceProcessor(mock_llm_client, db, settings, vocabulary=vocabulary)
+        mapping = await processor._normalize_tags(["电池续航"])
+
+        assert mapping == {"电池续航": "电池续航"}
+        mock_llm_client.invoke_slot.assert_not_awaited()
+
+    async def test_nearest_failure_falls_back_after_savepoint_rollback(self, settings, mock_llm_client: MagicMock):
+        """词表检索失败只回滚 SAVEPOINT，随后按使用量选取合并参考。"""
+        vocabulary = MagicMock()
+        vocabulary.nearest = AsyncMock(side_effect=Exception("vector query failed"))
+        db = AsyncMock(spec=AsyncSession)
+        top_tags = MagicMock()
+        top_tags.all.return_value = [("配送速度",)]
+        db.execute = AsyncMock(return_value=top_tags)
+
+        processor = TagEmergenceProcessor(mock_llm_client, db, settings, vocabulary=vocabulary)
+        candidates = await processor._merge_candidates(["物流很快"], {})
+
+        assert candidates == ["配送速度"]
+        savepoint = db.begin_nested.return_value
+        savepoint.__aexit__.assert_awaited_once()
+        assert savepoint.__aexit__.await_args.args[0] is Exception
+        db.rollback.assert_not_awaited()
+
+    async def test_empty_index_falls_back_to_top_tags(self, settings, mock_llm_client: MagicMock):
+        """名称向量尚未回填、检索不到任何近邻：退回按使用量选取合并参考。"""
+        vocabulary = TagVocabularyIndex(
+            cache=EmbeddingCache(model_id="test", persistent=False), auto_merge_threshold=0.9
+        )
+        top_tags = MagicMock()
+        top_tags.all.return_value = [("配送速度",), ("包装质量",)]
+        db = _make_neighbour_db([[]])
+        db.execute.side_effect = [*db.execute.side_effect, top_tags]
+
+        processor = TagEmergenceProcessor(mock_llm_client, db, settings, vocabulary=vocabulary)
+        candidates = await processor._merge_candidates(["物流很快"], {})
+
+        assert candidates == ["配送速度", "包装质量"]
+
+
+class TestVocabularyBackfill:
+    """存量标签名称向量回填。"""
+
+    async def test_backfill_writes_unindexed_tags_by_usage(self, mock_llm_client: MagicMock):
+        vocabulary = TagVocabularyIndex(cache=EmbeddingCache(model_id="test", persistent=False))
+        pending = MagicMock()
+        pending.all.return_value = [(1, "电池续航"), (2, "配送速度")]
+        db = AsyncMock(spec=AsyncSession)
+        db.execute = AsyncMock(side_effect=[pending, MagicMock()])
+
+        assert await vocabulary.backfill(db, mock_llm_client, limit=50) == 2
+
+        query = str(db.execute.await_args_list[0].args[0])
+        assert "name_embedding IS NULL" in query
+        assert "ORDER BY voc.emergent_tags.usage_count DESC" in query
+        assert [row["id"] for row in db.execute.await_args_list[1].args[1]] == [1, 2]
+
+
+class TestIndexTagsIsBestEffort:
+    """新标签写入词表索引失败不影响本条 Voice。"""
+
+    async def test_index_failure_rolls_back_savepoint_only(self, settings, mock_llm_client: MagicMock, monkeypatch):
+        vocabulary = MagicMock()
+        vocabulary.index_tags = AsyncMock(side_effect=Exception("dimension mismatch"))
+        db = _make_db()
+        tag = EmergentTag(id=uuid.uuid4(), name="配送速度")
+
+        processor = TagEmergenceProcessor(mock_llm_client, db, settings, vocabulary=vocabulary)
+        raw = {"tagged_units": [{"unit_index": 0, "tags": [{"raw_name": "物流很快"}]}]}
+        monkeypatch.setattr(processor, "_generate_raw_tags", AsyncMock(return_value=raw))
+        monkeypatch.setattr(processor, "_normalize_tags", AsyncMock(return_value={"物流很快": "配送速度"}))
+        monkeypatch.setattr(processor, "_bulk_upsert_tags", AsyncMock(return_value={"配送速度": tag}))
+
+        tags = await processor.tag([SemanticUnit(id=uuid.uuid4(), text="物流很快")])
+
+        assert tags == [tag]
+        savepoint = db.begin_nested.return_value
+        savepoint.__aexit__.assert_awaited_once()
+        assert savepoint.__aexit__.await_args.args[0] is Exception
+        db.rollback.assert_not_awaited()
@@ -0,0 +1,60 @@
+"""Prompt token 预算单元测试。"""
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from voc_service.core.token_budget import (
+    TRUNCATION_MARKER,
+    count_tokens,
+    output_budget,
+    split_to_tokens,
+    truncate_to_tokens,
+)
+from voc_service.pipeline.stage1_splitting import SemanticSplitter
+
+LONG_TEXT = "充电速度太慢了，要两个小时才能充满。" * 40
+
+
+class TestTokenBudget:
+    """计数 / 截断 / 切分 / 输出预算。"""
+
+    def test_count_tokens(self):
+        assert count_tokens("") == 0
+        assert count_tokens(LONG_TEXT) > count_tokens("充电慢")
+
+    def test_truncate_within_budget(self):
+        truncated = truncate_to_tokens(LONG_TEXT, 50)
+        assert truncated.endswith(TRUNCATION_MARKER)
+        assert count_tokens(truncated) <= 50
+        assert truncate_to_tokens("充电慢", 50) == "充电慢"
+
+    def test_split_preserves_text(self):
+        """按句子切分，每段不超预算，拼接后与原文一致。"""
+        chunks = split_to_tokens(LONG_TEXT, 100)
+        assert len(chunks) > 1
+        assert all(count_tokens(c) <= 100 for c in chunks)
+        assert "".join(chunks) == LONG_TEXT
+        assert all(c.endswith("。") for c in chunks)
+
+    def test_output_budget_clamped(self):
+        assert output_budget(10) == 256
+        assert output_budget(100_000) == 4096
+        assert output_budget(1000, floor=512, ceiling=2048) == 1000
+
+
+class TestStage1ChunkBudget:
+    """Stage 1 分段大小受输出上限约束，单段输出不会被 max_tokens 截断。"""
+
+    async def test_chunk_output_budget_below_ceiling(self, settings, mock_llm_client: MagicMock):
+        settings.stage1_max_input_tokens = 3000
+        mock_llm_client.invoke_slot = AsyncMock(side_effect=Exception("timeout"))
+        raw_text = LONG_TEXT * 5
+        assert count_tokens(raw_text) > 3000
+
+        splitter = SemanticSplitter(mock_llm_client, settings)
+        await splitter.split(SimpleNamespace(id=uuid.uuid4(), raw_text=raw_text, source="test"))
+
+        budgets = [call.kwargs["max_tokens"] for call in mock_llm_client.invoke_slot.await_args_list]
+        assert len(budgets) > 2
+        assert all(budget < 4096 for budget in budgets)
@@ -0,0 +1,94 @@
+"""管线认领单元测试。"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from voc_service.core import voice_claim
+from voc_service.models.voice import Voice
+
+
+class _FakeVoice:
+    def __init__(self, voice_id: int):
+        self.id = voice_id
+
+
+class _FakeTable:
+    """内存版候选表：候选选择不加锁，加锁时跳过其他 worker 已锁定的行（模拟 SKIP LOCKED）。"""
+
+    def __init__(self, size: int):
+        self.ids = list(range(size))
+        self.locks: dict[int, object] = {}
+
+    async def pick(self, db, *, eligible, limit, exclude):
+        candidates = [i for i in self.ids if i not in exclude][:limit]
+        await asyncio.sleep(0)  # 让并发 worker 在加锁前算出同一批前 N 条
+        return candidates
+
+    async def lock(self, db, candidate_ids, *, eligible):
+        claimed = []
+        for voice_id in candidate_ids:
+            if self.locks.setdefault(voice_id, db) is db:
+                claimed.append(_FakeVoice(voice_id))
+        return claimed
+
+
+@pytest.fixture
+def fake_table(monkeypatch):
+    def install(size: int) -> _FakeTable:
+        table = _FakeTable(size)
+        monkeypatch.setattr(voice_claim, "_pick_candidates", table.pick)
+        monkeypatch.setattr(voice_claim, "_lock_candidates", table.lock)
+        return table
+
+    return install
+
+
+class TestClaimVoices:
+    """并发认领：被其他 worker 锁定的候选跳过后补取。"""
+
+    async def test_concurrent_claimers_get_disjoint_full_batches(self, fake_table):
+        fake_table(10)
+        eligible = Voice.processed_status == "pending"
+
+        first, second = await asyncio.gather(
+            voice_claim.claim_voices(object(), eligible=eligible, limit=4),
+            voice_claim.claim_voices(object(), eligible=eligible, limit=4),
+        )
+
+        first_ids = [v.id for v in first]
+        second_ids = [v.id for v in second]
+        assert len(first_ids) == 4
+        assert len(second_ids) == 4
+        assert not set(first_ids) & set(second_ids)
+
+    async def test_stops_when_candidates_run_out(self, fake_table):
+        fake_table(6)
+        eligible = Voice.processed_status == "pending"
+
+        first, second = await asyncio.gather(
+            voice_claim.claim_voices(object(), eligible=eligible, limit=4),
+            voice_claim.claim_voices(object(), eligible=eligible, limit=4),
+        )
+
+        assert len(first) + len(second) == 6
+        assert not {v.id for v in first} & {v.id for v in second}
+
+    async def test_refill_excludes_seen_candidates_and_locks_with_skip_locked(self):
+        db = MagicMock()
+        picked = MagicMock()
+        picked.scalars.return_value.all.return_value = []
+        db.execute = AsyncMock(return_value=picked)
+        eligible = Voice.processed_status == "pending"
+
+        await voice_claim._pick_candidates(db, eligible=eligible, limit=4, exclude={1})
+        await voice_claim._lock_candidates(db, [1, 2], eligible=eligible)
+
+        dialect = postgresql.dialect()
+        pick_sql = str(db.execute.await_args_list[0].args[0].compile(dialect=dialect))
+        lock_sql = str(db.execute.await_args_list[1].args[0].compile(dialect=dialect))
+        assert "NOT IN" in pick_sql
+        assert "FOR UPDATE" not in pick_sql
+        assert "FOR UPDATE SKIP LOCKED" in lock_sql